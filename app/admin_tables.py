@@ -0,0 +1,128 @@
+"""관리자 표의 서버 정렬·필터·페이지 이동
+
+정렬은 인덱스가 있는 컬럼만 허용하고, 페이지는 OFFSET 대신 (정렬 컬럼, id) 키셋으로
+넘깁니다. 커서는 직전 페이지의 마지막(다음) 또는 첫(이전) 행 id이고, 비교 값은 그
+행에서 저장된 값 그대로 다시 읽어 씁니다. 몇 번째 페이지든 인덱스에서 바로 시작하므로
+행이 수십만 개여도 한 페이지를 읽는 비용이 같습니다.
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, Optional
+from urllib.parse import urlencode
+
+from sqlalchemy import String, literal, select, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+ASC = "asc"
+DESC = "desc"
+
+
+@dataclass(frozen=True)
+class Table:
+    model: Any
+    # 정렬 이름 -> 컬럼 (인덱스가 있는 NOT NULL 컬럼만)
+    sorts: Dict[str, Any]
+    default_sort: str
+    default_direction: str = DESC
+    per_page: int = 20
+    # 주소에 유지할 필터 이름
+    filters: tuple = ()
+
+
+@dataclass
+class TableState:
+    sort: str
+    direction: str
+    after: Optional[int] = None
+    before: Optional[int] = None
+    filters: Dict[str, str] = field(default_factory=dict)
+
+    @classmethod
+    def parse(cls, table: Table, params: Mapping[str, str]) -> "TableState":
+        sort = params.get("sort")
+        if sort not in table.sorts:
+            sort = table.default_sort
+        direction = params.get("dir")
+        if direction not in (ASC, DESC):
+            direction = table.default_direction
+        return cls(
+            sort=sort,
+            direction=direction,
+            after=_positive_int(params.get("after")),
+            before=_positive_int(params.get("before")),
+            filters={name: params[name] for name in table.filters if params.get(name)},
+        )
+
+
+def _positive_int(value: Optional[str]) -> Optional[int]:
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        return None
+    return number if number > 0 else None
+
+
+@dataclass
+class Page:
+    rows: List[Any]
+    state: TableState
+    has_prev: bool
+    has_next: bool
+
+    def url(self, **changes) -> str:
+        """현재 정렬·필터를 유지한 주소 (changes의 None 값은 제거)"""
+        params = {"sort": self.state.sort, "dir": self.state.direction, **self.state.filters}
+        params.update(changes)
+        return "?" + urlencode({key: value for key, value in params.items() if value is not None})
+
+    def sort_url(self, sort: str) -> str:
+        """열 머리글 링크 - 같은 열이면 방향을 뒤집고 첫 페이지로"""
+        direction = ASC if sort == self.state.sort and self.state.direction == DESC else DESC
+        return self.url(sort=sort, dir=direction)
+
+    def sort_mark(self, sort: str) -> str:
+        if sort != self.state.sort:
+            return ""
+        return "▼" if self.state.direction == DESC else "▲"
+
+    @property
+    def next_url(self) -> Optional[str]:
+        return self.url(after=self.rows[-1].id) if self.has_next and self.rows else None
+
+    @property
+    def prev_url(self) -> Optional[str]:
+        return self.url(before=self.rows[0].id) if self.has_prev and self.rows else None
+
+    @property
+    def first_url(self) -> str:
+        return self.url()
+
+
+async def fetch_page(session: AsyncSession, table: Table, query, state: TableState) -> Page:
+    """query(필터 적용된 select(model))에서 state의 정렬·커서로 한 페이지 읽기"""
+    column = table.sorts[state.sort]
+    pk = table.model.id
+    cursor = state.before or state.after
+    backwards = state.before is not None
+    # 이전 페이지는 반대 방향으로 읽은 뒤 뒤집음
+    descending = (state.direction == DESC) != backwards
+
+    if cursor is not None:
+        # 날짜 등은 저장 형식이 바인딩 형식과 다를 수 있으므로 저장된 값 그대로 읽어 비교
+        raw = (await session.execute(
+            select(type_coerce(column, String)).where(pk == cursor)
+        )).scalar_one_or_none()
+        if raw is None:
+            cursor = None
+        else:
+            bound = tuple_(literal(raw), literal(cursor))
+            key = tuple_(column, pk)
+            query = query.where(key < bound if descending else key > bound)
+
+    order = (column.desc(), pk.desc()) if descending else (column.asc(), pk.asc())
+    rows = list((await session.scalars(query.order_by(*order).limit(table.per_page + 1))).all())
+    more = len(rows) > table.per_page
+    rows = rows[:table.per_page]
+    if backwards:
+        rows.reverse()
+        return Page(rows, state, has_prev=more, has_next=cursor is not None)
+    return Page(rows, state, has_prev=cursor is not None, has_next=more)
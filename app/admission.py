@@ -0,0 +1,171 @@
+"""요청 수용 제어 (라우트 분류별 동시 실행 제한과 부하 차단)
+
+요청을 정적 페이지/게시판 조회/대시보드 집계/쓰기·관리자 네 분류로 나누고,
+분류마다 동시에 처리하는 요청 수를 제한합니다. 자리가 없으면 제한된 길이의
+대기열에서 기한까지만 기다리고, 대기열이 가득 찼거나 기한이 지나면 곧바로
+`503`과 `Retry-After`를 돌려줍니다. 제한은 워커 프로세스마다 적용됩니다.
+
+자리는 응답 헤더를 보낼 때 돌려주므로 본문 스트리밍(큰 첨부파일 등)은 제한에
+포함되지 않고, 첨부파일 다운로드는 처음부터 제한하지 않습니다.
+"""
+import asyncio
+import math
+import re
+import time
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from starlette.responses import PlainTextResponse
+
+from app import metrics
+from app.config import settings
+
+STATIC = "static"
+BOARD = "board"
+DASHBOARD = "dashboard"
+WRITE = "write"
+
+_READ_METHODS = {"GET", "HEAD"}
+# 지표 수집, 헬스 체크와 정적 파일은 차단하지 않음
+_EXEMPT_PREFIXES = ("/metrics", "/healthz", "/static/")
+# 첨부파일 다운로드: 느린 클라이언트가 게시판 자리를 차지하지 않도록 제외 (조회는 기본 키 하나)
+_ATTACHMENT_DOWNLOAD = re.compile(r"^/board/\d+/attachments/\d+$")
+
+
+def classify(method: str, path: str) -> Optional[str]:
+    """요청의 라우트 분류 (제한하지 않을 요청은 None)"""
+    if path.startswith(_EXEMPT_PREFIXES):
+        return None
+    if method not in _READ_METHODS or path.startswith(("/admin", "/crudadmin")):
+        return WRITE
+    if _ATTACHMENT_DOWNLOAD.match(path):
+        return None
+    if path.startswith("/board"):
+        return BOARD
+    if path.startswith(("/dashboard", "/data-provision")):
+        return DASHBOARD
+    return STATIC
+
+
+class Rejected(Exception):
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+class Limiter:
+    """동시 실행 수 제한 + 기한이 있는 FIFO 대기열"""
+
+    def __init__(self, name: str, concurrency: int, max_queue: int, max_wait: float):
+        self.name = name
+        self.concurrency = concurrency
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.active = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    async def acquire(self):
+        if self.active < self.concurrency and not self._waiters:
+            self.active += 1
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise Rejected("queue_full")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        metrics.ADMISSION_QUEUED.labels(self.name).inc()
+        start = time.perf_counter()
+        try:
+            await asyncio.wait([waiter], timeout=self.max_wait)
+        except asyncio.CancelledError:
+            # 클라이언트가 끊긴 경우: 이미 자리를 넘겨받았다면 다음 대기자에게 넘김
+            if waiter.done() and not waiter.cancelled():
+                self.release()
+            else:
+                waiter.cancel()
+            raise
+        finally:
+            metrics.ADMISSION_QUEUED.labels(self.name).dec()
+            metrics.ADMISSION_WAIT.labels(self.name).observe(time.perf_counter() - start)
+            if not waiter.done():
+                waiter.cancel()
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+        if waiter.cancelled():
+            raise Rejected("timeout")
+
+    def release(self):
+        # 자리는 줄이지 않고 기다리던 요청에 바로 넘겨 새치기를 막음
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.active -= 1
+
+
+def _build_limiters() -> Dict[str, Limiter]:
+    wait = settings.admission_max_wait_seconds
+    return {
+        STATIC: Limiter(STATIC, settings.admission_static_concurrency, settings.admission_static_queue, wait),
+        BOARD: Limiter(BOARD, settings.admission_board_concurrency, settings.admission_board_queue, wait),
+        DASHBOARD: Limiter(DASHBOARD, settings.admission_dashboard_concurrency, settings.admission_dashboard_queue, wait),
+        WRITE: Limiter(WRITE, settings.admission_write_concurrency, settings.admission_write_queue, wait),
+    }
+
+
+class AdmissionMiddleware:
+    def __init__(self, app, limiters: Optional[Dict[str, Limiter]] = None):
+        self.app = app
+        self.limiters = limiters or _build_limiters()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.admission_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        route_class = classify(scope["method"], scope["path"])
+        if route_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        limiter = self.limiters[route_class]
+        try:
+            await limiter.acquire()
+        except Rejected as e:
+            metrics.ADMISSION_REJECTED.labels(route_class, e.reason).inc()
+            response = PlainTextResponse(
+                "요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+                status_code=503,
+                headers={"Retry-After": str(math.ceil(settings.admission_retry_after_seconds))},
+            )
+            await response(scope, receive, send)
+            return
+
+        metrics.ADMISSION_ACTIVE.labels(route_class).inc()
+        held = True
+
+        def free():
+            nonlocal held
+            if held:
+                held = False
+                metrics.ADMISSION_ACTIVE.labels(route_class).dec()
+                limiter.release()
+
+        async def send_and_free(message):
+            # 응답 헤더를 보내면 처리는 끝난 것으로 보고 본문 전송 전에 자리를 돌려줌
+            if message["type"] == "http.response.start":
+                free()
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_and_free)
+        finally:
+            free()
@@ -0,0 +1,131 @@
+"""오래된 게시물 보관 (hot/cold 분리)
+
+작성된 지 `ARCHIVE_AFTER_DAYS`일이 지난 게시물을 `posts`에서 같은 컬럼의
+`archived_posts`로 옮깁니다. 목록·대시보드·피드·관리자 질의는 최근 게시물만 남은
+작은 `posts`와 그 인덱스만 읽고, 상세 보기·검색·사이트맵은 보관 테이블까지 찾습니다.
+id는 그대로 유지되므로 `/board/{id}` 주소와 첨부파일은 바뀌지 않습니다.
+
+    python -m app.archive run [--days N] [--batch-size N]
+
+한 묶음(복사 + 삭제 + 세대 번호)이 한 트랜잭션이라 작업은 언제 중단해도 되고,
+다시 실행하면 아직 `posts`에 남은 게시물부터 이어서 옮깁니다. 쓰기 전담 작업과
+같은 `BEGIN IMMEDIATE` 연결을 쓰고 묶음 사이에 잠시 쉬어 웹 요청의 쓰기가 끼어들 수
+있게 합니다.
+"""
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from typing import List, Optional, Union
+
+from sqlalchemy import delete, desc, insert, literal, select, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload
+
+from app import generations, related
+from app.config import settings
+from app.models import ArchivedPost, Post, PostScore
+from app.tasks import enqueue
+
+# 보관 테이블로 그대로 복사하는 컬럼
+COLUMNS = ("id", "title", "content", "author_id", "category_id", "is_published", "views", "created_at", "updated_at")
+
+
+async def archive_batch(session: AsyncSession, cutoff: datetime, limit: int) -> int:
+    """cutoff 이전에 작성된 게시물을 최대 limit개 옮기고 옮긴 수를 반환"""
+    # posts는 AUTOINCREMENT라 옮긴 id를 새 게시물이 다시 받지 않음 (마이그레이션 4)
+    ids = (await session.scalars(
+        select(Post.id).where(Post.created_at < cutoff)
+        .order_by(Post.created_at).limit(limit)
+    )).all()
+    if not ids:
+        return 0
+    await session.execute(
+        insert(ArchivedPost).from_select(
+            COLUMNS, select(*(getattr(Post, name) for name in COLUMNS)).where(Post.id.in_(ids))
+        )
+    )
+    await session.execute(delete(Post).where(Post.id.in_(ids)))
+    # 외래 키 검사가 꺼져 있으므로 posts.id를 가리키는 순위·관련 게시물 행도 함께 정리
+    await session.execute(delete(PostScore).where(PostScore.post_id.in_(ids)))
+    affected = await related.forget_posts(session, ids)
+    # 일괄 DELETE는 매퍼 이벤트를 거치지 않으므로 직접 세대를 올림 (피드·사이트맵·색인 갱신)
+    await generations.bump(session, "posts")
+    # 워커 메모리의 순위·자동 완성에서 빼고, 빠진 이웃 목록은 다시 채움
+    enqueue(session, "posts.archived", post_ids=ids, affected=affected)
+    return len(ids)
+
+
+async def run(days: int = settings.archive_after_days, batch_size: int = settings.archive_batch_size,
+              pause: float = settings.archive_pause_seconds) -> int:
+    """보관 대상이 없을 때까지 묶음 단위로 옮기고 전체 옮긴 수를 반환"""
+    from app.cache import cache
+    from app.writer import writer
+
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    total = 0
+    while True:
+        moved = await writer.submit(lambda session: archive_batch(session, cutoff, batch_size))
+        if not moved:
+            break
+        total += moved
+        print(f"✅ 게시물 {moved:,}개 보관 (누적 {total:,}개)")
+        await asyncio.sleep(pause)
+    if total:
+        await cache.invalidate("posts")
+    return total
+
+
+async def search_posts(session: AsyncSession, text: str, category_id: Optional[int],
+                       offset: int, limit: int) -> List[Union[Post, ArchivedPost]]:
+    """공개 게시물 검색 - 최근 게시물과 보관 게시물을 작성일 역순으로 함께"""
+    def matching(model):
+        query = select(model.id, model.created_at, literal(model.is_archived).label("archived")).where(
+            model.is_published == True,
+            model.title.contains(text) | model.content.contains(text),
+        )
+        if category_id:
+            query = query.where(model.category_id == category_id)
+        return query
+
+    rows = (await session.execute(
+        union_all(matching(Post), matching(ArchivedPost))
+        .order_by(desc("created_at"), desc("id")).offset(offset).limit(limit)
+    )).all()
+
+    loaded = {}
+    for model in (Post, ArchivedPost):
+        ids = [row.id for row in rows if bool(row.archived) == model.is_archived]
+        if not ids:
+            continue
+        result = await session.scalars(
+            select(model).options(joinedload(model.author), joinedload(model.category))
+            .where(model.id.in_(ids))
+        )
+        loaded.update({(model.is_archived, item.id): item for item in result.all()})
+    return [loaded[(bool(row.archived), row.id)] for row in rows if (bool(row.archived), row.id) in loaded]
+
+
+async def _main(argv: List[str]):
+    import argparse
+    import time
+    from app.cache import cache
+    from app.database import create_tables
+
+    parser = argparse.ArgumentParser(prog="python -m app.archive")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="오래된 게시물을 보관 테이블로 옮김 (중단 후 다시 실행하면 이어서 진행)")
+    run_parser.add_argument("--days", type=int, default=settings.archive_after_days, help="보관 기준 경과 일수")
+    run_parser.add_argument("--batch-size", type=int, default=settings.archive_batch_size, help="한 트랜잭션에서 옮길 게시물 수")
+    args = parser.parse_args(argv)
+
+    await create_tables()
+    started = time.perf_counter()
+    try:
+        total = await run(args.days, args.batch_size)
+    finally:
+        await cache.close()
+    print(f"✅ 보관 완료: {total:,}개 ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1:]))
@@ -0,0 +1,300 @@
+"""SQLite 온라인 백업 (스냅샷)
+
+서비스 중에 DB 파일을 그대로 복사하면 쓰기를 막거나 중간 상태가 섞인 사본이
+생깁니다. 여기서는 SQLite 백업 API로 `BACKUP_PAGES_PER_STEP` 페이지씩 복사하고
+단계 사이마다 `BACKUP_STEP_PAUSE_SECONDS` 동안 잠금을 놓아 웹 요청의 쓰기가
+끼어들 수 있게 합니다. 복사는 스레드에서 실행되므로 이벤트 루프도 막지 않습니다.
+
+앱은 DB를 WAL 모드로 열므로, WAL 원본은 읽기 트랜잭션 하나에서 한 번에 복사합니다.
+읽기가 쓰기를 막지 않아 복사하는 동안에도 쓰기가 그대로 진행되고, 다시 복사할 일도
+없습니다. WAL이 아닌 원본은 단계별로 복사하는데, 도중에 다른 연결이 원본에 쓰면
+SQLite가 처음부터 다시 복사하므로 `BACKUP_MAX_RESTARTS`번을 넘기면 쓰기를 막는
+한 번에 복사로 넘어가지 않고 실패로 끝냅니다 (다음 예약 때 다시 시도). 완성된 사본은 `PRAGMA quick_check`로 확인한 뒤
+선택적으로 gzip 압축하고 `파일명.sha256`(sha256sum 형식)을 함께 남깁니다.
+
+    python -m app.backup run [--dir DIR] [--no-compress] [--no-checksum]
+    python -m app.backup verify FILE
+
+웹 워커에서는 `BACKUP_INTERVAL_HOURS`마다 예약 백업을 실행합니다. 워커 여러
+개 중 백업 디렉터리의 잠금을 얻은 하나만 실행하고, 최근 스냅샷이 주기보다
+새것이면 건너뜁니다.
+"""
+import asyncio
+import gzip
+import hashlib
+import os
+import shutil
+import sqlite3
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+import anyio
+from sqlalchemy.engine import make_url
+
+from app import metrics
+from app.config import settings
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 워커 간 잠금 없이 실행
+    fcntl = None
+
+PREFIX = "hssdi-"
+CHUNK_SIZE = 1024 * 1024
+
+
+class BackupAborted(Exception):
+    """종료 중이라 백업을 중단함"""
+
+
+class _TooManyRestarts(Exception):
+    pass
+
+
+@dataclass
+class Snapshot:
+    path: str
+    size: int
+    sha256: Optional[str]
+    pages: int
+    restarts: int
+    seconds: float
+
+
+def database_path() -> str:
+    return make_url(settings.database_url).database
+
+
+def snapshots(directory: str) -> List[str]:
+    """디렉터리의 스냅샷 경로 (오래된 순)"""
+    if not os.path.isdir(directory):
+        return []
+    names = sorted(
+        name for name in os.listdir(directory)
+        if name.startswith(PREFIX) and (name.endswith(".db") or name.endswith(".db.gz"))
+    )
+    return [os.path.join(directory, name) for name in names]
+
+
+def _copy(source: str, target: str, pages: int, pause: float, max_restarts: int,
+          abort: threading.Event) -> tuple:
+    """source를 target으로 백업하고 (페이지 수, 재시작 횟수)를 반환 (WAL이면 한 번에, 아니면 단계별)"""
+    state = {"remaining": None, "total": 0, "restarts": 0}
+
+    def progress(status, remaining, total):
+        if abort.is_set():
+            raise BackupAborted()
+        if state["remaining"] is not None and remaining > state["remaining"]:
+            # 원본이 바뀌어 처음부터 다시 복사하는 중
+            state["restarts"] += 1
+            if state["restarts"] > max_restarts:
+                raise _TooManyRestarts()
+        state["remaining"], state["total"] = remaining, total
+        if remaining:
+            # 단계 사이에는 원본 잠금이 풀려 있으므로 여기서 쉬는 동안 쓰기가 진행됨
+            time.sleep(pause)
+
+    src = sqlite3.connect(f"file:{source}?mode=ro", uri=True, timeout=settings.write_busy_timeout_seconds)
+    dst = sqlite3.connect(target)
+    try:
+        if src.execute("PRAGMA journal_mode").fetchone()[0].lower() == "wal":
+            # 읽기 트랜잭션 하나로 일관된 사본 - 그동안 쓰기는 WAL에 계속 기록됨
+            src.backup(dst, pages=-1, progress=progress)
+        else:
+            try:
+                src.backup(dst, pages=pages, progress=progress)
+            except _TooManyRestarts:
+                raise RuntimeError(f"원본 쓰기가 이어져 {max_restarts}번 넘게 다시 복사함 (WAL 모드가 아님)")
+        result = dst.execute("PRAGMA quick_check").fetchone()[0]
+        if result != "ok":
+            raise RuntimeError(f"스냅샷 검사 실패: {result}")
+        pages_copied = dst.execute("PRAGMA page_count").fetchone()[0]
+    finally:
+        dst.close()
+        src.close()
+    return pages_copied, state["restarts"]
+
+
+def _sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _compress(path: str) -> str:
+    target = path + ".gz"
+    with open(path, "rb") as src, gzip.open(target, "wb", compresslevel=6) as dst:
+        shutil.copyfileobj(src, dst, CHUNK_SIZE)
+    os.unlink(path)
+    return target
+
+
+def create_snapshot(directory: str, compress: bool = True, checksum: bool = True,
+                    pages: int = settings.backup_pages_per_step, pause: float = settings.backup_step_pause_seconds,
+                    max_restarts: int = settings.backup_max_restarts,
+                    abort: Optional[threading.Event] = None) -> Snapshot:
+    """스냅샷 하나를 만들어 directory에 둠 (동기 함수, 스레드에서 실행)"""
+    os.makedirs(directory, exist_ok=True)
+    started = time.perf_counter()
+    name = f"{PREFIX}{datetime.utcnow().strftime('%Y%m%d-%H%M%S')}.db"
+    partial = os.path.join(directory, f".{name}.partial")
+    try:
+        pages_copied, restarts = _copy(database_path(), partial, pages, pause, max_restarts, abort or threading.Event())
+        if compress:
+            partial = _compress(partial)
+            name += ".gz"
+        digest = _sha256(partial) if checksum else None
+        path = os.path.join(directory, name)
+        os.replace(partial, path)
+    except BaseException:
+        for leftover in (partial, partial + ".gz"):
+            if os.path.exists(leftover):
+                os.unlink(leftover)
+        raise
+    if digest:
+        with open(path + ".sha256", "w") as f:
+            f.write(f"{digest}  {name}\n")
+    return Snapshot(path, os.path.getsize(path), digest, pages_copied, restarts, time.perf_counter() - started)
+
+
+def prune(directory: str, keep: int = settings.backup_keep):
+    """최근 keep개만 남기고 오래된 스냅샷과 체크섬 파일을 지움"""
+    for path in snapshots(directory)[:-keep] if keep > 0 else []:
+        for target in (path, path + ".sha256"):
+            if os.path.exists(target):
+                os.unlink(target)
+
+
+def verify(path: str) -> bool:
+    """체크섬 파일과 스냅샷 내용이 일치하는지 확인"""
+    with open(path + ".sha256") as f:
+        expected = f.read().split()[0]
+    return _sha256(path) == expected
+
+
+async def backup(directory: str = settings.backup_dir, compress: bool = settings.backup_compress,
+                 checksum: bool = settings.backup_checksum, abort: Optional[threading.Event] = None) -> Snapshot:
+    """스레드에서 스냅샷을 만들고 지표를 기록한 뒤 오래된 스냅샷 정리"""
+    try:
+        snapshot = await anyio.to_thread.run_sync(
+            lambda: create_snapshot(directory, compress, checksum, abort=abort)
+        )
+    except BackupAborted:
+        metrics.BACKUPS.labels("aborted").inc()
+        raise
+    except Exception:
+        metrics.BACKUPS.labels("error").inc()
+        raise
+    metrics.BACKUPS.labels("ok").inc()
+    metrics.BACKUP_DURATION.observe(snapshot.seconds)
+    metrics.BACKUP_SIZE.set(snapshot.size)
+    metrics.BACKUP_THROUGHPUT.set(os.path.getsize(database_path()) / snapshot.seconds if snapshot.seconds else 0)
+    metrics.BACKUP_RESTARTS.inc(snapshot.restarts)
+    metrics.BACKUP_LAST_SUCCESS.set(time.time())
+    await anyio.to_thread.run_sync(prune, directory)
+    return snapshot
+
+
+class BackupScheduler:
+    def __init__(self, interval_hours: float = settings.backup_interval_hours,
+                 check_interval: float = settings.backup_check_seconds, directory: str = settings.backup_dir):
+        self.interval = interval_hours * 3600
+        self.check_interval = check_interval
+        self.directory = directory
+        self._runner: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+        self._abort = threading.Event()
+
+    def due(self) -> bool:
+        existing = snapshots(self.directory)
+        return not existing or time.time() - os.path.getmtime(existing[-1]) >= self.interval
+
+    async def run_if_due(self) -> Optional[Snapshot]:
+        """다른 워커가 실행 중이 아니고 주기가 지났으면 백업"""
+        os.makedirs(self.directory, exist_ok=True)
+        lock = open(os.path.join(self.directory, ".lock"), "w")
+        try:
+            if fcntl is not None:
+                try:
+                    fcntl.flock(lock, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return None
+            if not self.due():
+                return None
+            snapshot = await backup(self.directory, abort=self._abort)
+            print(f"✅ DB 백업 완료: {snapshot.path} ({snapshot.size:,}바이트, {snapshot.seconds:.1f}초)")
+            return snapshot
+        finally:
+            lock.close()
+
+    async def start(self):
+        if self._runner is not None or self.interval <= 0:
+            return
+        self._stopping = False
+        self._abort.clear()
+        self._wakeup = asyncio.Event()
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._runner is None:
+            return
+        self._stopping = True
+        # 진행 중인 복사는 다음 단계에서 중단
+        self._abort.set()
+        self._wakeup.set()
+        await self._runner
+        self._runner = None
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.check_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                return
+            try:
+                await self.run_if_due()
+            except BackupAborted:
+                return
+            except Exception as e:
+                print(f"❌ DB 백업 실패: {e}")
+
+
+scheduler = BackupScheduler()
+
+
+async def _main(argv: List[str]):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m app.backup")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run_parser = sub.add_parser("run", help="서비스를 멈추지 않고 DB 스냅샷 생성")
+    run_parser.add_argument("--dir", default=settings.backup_dir, help="스냅샷 디렉터리")
+    run_parser.add_argument("--no-compress", action="store_true", help="gzip 압축하지 않음")
+    run_parser.add_argument("--no-checksum", action="store_true", help="SHA-256 체크섬 파일을 만들지 않음")
+    verify_parser = sub.add_parser("verify", help="스냅샷과 체크섬 파일 비교")
+    verify_parser.add_argument("path")
+    args = parser.parse_args(argv)
+
+    if args.command == "verify":
+        ok = verify(args.path)
+        print(f"✅ 체크섬 일치: {args.path}" if ok else f"❌ 체크섬 불일치: {args.path}")
+        sys.exit(0 if ok else 1)
+
+    snapshot = await backup(args.dir, compress=not args.no_compress, checksum=not args.no_checksum)
+    print(f"✅ DB 백업 완료: {snapshot.path} ({snapshot.size:,}바이트, {snapshot.pages:,}페이지, "
+          f"재시작 {snapshot.restarts}회, {snapshot.seconds:.1f}초)")
+    if snapshot.sha256:
+        print(f"   sha256 {snapshot.sha256}")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1:]))
@@ -0,0 +1,416 @@
+"""워커 간 공유 캐시
+
+두 계층으로 이루어집니다.
+
+- 워커 안의 LRU: 역직렬화가 필요 없는 가장 빠른 계층
+- 공유 계층: 같은 서버의 모든 워커가 함께 쓰는 SQLite 파일(`cache_path`) 또는
+  Redis 프로토콜 서버(`redis_host`/`redis_port`/`redis_db`)
+
+값에는 만료 시간(TTL)과 태그를 붙일 수 있습니다. 태그마다 공유 계층에 버전 번호가
+있고, 값은 저장할 때의 태그 버전을 함께 보관합니다. `invalidate(tag)`는 버전만
+올리므로 어느 워커에서 호출해도 모든 워커의 두 계층 값이 다음 조회에서 무효가
+됩니다. 워커 LRU에서 찾은 값도 태그 버전은 공유 계층에서 확인합니다.
+
+공유 계층에 접근할 수 없으면 캐시 없이 계산한 값을 돌려주므로 페이지는 계속
+동작합니다.
+"""
+import asyncio
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Tuple
+
+import anyio
+
+from app import metrics
+from app.config import settings
+
+MISSING = object()
+# 계산하던 요청이 취소되어 기다리던 요청이 직접 다시 계산해야 함
+_RETRY = object()
+
+
+@dataclass
+class _Entry:
+    value: Any
+    expires_at: float
+    versions: Dict[str, int]
+
+
+class SQLiteBackend:
+    """같은 서버의 워커들이 함께 여는 SQLite 파일 (WAL 모드)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            conn = sqlite3.connect(self.path, timeout=1.0, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS entries (key TEXT PRIMARY KEY, value BLOB NOT NULL, expires_at REAL NOT NULL)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_entries_expires_at ON entries (expires_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS tags (name TEXT PRIMARY KEY, version INTEGER NOT NULL)")
+            self._conn = conn
+        return self._conn
+
+    def _run(self, fn, *args):
+        with self._lock:
+            return fn(self._connect(), *args)
+
+    @staticmethod
+    def _versions(conn, tags: List[str]) -> Dict[str, int]:
+        versions = dict.fromkeys(tags, 0)
+        if tags:
+            placeholders = ",".join("?" * len(tags))
+            versions.update(conn.execute(f"SELECT name, version FROM tags WHERE name IN ({placeholders})", tags))
+        return versions
+
+    def _fetch(self, conn, key: str, tags: List[str]):
+        row = conn.execute("SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, time.time())).fetchone()
+        return (row[0] if row else None), self._versions(conn, tags)
+
+    def _store(self, conn, key: str, blob: bytes, ttl: float):
+        now = time.time()
+        conn.execute("INSERT OR REPLACE INTO entries (key, value, expires_at) VALUES (?, ?, ?)", (key, blob, now + ttl))
+        self._writes += 1
+        # 만료된 값은 가끔 한꺼번에 지움
+        if self._writes % 100 == 0:
+            conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+
+    @staticmethod
+    def _bump(conn, tags: List[str]):
+        conn.executemany(
+            "INSERT INTO tags (name, version) VALUES (?, 1) ON CONFLICT(name) DO UPDATE SET version = version + 1",
+            [(tag,) for tag in tags],
+        )
+
+    async def fetch(self, key: str, tags: List[str]) -> Tuple[Optional[bytes], Dict[str, int]]:
+        return await anyio.to_thread.run_sync(self._run, self._fetch, key, tags)
+
+    async def versions(self, tags: List[str]) -> Dict[str, int]:
+        if not tags:
+            return {}
+        return await anyio.to_thread.run_sync(self._run, self._versions, tags)
+
+    async def store(self, key: str, blob: bytes, ttl: float):
+        await anyio.to_thread.run_sync(self._run, self._store, key, blob, ttl)
+
+    async def delete(self, key: str):
+        await anyio.to_thread.run_sync(self._run, lambda conn: conn.execute("DELETE FROM entries WHERE key = ?", (key,)))
+
+    async def bump(self, tags: List[str]):
+        await anyio.to_thread.run_sync(self._run, self._bump, tags)
+
+    async def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+class RespError(Exception):
+    pass
+
+
+class RedisBackend:
+    """Redis 프로토콜(RESP2) 서버 - GET/MGET/SET PX/DEL/INCR만 사용"""
+
+    PREFIX = "hssdi:cache:"
+
+    def __init__(self, host: str, port: int, db: int = 0, timeout: float = 0.5):
+        self.host = host
+        self.port = port
+        self.db = db
+        self.timeout = timeout
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._lock = asyncio.Lock()
+
+    @staticmethod
+    def _encode(args) -> bytes:
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if isinstance(arg, str):
+                arg = arg.encode("utf-8")
+            elif isinstance(arg, (int, float)):
+                arg = str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(out)
+
+    async def _read_reply(self):
+        line = await self._reader.readline()
+        if not line:
+            raise ConnectionError("연결이 끊어졌습니다")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RespError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            length = int(rest)
+            if length < 0:
+                return None
+            data = await self._reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(rest)
+            if length < 0:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RespError(f"알 수 없는 응답: {line!r}")
+
+    async def _pipeline(self, commands: List[tuple]) -> list:
+        async with self._lock:
+            try:
+                return await asyncio.wait_for(self._send(commands), self.timeout)
+            except (OSError, asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError, RespError):
+                # 응답이 섞이지 않도록 연결을 버리고 다음 호출에서 다시 연결
+                await self._disconnect()
+                raise
+
+    async def _send(self, commands: List[tuple]) -> list:
+        if self._writer is None:
+            self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+            if self.db:
+                self._writer.write(self._encode(("SELECT", self.db)))
+                await self._read_reply()
+        self._writer.write(b"".join(self._encode(command) for command in commands))
+        await self._writer.drain()
+        return [await self._read_reply() for _ in commands]
+
+    async def _disconnect(self):
+        if self._writer is not None:
+            self._writer.close()
+            self._reader = self._writer = None
+
+    def _tag(self, tag: str) -> str:
+        return f"{self.PREFIX}tag:{tag}"
+
+    async def fetch(self, key: str, tags: List[str]) -> Tuple[Optional[bytes], Dict[str, int]]:
+        (values,) = await self._pipeline([("MGET", self.PREFIX + key, *(self._tag(tag) for tag in tags))])
+        return values[0], {tag: int(value or 0) for tag, value in zip(tags, values[1:])}
+
+    async def versions(self, tags: List[str]) -> Dict[str, int]:
+        if not tags:
+            return {}
+        (values,) = await self._pipeline([("MGET", *(self._tag(tag) for tag in tags))])
+        return {tag: int(value or 0) for tag, value in zip(tags, values)}
+
+    async def store(self, key: str, blob: bytes, ttl: float):
+        await self._pipeline([("SET", self.PREFIX + key, blob, "PX", max(1, int(ttl * 1000)))])
+
+    async def delete(self, key: str):
+        await self._pipeline([("DEL", self.PREFIX + key)])
+
+    async def bump(self, tags: List[str]):
+        await self._pipeline([("INCR", self._tag(tag)) for tag in tags])
+
+    async def close(self):
+        async with self._lock:
+            await self._disconnect()
+
+
+class Cache:
+    def __init__(self, backend=None, max_entries: int = 256, default_ttl: float = 300.0):
+        self.backend = backend
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._local: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._stats = {"local_hits": 0, "shared_hits": 0, "misses": 0, "errors": 0}
+        self._failing = False
+
+    @staticmethod
+    def _name(key: str) -> str:
+        return key.split(":", 1)[0]
+
+    def _record(self, key: str, tier: Optional[str]):
+        self._stats[f"{tier}_hits" if tier else "misses"] += 1
+        metrics.cache_result(self._name(key), tier is not None, tier)
+
+    def _error(self, action: str, e: Exception):
+        self._stats["errors"] += 1
+        # 장애가 이어지는 동안 같은 로그를 반복하지 않음
+        if not self._failing:
+            print(f"❌ 공유 캐시 {action} 실패: {e}")
+        self._failing = True
+
+    def _remember(self, key: str, entry: _Entry):
+        self._local[key] = entry
+        self._local.move_to_end(key)
+        while len(self._local) > self.max_entries:
+            self._local.popitem(last=False)
+
+    async def _lookup(self, key: str, tags: List[str]) -> Tuple[Any, Optional[Dict[str, int]]]:
+        """(값 또는 MISSING, 현재 태그 버전 - 공유 계층 장애 시 None)"""
+        now = time.time()
+        entry = self._local.get(key)
+        if entry is not None and entry.expires_at <= now:
+            del self._local[key]
+            entry = None
+        if self.backend is None:
+            if entry is not None:
+                self._local.move_to_end(key)
+                self._record(key, "local")
+                return entry.value, {}
+            self._record(key, None)
+            return MISSING, {}
+
+        names = sorted(set(tags) | (set(entry.versions) if entry else set()))
+        if entry is not None and not names:
+            # 태그 없는 항목은 확인할 버전이 없으므로 공유 계층을 거치지 않음
+            self._local.move_to_end(key)
+            self._record(key, "local")
+            return entry.value, {}
+        try:
+            if entry is not None:
+                current = await self.backend.versions(names)
+                if all(current[tag] == version for tag, version in entry.versions.items()):
+                    self._local.move_to_end(key)
+                    self._record(key, "local")
+                    return entry.value, current
+                del self._local[key]
+            blob, current = await self.backend.fetch(key, names)
+            self._failing = False
+        except Exception as e:
+            self._error("조회", e)
+            self._record(key, None)
+            return MISSING, None
+
+        if blob is not None:
+            try:
+                value, versions, expires_at = pickle.loads(blob)
+                stale = [tag for tag in versions if tag not in current]
+                if stale:
+                    current.update(await self.backend.versions(stale))
+            except Exception as e:
+                self._error("조회", e)
+                self._record(key, None)
+                return MISSING, None
+            if all(current[tag] == version for tag, version in versions.items()):
+                self._remember(key, _Entry(value, expires_at, versions))
+                self._record(key, "shared")
+                return value, current
+        self._record(key, None)
+        return MISSING, current
+
+    async def get(self, key: str, default: Any = None, tags: Iterable[str] = ()) -> Any:
+        value, _ = await self._lookup(key, list(tags))
+        return default if value is MISSING else value
+
+    async def _store(self, key: str, value: Any, ttl: Optional[float], versions: Dict[str, int]):
+        ttl = self.default_ttl if ttl is None else ttl
+        expires_at = time.time() + ttl
+        self._remember(key, _Entry(value, expires_at, versions))
+        if self.backend is None:
+            return
+        try:
+            await self.backend.store(key, pickle.dumps((value, versions, expires_at), pickle.HIGHEST_PROTOCOL), ttl)
+            self._failing = False
+        except Exception as e:
+            self._error("저장", e)
+
+    async def set(self, key: str, value: Any, ttl: Optional[float] = None, tags: Iterable[str] = ()):
+        tags = sorted(set(tags))
+        versions = dict.fromkeys(tags, 0)
+        if self.backend is not None and tags:
+            try:
+                versions = await self.backend.versions(tags)
+            except Exception as e:
+                # 태그 버전을 모르면 무효화를 보장할 수 없으므로 저장하지 않음
+                self._error("조회", e)
+                return
+        await self._store(key, value, ttl, versions)
+
+    async def get_or_set(self, key: str, factory: Callable[[], Awaitable[Any]],
+                         ttl: Optional[float] = None, tags: Iterable[str] = ()) -> Any:
+        """값이 없으면 factory()로 계산해 저장 (같은 워커의 동시 요청은 한 번만 계산)"""
+        tags = sorted(set(tags))
+        value, current = await self._lookup(key, tags)
+        if value is not MISSING:
+            return value
+
+        pending = self._inflight.get(key)
+        while pending is not None:
+            value = await asyncio.shield(pending)
+            if value is not _RETRY:
+                return value
+            # 먼저 깨어난 다른 요청이 이미 다시 계산 중이면 그 결과를 기다림
+            pending = self._inflight.get(key)
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            value = await factory()
+            # 계산 전에 읽은 태그 버전으로 저장 - 계산 중에 무효화되었으면 다음 조회에서 버려짐
+            if current is not None:
+                await self._store(key, value, ttl, {tag: current.get(tag, 0) for tag in tags})
+            future.set_result(value)
+            return value
+        except asyncio.CancelledError:
+            # 공유 future를 취소하면 기다리던 정상 요청까지 취소되므로 다시 계산하라고 깨움
+            future.set_result(_RETRY)
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # 기다리는 요청이 없으면 예외를 가져가지 않았다는 경고를 막음
+            future.exception()
+            raise
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def delete(self, key: str):
+        self._local.pop(key, None)
+        if self.backend is not None:
+            try:
+                await self.backend.delete(key)
+            except Exception as e:
+                self._error("삭제", e)
+
+    async def invalidate(self, *tags: str):
+        """태그가 붙은 값을 모든 워커에서 무효화"""
+        if not tags:
+            return
+        for key in [key for key, entry in self._local.items() if not entry.versions.keys().isdisjoint(tags)]:
+            del self._local[key]
+        if self.backend is not None:
+            try:
+                await self.backend.bump(sorted(set(tags)))
+            except Exception as e:
+                self._error("무효화", e)
+
+    def stats(self) -> dict:
+        lookups = self._stats["local_hits"] + self._stats["shared_hits"] + self._stats["misses"]
+        hits = lookups - self._stats["misses"]
+        return {
+            **self._stats,
+            "local_entries": len(self._local),
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+    async def close(self):
+        if self.backend is not None:
+            await self.backend.close()
+
+
+def create_backend(kind: str = settings.cache_backend):
+    if kind == "sqlite":
+        return SQLiteBackend(settings.cache_path)
+    if kind == "redis":
+        return RedisBackend(settings.redis_host, settings.redis_port, settings.redis_db,
+                            settings.cache_redis_timeout_seconds)
+    if kind == "local":
+        return None
+    raise ValueError(f"알 수 없는 캐시 백엔드: {kind}")
+
+
+cache = Cache(create_backend(), settings.cache_local_max_entries, settings.cache_default_ttl_seconds)
@@ -0,0 +1,212 @@
+"""큰 본문 압축 저장
+
+게시물·보관 게시물·뉴스의 `content`는 `CompressedText` 컬럼입니다. UTF-8로
+`BODY_COMPRESS_MIN_BYTES` 이상이고 압축해서 실제로 작아지는 본문만 표식 바이트 +
+zlib 데이터의 BLOB으로 저장하고, 짧은 본문은 지금처럼 TEXT로 둡니다. SQLite는
+컬럼마다 값의 저장 형식이 달라도 되므로 스키마는 바뀌지 않고, 두 형식이 섞여
+있어도 읽을 때 표식을 보고 구분합니다.
+
+본문은 목록 질의에서 읽지 않도록 지연(deferred) 컬럼이라, 압축 해제는 상세 보기처럼
+본문을 실제로 보여주거나 처리하는 질의(`undefer`)에서만 일어납니다. 검색의
+`content.contains()`는 연결마다 등록한 SQL 함수 `body_text()`로 풀어서 비교합니다.
+
+기존 행은 다음 명령으로 묶음 단위로 다시 저장하고, 절약된 공간을 보고합니다.
+
+    python -m app.compression backfill [--batch-size N]
+    python -m app.compression report
+
+DB 파일 크기는 `VACUUM` 뒤에 줄어듭니다 (그전까지 빈 페이지는 새 쓰기에 재사용).
+"""
+import asyncio
+import sys
+import zlib
+from typing import List, Optional, Union
+
+from sqlalchemy import LargeBinary, Text, cast, event, func
+from sqlalchemy.types import TypeDecorator
+
+from app.config import settings
+
+# 압축된 값의 첫 바이트 (형식이 바뀌면 다른 값을 씀)
+MARKER_ZLIB = b"\x01"
+
+
+def compress(text: str, min_bytes: int = settings.body_compress_min_bytes,
+             level: int = settings.body_compress_level) -> Union[str, bytes]:
+    """저장할 값 - 기준 이상이고 압축해서 작아지면 BLOB, 아니면 원문"""
+    if min_bytes <= 0:
+        return text
+    raw = text.encode("utf-8")
+    if len(raw) < min_bytes:
+        return text
+    packed = MARKER_ZLIB + zlib.compress(raw, level)
+    return packed if len(packed) < len(raw) else text
+
+
+def decompress(value: Union[str, bytes, None]) -> Optional[str]:
+    """저장된 값을 원문으로"""
+    if value is None or isinstance(value, str):
+        return value
+    if value[:1] == MARKER_ZLIB:
+        return zlib.decompress(value[1:]).decode("utf-8")
+    return bytes(value).decode("utf-8")
+
+
+class CompressedText(TypeDecorator):
+    """큰 값만 압축해서 저장하는 Text"""
+    impl = Text
+    cache_ok = True
+
+    class comparator_factory(TypeDecorator.Comparator):
+        def contains(self, other, **kwargs):
+            # 압축된 BLOB에는 LIKE가 맞지 않으므로 풀어서 비교 (검색어는 그대로 Text로 바인딩)
+            return func.body_text(self.expr, type_=Text).contains(other, **kwargs)
+
+    def process_bind_param(self, value, dialect):
+        return None if value is None else compress(value)
+
+    def process_result_value(self, value, dialect):
+        return decompress(value)
+
+
+def install(engine):
+    """engine의 새 SQLite 연결마다 body_text() 함수를 등록"""
+    @event.listens_for(engine.sync_engine, "connect")
+    def _register(dbapi_connection, connection_record):
+        register(dbapi_connection)
+
+
+def register(connection):
+    """sqlite3/aiosqlite 연결에 body_text() 함수 등록"""
+    connection.create_function("body_text", 1, decompress, deterministic=True)
+
+
+def _models():
+    from app.models import ArchivedPost, News, Post
+    return (Post, ArchivedPost, News)
+
+
+def _bytes(expression):
+    """저장 형식과 상관없이 바이트 길이 (TEXT는 UTF-8 길이)"""
+    return func.length(cast(expression, LargeBinary))
+
+
+async def backfill_batch(session, model, after_id: int, limit: int) -> tuple:
+    """after_id 다음부터 기준 이상인 TEXT 본문을 최대 limit개 다시 저장하고 (마지막 id, 압축된 수)를 반환"""
+    from sqlalchemy import bindparam, select, type_coerce, update
+
+    table = model.__table__
+    rows = (await session.execute(
+        select(table.c.id, table.c.content).where(
+            table.c.id > after_id,
+            func.typeof(table.c.content) == "text",
+            _bytes(table.c.content) >= settings.body_compress_min_bytes,
+        ).order_by(table.c.id).limit(limit)
+    )).all()
+    if not rows:
+        return None, 0
+    values = [{"row_id": row.id, "body": compress(row.content)} for row in rows]
+    values = [value for value in values if isinstance(value["body"], bytes)]
+    if values:
+        # 이미 압축한 값을 그대로 쓰고, 같은 본문이므로 updated_at도 그대로 둠 (onupdate 방지)
+        await session.execute(
+            update(table).where(table.c.id == bindparam("row_id"))
+            .values(content=type_coerce(bindparam("body"), Text), updated_at=table.c.updated_at),
+            values,
+        )
+    return rows[-1].id, len(values)
+
+
+async def backfill(batch_size: int = settings.body_compress_batch_size, pause: float = 0.05) -> int:
+    """모든 본문 테이블을 묶음 단위로 다시 저장하고 압축한 행 수를 반환"""
+    from app.writer import writer
+
+    total = 0
+    for model in _models():
+        after_id = 0
+        while True:
+            last_id, packed = await writer.submit(
+                lambda session, after=after_id: backfill_batch(session, model, after, batch_size)
+            )
+            if last_id is None:
+                break
+            after_id = last_id
+            total += packed
+            if packed:
+                print(f"✅ {model.__tablename__}: {packed:,}개 압축 (id {last_id}까지)")
+            await asyncio.sleep(pause)
+    return total
+
+
+async def report(session) -> List[dict]:
+    """테이블별 본문 행 수, 압축된 행 수, 원문/저장 바이트"""
+    from sqlalchemy import select
+
+    stats = []
+    for model in _models():
+        table = model.__table__
+        stored = _bytes(table.c.content)
+        original = _bytes(func.body_text(table.c.content))
+        row = (await session.execute(
+            select(
+                func.count(),
+                func.count().filter(func.typeof(table.c.content) == "blob"),
+                func.coalesce(func.sum(original), 0),
+                func.coalesce(func.sum(stored), 0),
+            ).select_from(table)
+        )).one()
+        stats.append({"table": table.name, "rows": row[0], "compressed": row[1],
+                      "original_bytes": row[2], "stored_bytes": row[3]})
+    return stats
+
+
+async def _database_pages(session) -> tuple:
+    from sqlalchemy import text
+
+    page_size = await session.scalar(text("PRAGMA page_size"))
+    page_count = await session.scalar(text("PRAGMA page_count"))
+    freelist = await session.scalar(text("PRAGMA freelist_count"))
+    return page_size * page_count, page_size * freelist
+
+
+async def print_report():
+    from app.database import SessionLocal
+
+    async with SessionLocal() as session:
+        stats = await report(session)
+        file_bytes, free_bytes = await _database_pages(session)
+    total_original = total_stored = 0
+    for item in stats:
+        saved = item["original_bytes"] - item["stored_bytes"]
+        ratio = item["stored_bytes"] / item["original_bytes"] if item["original_bytes"] else 1
+        print(f"   {item['table']}: {item['rows']:,}행 중 {item['compressed']:,}행 압축, "
+              f"{item['original_bytes']:,} → {item['stored_bytes']:,}바이트 ({saved:,}바이트 절약, {ratio:.0%})")
+        total_original += item["original_bytes"]
+        total_stored += item["stored_bytes"]
+    print(f"✅ 본문 합계 {total_original:,} → {total_stored:,}바이트 ({total_original - total_stored:,}바이트 절약)")
+    print(f"   DB 파일 {file_bytes:,}바이트, 빈 페이지 {free_bytes:,}바이트 (VACUUM으로 회수)")
+
+
+async def _main(argv: List[str]):
+    import argparse
+    import time
+    from app.database import create_tables
+
+    parser = argparse.ArgumentParser(prog="python -m app.compression")
+    sub = parser.add_subparsers(dest="command", required=True)
+    backfill_parser = sub.add_parser("backfill", help="기존 본문 중 기준 이상인 것을 압축해서 다시 저장")
+    backfill_parser.add_argument("--batch-size", type=int, default=settings.body_compress_batch_size,
+                                 help="한 트랜잭션에서 다시 저장할 행 수")
+    sub.add_parser("report", help="테이블별 압축 현황과 절약된 공간")
+    args = parser.parse_args(argv)
+
+    await create_tables()
+    if args.command == "backfill":
+        started = time.perf_counter()
+        total = await backfill(args.batch_size)
+        print(f"✅ 본문 압축 완료: {total:,}개 ({time.perf_counter() - started:.1f}초)")
+    await print_report()
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1:]))
@@ -10,11 +10,131 @@ class Settings(BaseSettings):
     admin_username: str = "admin"
     admin_password: str = "admin123"
 
-    # Redis settings for session management
+    # Redis 프로토콜 서버 (cache_backend=redis일 때 공유 캐시 계층)
     redis_host: str = "localhost"
     redis_port: int = 6379
     redis_db: int = 0
 
+    # 백그라운드 작업 큐 (post-commit outbox)
+    task_concurrency: int = 4
+    task_max_attempts: int = 5
+    task_retry_base_seconds: float = 2.0
+    task_poll_interval_seconds: float = 5.0
+    task_lease_seconds: int = 300
+    task_drain_timeout_seconds: float = 10.0
+
+    # 첨부파일 (콘텐츠 주소 기반 저장소)
+    upload_dir: str = "./uploads"
+    upload_chunk_size: int = 1024 * 1024
+    max_upload_bytes: int = 2 * 1024 * 1024 * 1024
+
+    # 데이터셋 카탈로그 (CSV 미리보기)
+    dataset_dir: str = "./datasets"
+    dataset_index_stride: int = 1024
+    dataset_max_page_size: int = 500
+    dataset_max_scan_rows: int = 100000
+
+    # RSS/Atom 피드
+    site_url: str = "http://localhost:8000"
+    feed_max_items: int = 20
+    feed_max_age_seconds: int = 300
+
+    # 사이트맵 (파일당 URL 수는 프로토콜 한도 50,000)
+    sitemap_dir: str = "./sitemaps"
+    sitemap_max_urls: int = 50000
+    sitemap_yield_per: int = 1000
+
+    # 인기/급상승 게시물 (조회 점수 반감기, 워커별 상위 K, DB 반영 주기)
+    ranking_trending_half_life_hours: float = 48.0
+    ranking_popular_half_life_hours: float = 720.0
+    ranking_top_k: int = 50
+    ranking_flush_seconds: float = 30.0
+
+    # 관련 게시물 (이웃 수, 배치 크기/최대 원소 수, 토큰 문서 빈도 상한 비율, 문서당 토큰 수)
+    related_top_k: int = 5
+    related_batch_size: int = 256
+    related_max_batch_cells: int = 4_000_000
+    related_max_df: float = 0.3
+    related_max_terms: int = 64
+
+    # 키워드 추이 (일괄 집계 배치 크기, 대시보드 표시 기간/키워드 수)
+    trends_batch_size: int = 500
+    trends_months: int = 12
+    trends_top_terms: int = 10
+
+    # 공유 캐시 (워커별 LRU + 공유 계층: sqlite 파일 | redis | local=워커 LRU만)
+    cache_backend: str = "sqlite"
+    cache_path: str = "./cache.db"
+    cache_local_max_entries: int = 256
+    cache_default_ttl_seconds: float = 300.0
+    cache_redis_timeout_seconds: float = 0.5
+
+    # 검색어 자동 완성 (세대 확인 주기, 최대 제안 수)
+    suggest_refresh_seconds: float = 2.0
+    suggest_limit: int = 8
+
+    # 템플릿 조각 캐시 ({% cache %} 블록, 워커별 LRU)
+    fragment_cache_enabled: bool = True
+    fragment_cache_max_entries: int = 512
+    fragment_cache_default_ttl_seconds: float = 300.0
+
+    # 오래된 게시물 보관 (python -m app.archive run)
+    archive_after_days: int = 730
+    archive_batch_size: int = 500
+    archive_pause_seconds: float = 0.1
+
+    # 쓰기 전담 작업 (워커당 하나, 묶어서 한 번에 커밋)
+    write_max_batch: int = 64
+    write_batch_window_seconds: float = 0.0
+    write_busy_timeout_seconds: float = 10.0
+
+    # 본문 글꼴 서브셋 (원본 경로에 {weight}가 있으면 굵기별 정적 글꼴, 없으면 가변 글꼴)
+    font_subset_enabled: bool = True
+    font_source: str = "./fonts/NotoSansKR[wght].ttf"
+    font_dir: str = "./static/fonts"
+    font_weights: str = "300,400,500,700"
+    font_preload_weights: str = "400"
+
+    # 시작 시 워밍업 (최대 대기 시간, 넘으면 배경에서 계속 / 미리 읽을 최근 게시물 수)
+    warmup_enabled: bool = True
+    warmup_wait_seconds: float = 30.0
+    warmup_recent_posts: int = 200
+
+    # 온라인 백업 (python -m app.backup run, 예약 주기 0이면 끔, 보관 개수)
+    backup_dir: str = "./backups"
+    backup_interval_hours: float = 24.0
+    backup_check_seconds: float = 600.0
+    backup_pages_per_step: int = 256
+    backup_step_pause_seconds: float = 0.01
+    backup_max_restarts: int = 5
+    backup_compress: bool = True
+    backup_checksum: bool = True
+    backup_keep: int = 7
+
+    # 본문 압축 저장 (이 바이트 수 이상인 게시물·뉴스 본문을 zlib으로, 0이면 끔 / python -m app.compression)
+    body_compress_min_bytes: int = 1024
+    body_compress_level: int = 6
+    body_compress_batch_size: int = 200
+
+    # 게시물 수정 이력 (이 판 수마다 전체 사본, 그 사이는 차분)
+    revision_snapshot_interval: int = 10
+
+    # 운영 지표
+    metrics_loop_lag_interval_seconds: float = 0.5
+
+    # 요청 수용 제어 (워커당 분류별 동시 실행 수 / 대기열 길이)
+    admission_enabled: bool = True
+    admission_static_concurrency: int = 64
+    admission_static_queue: int = 256
+    admission_board_concurrency: int = 16
+    admission_board_queue: int = 64
+    admission_dashboard_concurrency: int = 4
+    admission_dashboard_queue: int = 16
+    admission_write_concurrency: int = 4
+    admission_write_queue: int = 32
+    admission_max_wait_seconds: float = 2.0
+    admission_retry_after_seconds: float = 1.0
+
     class Config:
         env_file = ".env"
 
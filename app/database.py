@@ -1,12 +1,26 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine, async_sessionmaker
 from app.config import settings
+from app import compression, metrics
 from app.db_base import Base # Import Base from the new central file
 
+def use_wal(engine):
+    """새 연결마다 WAL 모드 확인 (읽기·백업이 쓰기를 막지 않음, 설정은 DB 파일에 남음)"""
+    @event.listens_for(engine.sync_engine, "connect")
+    def _journal_mode(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.close()
+
+
 engine = create_async_engine(
     settings.database_url,
     echo=True,
     future=True
 )
+metrics.instrument_engine(engine)
+compression.install(engine)
+use_wal(engine)
 
 SessionLocal = async_sessionmaker(
     engine,
@@ -19,8 +33,11 @@ async def get_session() -> AsyncSession:
         yield session
 
 async def create_tables():
+    from app.migrations import run_migrations
+
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        await conn.run_sync(run_migrations)
 
 async def init_db():
     """데이터베이스 테이블 생성 및 초기 데이터 입력"""
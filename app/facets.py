@@ -0,0 +1,88 @@
+"""연구 현황 패싯 (연구팀 × 진행 상태 교차표와 기간 구간)
+
+한 번의 GROUP BY 질의로 (연구팀, 상태, 시작 연도, 기간 구간) 조합별 개수를
+가져온 뒤 파이썬에서 교차표와 주변합을 계산합니다. 결과는 research 테이블의
+세대 번호가 바뀔 때까지 재사용합니다.
+"""
+from collections import defaultdict
+from typing import Dict
+
+from sqlalchemy import select, func, case
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import generations
+from app.cache import cache
+from app.models import Research
+
+UNCLASSIFIED = "미분류"
+STATUS_ORDER = ["계획", "진행중", "완료"]
+DURATION_BUCKETS = ["6개월 미만", "6개월~1년", "1~2년", "2년 이상", "종료일 미정", "기간 미상"]
+
+_days = func.julianday(Research.end_date) - func.julianday(Research.start_date)
+_duration_bucket = case(
+    (Research.start_date.is_(None), DURATION_BUCKETS[5]),
+    (Research.end_date.is_(None), DURATION_BUCKETS[4]),
+    (_days < 183, DURATION_BUCKETS[0]),
+    (_days < 365, DURATION_BUCKETS[1]),
+    (_days < 730, DURATION_BUCKETS[2]),
+    else_=DURATION_BUCKETS[3],
+)
+_start_year = func.strftime("%Y", Research.start_date)
+
+
+def _ordered(keys, preferred):
+    head = [k for k in preferred if k in keys]
+    return head + sorted(k for k in keys if k not in preferred)
+
+
+async def compute(session: AsyncSession) -> dict:
+    rows = (await session.execute(
+        select(
+            Research.research_type,
+            Research.status,
+            _start_year.label("start_year"),
+            _duration_bucket.label("duration"),
+            func.count(Research.id).label("count"),
+        ).group_by(Research.research_type, Research.status, _start_year, _duration_bucket)
+    )).all()
+
+    matrix: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    type_totals: Dict[str, int] = defaultdict(int)
+    status_totals: Dict[str, int] = defaultdict(int)
+    start_years: Dict[str, int] = defaultdict(int)
+    durations: Dict[str, int] = defaultdict(int)
+    total = 0
+    for research_type, status, start_year, duration, count in rows:
+        research_type = research_type or UNCLASSIFIED
+        status = status or UNCLASSIFIED
+        matrix[research_type][status] += count
+        type_totals[research_type] += count
+        status_totals[status] += count
+        start_years[start_year or "미정"] += count
+        durations[duration] += count
+        total += count
+
+    types = sorted(type_totals, key=lambda t: (-type_totals[t], t))
+    statuses = _ordered(status_totals, STATUS_ORDER)
+    return {
+        "types": types,
+        "statuses": statuses,
+        "matrix": {t: {s: matrix[t].get(s, 0) for s in statuses} for t in types},
+        "type_totals": dict(type_totals),
+        "status_totals": dict(status_totals),
+        "start_years": sorted(start_years.items()),
+        "durations": [(b, durations[b]) for b in DURATION_BUCKETS if durations.get(b)],
+        "total": total,
+    }
+
+
+async def research_facets(session: AsyncSession) -> dict:
+    generation = (await generations.current(session, "research"))["research"]
+
+    async def build():
+        facets = await compute(session)
+        facets["generation"] = generation
+        return facets
+
+    # 세대 번호가 키에 들어가므로 research가 바뀌면 자연히 새로 계산 (워커 간 공유)
+    return await cache.get_or_set(f"research_facets:{generation}", build)
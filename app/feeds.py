@@ -0,0 +1,263 @@
+"""게시물/주요 뉴스 RSS·Atom 피드
+
+피드 본문은 `feed_cache` 테이블에 완성된 바이트로 저장되고 ETag/Last-Modified와
+함께 그대로 응답합니다. 게시물이 바뀌면 후처리 작업이 해당 카테고리와 전체
+피드만 다시 만들고, 그 밖의 피드는 원본 테이블 세대가 달라졌을 때 다음 요청에서
+다시 만듭니다. 내용이 같으면 ETag도 그대로라 구독자는 계속 304를 받습니다.
+"""
+import hashlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime
+from typing import Optional
+from xml.sax.saxutils import escape
+
+from sqlalchemy import select, delete, case
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, undefer
+
+from app import generations, metrics
+from app.config import settings
+from app.database import SessionLocal
+from app.models import FeedCache, Post, News, Category
+from app.tasks import subscribe
+
+FORMATS = {
+    "rss": "application/rss+xml; charset=utf-8",
+    "atom": "application/atom+xml; charset=utf-8",
+}
+SUMMARY_LENGTH = 300
+SITE_TITLE = "인문·사회과학 데이터 연구소 (HSSDI)"
+# 항목이 없는 피드도 본문이 매번 같도록 고정 시각 사용
+_EMPTY_UPDATED = datetime(2025, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(frozen=True)
+class FeedSpec:
+    fmt: str
+    source: str  # posts | news
+    category_id: Optional[int] = None
+
+    @property
+    def key(self) -> str:
+        if self.category_id is not None:
+            return f"{self.fmt}:category-{self.category_id}"
+        return f"{self.fmt}:{self.source}"
+
+    @property
+    def path(self) -> str:
+        if self.category_id is not None:
+            return f"/feeds/category/{self.category_id}.{self.fmt}"
+        return f"/feeds/{self.source}.{self.fmt}"
+
+
+@dataclass
+class _Entry:
+    title: str
+    link: str
+    summary: str
+    author: str
+    category: Optional[str]
+    published: datetime
+    updated: datetime
+
+
+def as_utc(value: Optional[datetime]) -> datetime:
+    # SQLite의 CURRENT_TIMESTAMP는 시간대 없는 UTC
+    value = value or datetime.utcnow()
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def _summary(text: str) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= SUMMARY_LENGTH else text[:SUMMARY_LENGTH] + "…"
+
+
+async def _entries(session: AsyncSession, spec: FeedSpec):
+    base = settings.site_url.rstrip("/")
+    if spec.source == "news":
+        rows = (await session.scalars(
+            select(News).options(joinedload(News.author), undefer(News.content))
+            .where(News.is_featured == True)
+            .order_by(News.published_at.desc())
+            .limit(settings.feed_max_items)
+        )).all()
+        return "주요 뉴스", f"{base}/dashboard/", [
+            _Entry(
+                title=news.title,
+                link=f"{base}/dashboard/#news-{news.id}",
+                summary=_summary(news.content),
+                author=news.author.full_name if news.author else SITE_TITLE,
+                category=None,
+                published=as_utc(news.published_at or news.created_at),
+                updated=as_utc(news.updated_at or news.published_at or news.created_at),
+            )
+            for news in rows
+        ]
+
+    query = (
+        select(Post).options(joinedload(Post.author), joinedload(Post.category), undefer(Post.content))
+        .where(Post.is_published == True)
+        .order_by(Post.created_at.desc())
+        .limit(settings.feed_max_items)
+    )
+    title, link = "게시판", f"{base}/board/"
+    if spec.category_id is not None:
+        category = await session.get(Category, spec.category_id)
+        if category is None:
+            return None
+        query = query.where(Post.category_id == spec.category_id)
+        title, link = category.name, f"{base}/board/?category_id={spec.category_id}"
+    rows = (await session.scalars(query)).all()
+    return title, link, [
+        _Entry(
+            title=post.title,
+            link=f"{base}/board/{post.id}",
+            summary=_summary(post.content),
+            author=(post.author.full_name or post.author.username) if post.author else SITE_TITLE,
+            category=post.category.name if post.category else None,
+            published=as_utc(post.created_at),
+            updated=as_utc(post.updated_at or post.created_at),
+        )
+        for post in rows
+    ]
+
+
+def _render_rss(title: str, link: str, self_url: str, entries) -> str:
+    items = []
+    for e in entries:
+        category = f"<category>{escape(e.category)}</category>" if e.category else ""
+        items.append(
+            "<item>"
+            f"<title>{escape(e.title)}</title>"
+            f"<link>{escape(e.link)}</link>"
+            f'<guid isPermaLink="true">{escape(e.link)}</guid>'
+            f"<description>{escape(e.summary)}</description>"
+            f"<author>{escape(e.author)}</author>"
+            f"{category}"
+            f"<pubDate>{format_datetime(e.published)}</pubDate>"
+            "</item>"
+        )
+    last_build = format_datetime(max((e.updated for e in entries), default=_EMPTY_UPDATED))
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<rss version="2.0" xmlns:atom="http://www.w3.org/2005/Atom"><channel>'
+        f"<title>{escape(SITE_TITLE)} - {escape(title)}</title>"
+        f"<link>{escape(link)}</link>"
+        f'<atom:link href="{escape(self_url)}" rel="self" type="application/rss+xml"/>'
+        f"<description>{escape(SITE_TITLE)} {escape(title)}</description>"
+        "<language>ko</language>"
+        f"<lastBuildDate>{last_build}</lastBuildDate>"
+        + "".join(items)
+        + "</channel></rss>\n"
+    )
+
+
+def _render_atom(title: str, link: str, self_url: str, entries) -> str:
+    items = []
+    for e in entries:
+        category = f'<category term="{escape(e.category)}"/>' if e.category else ""
+        items.append(
+            "<entry>"
+            f"<title>{escape(e.title)}</title>"
+            f'<link href="{escape(e.link)}"/>'
+            f"<id>{escape(e.link)}</id>"
+            f"<published>{e.published.isoformat()}</published>"
+            f"<updated>{e.updated.isoformat()}</updated>"
+            f"<author><name>{escape(e.author)}</name></author>"
+            f"{category}"
+            f"<summary>{escape(e.summary)}</summary>"
+            "</entry>"
+        )
+    updated = max((e.updated for e in entries), default=_EMPTY_UPDATED).isoformat()
+    return (
+        '<?xml version="1.0" encoding="utf-8"?>\n'
+        '<feed xmlns="http://www.w3.org/2005/Atom" xml:lang="ko">'
+        f"<title>{escape(SITE_TITLE)} - {escape(title)}</title>"
+        f'<link href="{escape(link)}"/>'
+        f'<link rel="self" href="{escape(self_url)}"/>'
+        f"<id>{escape(self_url)}</id>"
+        f"<updated>{updated}</updated>"
+        + "".join(items)
+        + "</feed>\n"
+    )
+
+
+async def refresh(session: AsyncSession, spec: FeedSpec, generation: int) -> bool:
+    """피드를 다시 만들어 저장 (카테고리가 없으면 False)
+
+    본문이 이전과 같으면 ETag와 Last-Modified는 그대로 둡니다.
+    """
+    built = await _entries(session, spec)
+    if built is None:
+        return False
+    title, link, entries = built
+    self_url = settings.site_url.rstrip("/") + spec.path
+    render = _render_rss if spec.fmt == "rss" else _render_atom
+    body = render(title, link, self_url, entries).encode("utf-8")
+    etag = '"' + hashlib.sha256(body).hexdigest()[:32] + '"'
+
+    table = FeedCache.__table__
+    stmt = insert(table).values(
+        key=spec.key,
+        generation=generation,
+        content_type=FORMATS[spec.fmt],
+        body=body,
+        etag=etag,
+        last_modified=datetime.utcnow().replace(microsecond=0),
+    )
+    # 여러 워커가 동시에 만들어도 안전하도록 upsert (SET의 컬럼 참조는 기존 행 값)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.key],
+        set_={
+            "generation": stmt.excluded.generation,
+            "content_type": stmt.excluded.content_type,
+            "body": stmt.excluded.body,
+            "etag": stmt.excluded.etag,
+            "last_modified": case(
+                (table.c.etag == stmt.excluded.etag, table.c.last_modified),
+                else_=stmt.excluded.last_modified,
+            ),
+        },
+    )
+    await session.execute(stmt)
+    return True
+
+
+async def get_feed(session: AsyncSession, spec: FeedSpec) -> Optional[FeedCache]:
+    """저장된 피드를 반환하고, 원본 세대가 바뀌었으면 먼저 다시 만듦"""
+    generation = (await generations.current(session, spec.source))[spec.source]
+    feed = await session.get(FeedCache, spec.key)
+    hit = feed is not None and feed.generation == generation
+    metrics.cache_result("feeds", hit)
+    if hit:
+        return feed
+    if not await refresh(session, spec, generation):
+        return None
+    await session.commit()
+    return await session.get(FeedCache, spec.key, populate_existing=True)
+
+
+@subscribe("post.changed")
+async def refresh_post_feeds(payload: dict):
+    """바뀐 게시물이 속한 카테고리 피드와 전체 피드를 미리 다시 만듦"""
+    category_ids = {None, payload.get("category_id"), payload.get("old_category_id")}
+    async with SessionLocal() as session:
+        generation = (await generations.current(session, "posts"))["posts"]
+        for category_id in category_ids:
+            for fmt in FORMATS:
+                await refresh(session, FeedSpec(fmt, "posts", category_id), generation)
+        await session.commit()
+
+
+@subscribe("category.changed")
+async def drop_category_feeds(payload: dict):
+    if payload.get("action") != "deleted":
+        return
+    async with SessionLocal() as session:
+        keys = [FeedSpec(fmt, "posts", payload["category_id"]).key for fmt in FORMATS]
+        await session.execute(delete(FeedCache).where(FeedCache.key.in_(keys)))
+        await session.commit()
@@ -0,0 +1,338 @@
+"""본문 글꼴(Noto Sans KR) 서브셋 생성과 제공
+
+Google Fonts를 쓰면 첫 방문마다 외부 연결을 새로 열고 unicode-range 조각 수십 개를
+받아야 합니다. 여기서는 템플릿과 게시물 등에 실제로 쓰인 글자만 남긴 WOFF2를 굵기별로
+만들어 `/static/fonts/`에서 직접 제공합니다. 파일 이름에 내용 해시가 들어가므로
+1년 immutable 캐시를 쓰고, 레이아웃은 manifest.json을 읽어 @font-face와 preload
+링크를 넣습니다. 서브셋이 아직 없으면 예전처럼 Google Fonts를 씁니다.
+
+    python -m app.fonts build     # 템플릿 + DB 전체 글자로 다시 만듦
+
+원본은 `FONT_SOURCE`의 가변 글꼴(wght 축)이며, 경로에 `{weight}`가 있으면 굵기별
+정적 글꼴 파일을 씁니다. 워커가 시작할 때 서브셋이 없거나 원본·굵기 설정이 바뀌었거나
+템플릿에 없는 글자가 생겼으면 다시 만들고, 게시물·카테고리가 바뀌면 새 글자가 있을
+때만 기존 글자에 더해 다시 만듭니다. 생성에는 fonttools와 brotli가 필요합니다.
+서브셋 생성은 순수 파이썬 CPU 작업이라 웹 워커의 이벤트 루프를 막지 않도록 별도
+프로세스에서 실행합니다.
+"""
+import asyncio
+import hashlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Iterable, List, Optional, Set
+
+import anyio
+from sqlalchemy import select
+from starlette.staticfiles import StaticFiles
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import ArchivedPost, Category, Dataset, News, Post, Research
+from app.tasks import subscribe
+
+try:
+    import fcntl
+except ImportError:  # Windows 개발 환경: 워커 간 잠금 없이 실행
+    fcntl = None
+
+FAMILY = "Noto Sans KR"
+PREFIX = "noto-sans-kr"
+MANIFEST = "manifest.json"
+URL_PREFIX = "/static/fonts/"
+
+# 항상 넣는 글자: ASCII, 자주 쓰는 문장 부호·기호, 한글 호환 자모 (자동 완성 입력)
+BASE_CHARS = (
+    "".join(chr(code) for code in range(0x20, 0x7F))
+    + "·…‘’“”–—«»「」『』【】〈〉《》※○●◎□■△▲▽▼◇◆☆★→←↑↓↔①②③④⑤℃°±×÷"
+    + "".join(chr(code) for code in range(0x3131, 0x318F))
+)
+# 한글 자모 조합 기능은 남김
+LAYOUT_FEATURES = ["*"]
+
+# 글자를 모을 DB 컬럼
+TEXT_COLUMNS = (
+    (Post.title, Post.content),
+    (ArchivedPost.title, ArchivedPost.content),
+    (Category.name, Category.description),
+    (News.title, News.content),
+    (Research.title, Research.description),
+    (Dataset.title, Dataset.description),
+)
+TEXT_FILES = ("templates", "static/js")
+
+# 같은 워커 안에서는 차례로 만들고, 워커 사이에서는 font_dir/.lock 파일 잠금으로 차례를 기다림
+_build_lock = asyncio.Lock()
+
+
+def weights() -> List[int]:
+    return [int(weight) for weight in settings.font_weights.split(",") if weight.strip()]
+
+
+def _source_paths() -> List[str]:
+    if "{weight}" in settings.font_source:
+        return [settings.font_source.format(weight=weight) for weight in weights()]
+    return [settings.font_source]
+
+
+def _source_digest() -> Optional[str]:
+    """원본 글꼴과 굵기 설정이 바뀌었는지 비교할 값 (원본이 없으면 None)"""
+    paths = _source_paths()
+    if not all(os.path.isfile(path) for path in paths):
+        return None
+    parts = [settings.font_weights] + [f"{os.path.getsize(path)}:{os.path.getmtime(path):.0f}" for path in paths]
+    return hashlib.sha256("|".join(parts).encode()).hexdigest()[:16]
+
+
+def file_chars() -> Set[str]:
+    """템플릿과 스크립트에 쓰인 글자"""
+    chars = set(BASE_CHARS)
+    for root in TEXT_FILES:
+        for directory, _, names in os.walk(root):
+            for name in names:
+                with open(os.path.join(directory, name), encoding="utf-8", errors="ignore") as f:
+                    chars.update(f.read())
+    return _printable(chars)
+
+
+async def db_chars() -> Set[str]:
+    """DB의 게시물·카테고리·소식·연구·데이터셋 글자"""
+    chars: Set[str] = set()
+    async with SessionLocal() as session:
+        for columns in TEXT_COLUMNS:
+            result = await session.stream(select(*columns).execution_options(yield_per=1000))
+            async for row in result:
+                for value in row:
+                    if value:
+                        chars.update(value)
+    return _printable(chars)
+
+
+def _printable(chars: Iterable[str]) -> Set[str]:
+    return {char for char in chars if char == " " or (char.isprintable() and not char.isspace())}
+
+
+# 레이아웃에서 읽는 manifest (파일이 바뀔 때만 다시 읽음)
+_manifest_cache = {"mtime": None, "value": None}
+
+
+def manifest() -> Optional[dict]:
+    path = os.path.join(settings.font_dir, MANIFEST)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+    if _manifest_cache["mtime"] != mtime:
+        with open(path, encoding="utf-8") as f:
+            _manifest_cache["value"] = json.load(f)
+        _manifest_cache["mtime"] = mtime
+    return _manifest_cache["value"]
+
+
+def web_fonts() -> Optional[dict]:
+    """템플릿용: {"faces": [(굵기, URL)], "preload": [URL]} 또는 서브셋이 없으면 None"""
+    current = manifest()
+    if not current:
+        return None
+    faces = [(int(weight), URL_PREFIX + name) for weight, name in sorted(current["files"].items(), key=lambda item: int(item[0]))]
+    preload = {int(weight) for weight in settings.font_preload_weights.split(",") if weight.strip()}
+    return {"family": FAMILY, "faces": faces, "preload": [url for weight, url in faces if weight in preload]}
+
+
+class FontFiles(StaticFiles):
+    """서브셋 파일 제공 - 이름에 내용 해시가 있으므로 immutable 캐시"""
+
+    def file_response(self, full_path, stat_result, scope, status_code=200):
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        if str(full_path).endswith(".woff2"):
+            response.headers["Cache-Control"] = "public, max-age=31536000, immutable"
+        else:
+            response.headers["Cache-Control"] = "no-cache"
+        return response
+
+
+def _subset(chars: Set[str]) -> dict:
+    """원본에서 chars만 남긴 굵기별 WOFF2를 만들고 {굵기: 바이트} 반환 (동기, CPU 작업)"""
+    from fontTools import subset
+    from fontTools.ttLib import TTFont
+
+    options = subset.Options()
+    options.flavor = "woff2"
+    options.layout_features = LAYOUT_FEATURES
+    options.hinting = False
+    options.desubroutinize = True
+    text = "".join(sorted(chars))
+
+    def subset_font(font):
+        subsetter = subset.Subsetter(options=options)
+        subsetter.populate(text=text)
+        subsetter.subset(font)
+        return font
+
+    def to_woff2(font) -> bytes:
+        font.flavor = "woff2"
+        buffer = io.BytesIO()
+        font.save(buffer)
+        return buffer.getvalue()
+
+    if "{weight}" in settings.font_source:
+        return {weight: to_woff2(subset_font(TTFont(path)))
+                for weight, path in zip(weights(), _source_paths())}
+
+    from fontTools.varLib import instancer
+
+    # 가변 글꼴은 글자를 먼저 줄인 뒤 굵기마다 고정 (전체 글리프로 고정하는 것보다 훨씬 빠름)
+    buffer = io.BytesIO()
+    small = subset_font(TTFont(settings.font_source))
+    small.flavor = None
+    small.save(buffer)
+    files = {}
+    for weight in weights():
+        buffer.seek(0)
+        files[weight] = to_woff2(instancer.instantiateVariableFont(TTFont(buffer), {"wght": weight}))
+    return files
+
+
+def build(chars: Set[str]) -> dict:
+    """서브셋을 만들어 font_dir에 쓰고 새 manifest 반환 (동기 함수, 별도 프로세스에서 실행)"""
+    os.makedirs(settings.font_dir, exist_ok=True)
+    started = time.perf_counter()
+    files = {}
+    for weight, data in _subset(chars).items():
+        name = f"{PREFIX}-{weight}.{hashlib.sha256(data).hexdigest()[:12]}.woff2"
+        path = os.path.join(settings.font_dir, name)
+        if not os.path.exists(path):
+            with open(path + ".tmp", "wb") as f:
+                f.write(data)
+            os.replace(path + ".tmp", path)
+        files[str(weight)] = name
+
+    result = {
+        "source": _source_digest(),
+        "chars": "".join(sorted(chars)),
+        "files": files,
+        "built_at": int(time.time()),
+    }
+    target = os.path.join(settings.font_dir, MANIFEST)
+    with open(target + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False)
+    os.replace(target + ".tmp", target)
+    _prune(set(files.values()))
+    size = sum(os.path.getsize(os.path.join(settings.font_dir, name)) for name in files.values())
+    print(f"✅ 글꼴 서브셋 생성: {len(chars):,}자, 굵기 {len(files)}개, {size:,}바이트 "
+          f"({time.perf_counter() - started:.1f}초)")
+    return result
+
+
+def _prune(keep: Set[str]):
+    """이전 서브셋 중 하루가 지난 파일 삭제 (캐시된 페이지가 아직 가리킬 수 있으므로 바로 지우지 않음)"""
+    cutoff = time.time() - 86400
+    for name in os.listdir(settings.font_dir):
+        path = os.path.join(settings.font_dir, name)
+        if name.startswith(PREFIX) and name.endswith(".woff2") and name not in keep and os.path.getmtime(path) < cutoff:
+            os.unlink(path)
+
+
+async def refresh(extra: Iterable[str] = (), full: bool = False) -> Optional[dict]:
+    """필요할 때만 서브셋을 다시 만듦
+
+    full이면 템플릿과 DB 전체 글자로, 아니면 기존 글자에 템플릿 글자와 extra를 더해
+    새 글자가 있거나 원본이 바뀌었을 때만 만듭니다. 다른 워커가 만드는 중이면 끝날
+    때까지 기다린 뒤 그 결과에 없는 글자만 더하므로 extra의 글자는 빠지지 않습니다.
+    """
+    source = _source_digest()
+    if source is None:
+        return None
+    os.makedirs(settings.font_dir, exist_ok=True)
+    async with _build_lock:
+        with open(os.path.join(settings.font_dir, ".lock"), "w") as lock:
+            if fcntl is not None:
+                await anyio.to_thread.run_sync(fcntl.flock, lock, fcntl.LOCK_EX)
+            return await _refresh_locked(source, extra, full)
+
+
+async def _refresh_locked(source: str, extra: Iterable[str], full: bool) -> Optional[dict]:
+    current = manifest()
+    chars = await anyio.to_thread.run_sync(file_chars)
+    chars.update(_printable(extra))
+    if full or current is None:
+        chars |= await db_chars()
+    else:
+        covered = set(current["chars"])
+        if current.get("source") == source and chars <= covered:
+            return None
+        chars |= covered
+    return await _build_in_process(chars)
+
+
+async def _build_in_process(chars: Set[str]) -> dict:
+    """build를 별도 프로세스에서 실행 (스레드에서는 GIL을 오래 잡아 요청 처리가 멈춤)"""
+    loop = asyncio.get_running_loop()
+    # 부모의 이벤트 루프·DB 연결을 물려받지 않도록 spawn으로 시작
+    with ProcessPoolExecutor(max_workers=1, mp_context=get_context("spawn")) as pool:
+        return await loop.run_in_executor(pool, build, chars)
+
+
+def enabled() -> bool:
+    return settings.font_subset_enabled and _source_digest() is not None
+
+
+async def start_refresh() -> Optional[asyncio.Task]:
+    """워커 시작 시 배경에서 서브셋 확인 (요청 처리를 기다리게 하지 않음)"""
+    if not enabled():
+        return None
+
+    async def run():
+        try:
+            await refresh()
+        except Exception as e:
+            print(f"❌ 글꼴 서브셋 생성 실패: {e}")
+
+    return asyncio.create_task(run())
+
+
+@subscribe("post.changed")
+async def add_post_glyphs(payload: dict):
+    """새 게시물/수정된 게시물에 서브셋에 없는 글자가 있으면 더해서 다시 만듦"""
+    if not enabled() or payload.get("action") == "deleted":
+        return
+    async with SessionLocal() as session:
+        row = (await session.execute(
+            select(Post.title, Post.content).where(Post.id == payload["post_id"])
+        )).one_or_none()
+    if row is not None:
+        await refresh("".join(value or "" for value in row))
+
+
+@subscribe("category.changed")
+async def add_category_glyphs(payload: dict):
+    if not enabled() or payload.get("action") == "deleted":
+        return
+    async with SessionLocal() as session:
+        row = (await session.execute(
+            select(Category.name, Category.description).where(Category.id == payload["category_id"])
+        )).one_or_none()
+    if row is not None:
+        await refresh("".join(value or "" for value in row))
+
+
+async def _main(argv: List[str]):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="python -m app.fonts")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("build", help="템플릿과 DB 전체 글자로 서브셋을 다시 만듦")
+    parser.parse_args(argv)
+
+    if _source_digest() is None:
+        print(f"❌ 원본 글꼴이 없습니다: {', '.join(_source_paths())}")
+        sys.exit(1)
+    await refresh(full=True)
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1:]))
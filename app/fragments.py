@@ -0,0 +1,94 @@
+"""Jinja 조각 캐시 (`{% cache key, ttl %} ... {% endcache %}`)
+
+여러 페이지·사용자가 함께 쓰는 템플릿 조각을 한 번 렌더링해 저장소에 두고
+재사용합니다. 키에는 조각 내용을 결정하는 데이터의 세대 번호를 넣습니다.
+
+    {% cache ("board-categories", categories_generation, current_category), 3600 %}
+        ...
+    {% endcache %}
+
+키는 문자열이나 튜플(':'로 연결), TTL은 초 단위이며 생략하면 저장소 기본값을
+씁니다. 저장소는 `get(key)`/`set(key, value, ttl)`만 있으면 되고
+`environment.fragment_cache`로 바꿔 끼울 수 있습니다. 템플릿 렌더링은 동기로
+실행되므로 기본 저장소는 워커 메모리의 LRU입니다. 세대 번호가 키에 들어가므로
+워커마다 따로 두어도 내용이 어긋나지 않습니다.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+from jinja2 import nodes
+from jinja2.ext import Extension
+from markupsafe import Markup
+
+from app import metrics
+
+
+def fragment_key(key) -> str:
+    if isinstance(key, (tuple, list)):
+        return ":".join(str(part) for part in key)
+    return str(key)
+
+
+class LocalFragmentStore:
+    """워커 메모리의 LRU (항목별 만료 시간)"""
+
+    def __init__(self, max_entries: int = 512, default_ttl: float = 300.0):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: str, ttl: Optional[float] = None):
+        expires_at = time.monotonic() + (self.default_ttl if ttl is None else ttl)
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class FragmentCacheExtension(Extension):
+    tags = {"cache"}
+
+    def __init__(self, environment):
+        super().__init__(environment)
+        environment.extend(fragment_cache=None)
+
+    def parse(self, parser):
+        lineno = next(parser.stream).lineno
+        args = [parser.parse_expression()]
+        if parser.stream.skip_if("comma"):
+            args.append(parser.parse_expression())
+        else:
+            args.append(nodes.Const(None))
+        body = parser.parse_statements(("name:endcache",), drop_needle=True)
+        return nodes.CallBlock(self.call_method("_cache_support", args), [], [], body).set_lineno(lineno)
+
+    def _cache_support(self, key, ttl, caller):
+        store = self.environment.fragment_cache
+        if store is None:
+            return caller()
+        key = fragment_key(key)
+        value = store.get(key)
+        metrics.cache_result("fragments", value is not None)
+        if value is None:
+            value = caller()
+            store.set(key, value, ttl)
+        return Markup(value)
@@ -0,0 +1,66 @@
+"""테이블 쓰기 세대 번호
+
+추적 대상 모델의 행이 추가·수정·삭제되면 같은 트랜잭션 안에서
+`table_generations`의 번호가 올라갑니다. 캐시는 계산 당시의 세대 번호를
+함께 보관하고, 번호가 달라졌을 때만 다시 계산합니다. 번호는 DB에 있으므로
+여러 워커 사이에서도 일관됩니다.
+"""
+from typing import Dict, Iterable
+
+from sqlalchemy import event, insert, inspect, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import TableGeneration, Research, Post, News, Category
+
+_table = TableGeneration.__table__
+
+
+def _bump(connection, name: str):
+    connection.execute(insert(_table).values(name=name, generation=0).prefix_with("OR IGNORE", dialect="sqlite"))
+    connection.execute(
+        update(_table).where(_table.c.name == name).values(generation=_table.c.generation + 1)
+    )
+
+
+async def bump(session: AsyncSession, name: str) -> int:
+    """매퍼 이벤트를 거치지 않는 쓰기(일괄 DELETE 등) 후 직접 세대를 올리고 새 번호 반환"""
+    await session.run_sync(lambda sync_session: _bump(sync_session.connection(), name))
+    return await session.scalar(select(TableGeneration.generation).where(TableGeneration.name == name))
+
+
+def track(model, name: str, ignore: Iterable[str] = ()):
+    """모델 쓰기 시 세대 번호를 올리도록 매퍼 이벤트 등록
+
+    `ignore`에 있는 컬럼만 바뀐 수정(예: 조회수)은 세대를 바꾸지 않습니다.
+    """
+    ignored = set(ignore)
+
+    def on_write(mapper, connection, target):
+        _bump(connection, name)
+
+    def on_update(mapper, connection, target):
+        state = inspect(target)
+        for attr in mapper.column_attrs:
+            if attr.key not in ignored and state.attrs[attr.key].history.has_changes():
+                _bump(connection, name)
+                return
+
+    event.listen(model, "after_insert", on_write)
+    event.listen(model, "after_delete", on_write)
+    event.listen(model, "after_update", on_update)
+
+
+async def current(session: AsyncSession, *names: str) -> Dict[str, int]:
+    result = await session.execute(
+        select(TableGeneration.name, TableGeneration.generation).where(TableGeneration.name.in_(names))
+    )
+    generations = {name: 0 for name in names}
+    generations.update(dict(result.all()))
+    return generations
+
+
+track(Research, "research")
+# 조회수 증가는 피드 등 게시물 캐시를 무효화하지 않음
+track(Post, "posts", ignore=("views", "updated_at"))
+track(News, "news", ignore=("updated_at",))
+track(Category, "categories")
@@ -0,0 +1,212 @@
+"""Prometheus 형식 운영 지표
+
+라우트별 지연 시간과 상태 코드, DB 연결 대기/사용량, 템플릿 렌더링 시간,
+이벤트 루프 지연, 캐시 적중률을 기록합니다. gunicorn 여러 워커의 값을 합치려면
+`PROMETHEUS_MULTIPROC_DIR`를 워커가 prometheus_client를 import하기 전에
+설정해야 합니다 (gunicorn.conf.py 참고). 설정되지 않으면 프로세스 하나의 값만
+노출합니다.
+"""
+import asyncio
+import os
+import time
+from typing import Optional
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from starlette.routing import Match, Mount
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+FAST_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+
+HTTP_REQUESTS = Counter(
+    "hssdi_http_requests_total", "처리한 HTTP 요청 수", ["method", "route", "status"]
+)
+HTTP_LATENCY = Histogram(
+    "hssdi_http_request_duration_seconds", "HTTP 요청 처리 시간", ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_PROGRESS = Gauge(
+    "hssdi_http_requests_in_progress", "처리 중인 HTTP 요청 수", ["method"],
+    multiprocess_mode="livesum",
+)
+DB_CHECKOUT_WAIT = Histogram(
+    "hssdi_db_checkout_wait_seconds", "세션이 DB 연결을 얻기까지 걸린 시간",
+    buckets=FAST_BUCKETS,
+)
+DB_CONNECTIONS_IN_USE = Gauge(
+    "hssdi_db_connections_in_use", "사용 중인 DB 연결 수",
+    multiprocess_mode="livesum",
+)
+DB_CONNECTIONS_OPENED = Counter(
+    "hssdi_db_connections_opened_total", "새로 연 DB 연결 수"
+)
+TEMPLATE_RENDER = Histogram(
+    "hssdi_template_render_seconds", "템플릿 렌더링 시간", ["template"],
+    buckets=FAST_BUCKETS,
+)
+LOOP_LAG = Histogram(
+    "hssdi_event_loop_lag_seconds", "이벤트 루프가 예정보다 늦게 깨어난 시간",
+    buckets=FAST_BUCKETS,
+)
+CACHE_REQUESTS = Counter(
+    "hssdi_cache_requests_total", "캐시 조회 결과", ["cache", "result"]
+)
+CACHE_TIER_HITS = Counter(
+    "hssdi_cache_tier_hits_total", "공유 캐시 계층별 적중 수 (local=워커 LRU, shared=공유 계층)", ["cache", "tier"]
+)
+WRITE_BATCH_SIZE = Histogram(
+    "hssdi_write_batch_size", "한 트랜잭션으로 묶어 커밋한 쓰기 수",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+WRITE_LATENCY = Histogram(
+    "hssdi_write_latency_seconds", "쓰기 요청을 넘긴 뒤 커밋 결과를 받기까지 걸린 시간",
+    buckets=LATENCY_BUCKETS,
+)
+ADMISSION_ACTIVE = Gauge(
+    "hssdi_admission_active", "분류별 처리 중인 요청 수", ["route_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_QUEUED = Gauge(
+    "hssdi_admission_queue_depth", "분류별 대기열에서 기다리는 요청 수", ["route_class"],
+    multiprocess_mode="livesum",
+)
+ADMISSION_WAIT = Histogram(
+    "hssdi_admission_wait_seconds", "대기열에서 기다린 시간", ["route_class"],
+    buckets=LATENCY_BUCKETS,
+)
+ADMISSION_REJECTED = Counter(
+    "hssdi_admission_rejected_total", "503으로 거절한 요청 수", ["route_class", "reason"]
+)
+WARMUP_DURATION = Histogram(
+    "hssdi_warmup_seconds", "워커 시작 시 워밍업 단계별 소요 시간", ["stage"],
+    buckets=LATENCY_BUCKETS,
+)
+BACKUPS = Counter(
+    "hssdi_backups_total", "DB 백업 실행 결과", ["result"]
+)
+BACKUP_DURATION = Histogram(
+    "hssdi_backup_duration_seconds", "DB 스냅샷 하나를 만드는 데 걸린 시간 (압축·체크섬 포함)",
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1800),
+)
+BACKUP_RESTARTS = Counter(
+    "hssdi_backup_restarts_total", "복사 중 원본이 바뀌어 처음부터 다시 복사한 횟수"
+)
+BACKUP_THROUGHPUT = Gauge(
+    "hssdi_backup_throughput_bytes_per_second", "마지막 백업의 처리량 (DB 크기 / 소요 시간)",
+    multiprocess_mode="mostrecent",
+)
+BACKUP_SIZE = Gauge(
+    "hssdi_backup_size_bytes", "마지막 스냅샷 파일 크기", multiprocess_mode="mostrecent",
+)
+BACKUP_LAST_SUCCESS = Gauge(
+    "hssdi_backup_last_success_timestamp_seconds", "마지막으로 성공한 백업 시각", multiprocess_mode="mostrecent",
+)
+
+_UNMATCHED = "<unmatched>"
+_LOOPBACK = {"127.0.0.1", "::1"}
+
+
+def cache_result(cache: str, hit: bool, tier: Optional[str] = None):
+    CACHE_REQUESTS.labels(cache, "hit" if hit else "miss").inc()
+    if hit and tier:
+        CACHE_TIER_HITS.labels(cache, tier).inc()
+
+
+def _route_label(app, scope) -> str:
+    """경로 파라미터 대신 라우트 템플릿을 라벨로 (예: /board/{post_id})"""
+    for route in getattr(app, "routes", []):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            if isinstance(route, Mount):
+                return route.path + "/*"
+            return route.path
+    return _UNMATCHED
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.labels(method).inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_PROGRESS.labels(method).dec()
+            route = _route_label(scope.get("app"), scope)
+            HTTP_LATENCY.labels(method, route).observe(time.perf_counter() - start)
+            HTTP_REQUESTS.labels(method, route, str(status)).inc()
+
+
+def instrument_engine(engine):
+    """연결 사용량과 세션의 연결 획득 대기 시간 기록
+
+    세션 트랜잭션이 만들어진 시점부터 연결이 붙은 시점(after_begin)까지를
+    대기 시간으로 봅니다. 풀 종류(NullPool/QueuePool)와 무관하게 동작합니다.
+    """
+    sync_engine = engine.sync_engine
+
+    event.listen(sync_engine, "connect", lambda *args: DB_CONNECTIONS_OPENED.inc())
+    event.listen(sync_engine, "checkout", lambda *args: DB_CONNECTIONS_IN_USE.inc())
+    event.listen(sync_engine, "checkin", lambda *args: DB_CONNECTIONS_IN_USE.dec())
+
+    @event.listens_for(Session, "after_transaction_create")
+    def _mark_checkout_start(session, transaction):
+        if transaction.parent is None:
+            session.info["_metrics_checkout_start"] = time.perf_counter()
+
+    @event.listens_for(Session, "after_begin")
+    def _observe_checkout(session, transaction, connection):
+        start = session.info.pop("_metrics_checkout_start", None)
+        if start is not None:
+            DB_CHECKOUT_WAIT.observe(time.perf_counter() - start)
+
+
+async def monitor_event_loop(interval: float):
+    """interval마다 깨어나 예정 시각과의 차이를 기록"""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        LOOP_LAG.observe(max(0.0, loop.time() - expected))
+
+
+def start_loop_monitor(interval: float) -> asyncio.Task:
+    return asyncio.create_task(monitor_event_loop(interval))
+
+
+def is_local(host: Optional[str]) -> bool:
+    return host in _LOOPBACK
+
+
+def render() -> tuple:
+    """노출할 지표 본문과 Content-Type"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+        return generate_latest(registry), CONTENT_TYPE_LATEST
+    from prometheus_client import REGISTRY
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
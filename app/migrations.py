@@ -0,0 +1,83 @@
+"""기존 데이터베이스용 스키마 마이그레이션
+
+`create_all()`은 이미 있는 테이블을 건너뛰므로 기존 테이블에 추가된 인덱스나
+컬럼은 여기서 적용합니다. 적용된 버전은 `schema_migrations`에 기록되며 각
+단계는 여러 워커가 동시에 실행해도 안전하도록 멱등적으로 작성합니다.
+"""
+from typing import Callable, List, Tuple
+
+import re
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, insert, select, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.schema import CreateIndex, CreateTable
+from sqlalchemy.sql import func
+
+from app.models import ArchivedPost, Post, User, Research, News
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations",
+    _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String(200), nullable=False),
+    Column("applied_at", DateTime(timezone=True), server_default=func.now()),
+)
+
+
+def _create_indexes(*models):
+    def step(conn: Connection):
+        for model in models:
+            for index in model.__table__.indexes:
+                # 식 인덱스는 리플렉션에 잡히지 않으므로 checkfirst 대신 IF NOT EXISTS
+                conn.execute(CreateIndex(index, if_not_exists=True))
+    return step
+
+
+def _posts_autoincrement(conn: Connection):
+    """posts를 AUTOINCREMENT 테이블로 다시 만들고 번호를 보관 게시물 id 뒤로 맞춤
+
+    AUTOINCREMENT가 없으면 새 id가 남은 행의 최댓값 다음이라, 가장 최근 게시물이
+    삭제·보관된 뒤 새 게시물이 보관 게시물과 같은 id를 받을 수 있습니다. SQLite는
+    기존 테이블에 AUTOINCREMENT를 더할 수 없어 같은 트랜잭션에서 새 테이블로 복사합니다
+    (외래 키 검사는 켜져 있지 않으므로 다른 테이블의 참조는 그대로 유지됨).
+    """
+    ddl = conn.execute(text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'posts'")).scalar()
+    if "AUTOINCREMENT" not in ddl.upper():
+        create = str(CreateTable(Post.__table__).compile(dialect=conn.dialect))
+        conn.execute(text(re.sub(r"^\s*CREATE TABLE posts\b", "CREATE TABLE posts_new", create)))
+        columns = ", ".join(column.name for column in Post.__table__.columns)
+        conn.execute(text(f"INSERT INTO posts_new ({columns}) SELECT {columns} FROM posts"))
+        conn.execute(text("DROP TABLE posts"))
+        conn.execute(text("ALTER TABLE posts_new RENAME TO posts"))
+        _create_indexes(Post)(conn)
+    high = max(
+        conn.execute(select(func.max(Post.id))).scalar() or 0,
+        conn.execute(select(func.max(ArchivedPost.id))).scalar() or 0,
+    )
+    seq = conn.execute(text("SELECT seq FROM sqlite_sequence WHERE name = 'posts'")).scalar()
+    if seq is None:
+        conn.execute(text("INSERT INTO sqlite_sequence (name, seq) VALUES ('posts', :seq)"), {"seq": high})
+    elif seq < high:
+        conn.execute(text("UPDATE sqlite_sequence SET seq = :seq WHERE name = 'posts'"), {"seq": high})
+
+
+MIGRATIONS: List[Tuple[int, str, Callable[[Connection], None]]] = [
+    (1, "목록 정렬/필터용 복합 인덱스", _create_indexes(Post, User, Research, News)),
+    (2, "관리자 표 카테고리별 게시물 수 인덱스", _create_indexes(Post)),
+    (3, "자동 완성 증분 갱신용 게시물 수정 시각 인덱스", _create_indexes(Post)),
+    (4, "게시물 id 재사용 방지 (AUTOINCREMENT)", _posts_autoincrement),
+]
+
+
+def run_migrations(conn: Connection):
+    _metadata.create_all(conn)
+    applied = set(conn.execute(select(schema_migrations.c.version)).scalars())
+    for version, name, step in MIGRATIONS:
+        if version in applied:
+            continue
+        step(conn)
+        conn.execute(
+            insert(schema_migrations).values(version=version, name=name).prefix_with("OR IGNORE", dialect="sqlite")
+        )
+        print(f"✅ 마이그레이션 {version} 적용: {name}")
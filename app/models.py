@@ -1,7 +1,9 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey
-from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
+from datetime import datetime
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Index, LargeBinary, Float
+from sqlalchemy.orm import relationship, backref, deferred
+from sqlalchemy.sql import func, literal_column
 from app.db_base import Base
+from app.compression import CompressedText
 
 class User(Base):
     __tablename__ = "users"
@@ -16,12 +18,17 @@ class User(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_users_created_at", "created_at"),
+    )
+
 class Post(Base):
     __tablename__ = "posts"
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
-    content = Column(Text, nullable=False)
+    # 본문은 보여줄 때만 읽음 (undefer), 큰 본문은 압축 저장 (app/compression.py)
+    content = deferred(Column(CompressedText, nullable=False), raiseload=True)
     author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     category_id = Column(Integer, ForeignKey("categories.id"))
     is_published = Column(Boolean, default=True)
@@ -32,6 +39,54 @@ class Post(Base):
     author = relationship("User", backref="posts")
     category = relationship("Category", backref="posts")
 
+    is_archived = False
+
+    __table_args__ = (
+        # 목록: is_published(+category_id) 필터 후 created_at 역순 정렬
+        Index("ix_posts_published_created", "is_published", "created_at"),
+        Index("ix_posts_published_category_created", "is_published", "category_id", "created_at"),
+        # 관리자/대시보드 최근 게시물
+        Index("ix_posts_created_at", "created_at"),
+        # 자동 완성: 마지막으로 본 뒤 수정된 게시물
+        Index("ix_posts_updated_at", "updated_at"),
+        # 관리자: 카테고리별 게시물 수(GROUP BY category_id)와 카테고리 필터
+        Index("ix_posts_category_created", "category_id", "created_at"),
+        # 월별 통계: 같은 식으로 GROUP BY/ORDER BY 하면 정렬 없이 인덱스 순서로 집계
+        Index("ix_posts_created_month", func.strftime(literal_column("'%Y-%m'"), created_at)),
+        # 삭제·보관된 게시물의 id를 새 게시물이 다시 쓰지 않도록 (보관 게시물과 id 공유)
+        {"sqlite_autoincrement": True},
+    )
+
+class ArchivedPost(Base):
+    """보관된 오래된 게시물 - posts와 같은 컬럼, 원래 id 그대로 (app/archive.py 참고)"""
+    __tablename__ = "archived_posts"
+
+    id = Column(Integer, primary_key=True)
+    title = Column(String(200), nullable=False)
+    content = deferred(Column(CompressedText, nullable=False), raiseload=True)
+    author_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    category_id = Column(Integer, ForeignKey("categories.id"))
+    is_published = Column(Boolean, default=True)
+    views = Column(Integer, default=0)
+    created_at = Column(DateTime(timezone=True))
+    updated_at = Column(DateTime(timezone=True))
+    archived_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    author = relationship("User")
+    category = relationship("Category")
+    # 첨부 행은 posts.id를 가리키는 그대로 두고 같은 id로 찾음
+    attachments = relationship(
+        "Attachment", primaryjoin="foreign(Attachment.post_id) == ArchivedPost.id",
+        order_by="Attachment.id", viewonly=True,
+    )
+
+    is_archived = True
+
+    __table_args__ = (
+        # 검색: is_published 필터 후 created_at 역순
+        Index("ix_archived_posts_published_created", "is_published", "created_at"),
+    )
+
 class Category(Base):
     __tablename__ = "categories"
 
@@ -53,16 +108,165 @@ class Research(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
+    __table_args__ = (
+        Index("ix_research_created_at", "created_at"),
+    )
+
 class News(Base):
     __tablename__ = "news"
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(200), nullable=False)
-    content = Column(Text, nullable=False)
+    content = deferred(Column(CompressedText, nullable=False), raiseload=True)
     author_id = Column(Integer, ForeignKey("users.id"))
     is_featured = Column(Boolean, default=False)
     published_at = Column(DateTime(timezone=True))
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    author = relationship("User", backref="news")
\ No newline at end of file
+    author = relationship("User", backref="news")
+
+    __table_args__ = (
+        # 주요 뉴스: is_featured 필터 후 published_at 역순 정렬
+        Index("ix_news_featured_published", "is_featured", "published_at"),
+    )
+
+class Attachment(Base):
+    __tablename__ = "attachments"
+
+    id = Column(Integer, primary_key=True, index=True)
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True)
+    filename = Column(String(255), nullable=False)
+    content_type = Column(String(100), nullable=False, default="application/octet-stream")
+    size = Column(Integer, nullable=False)
+    sha256 = Column(String(64), nullable=False, index=True)  # 저장소 내 파일 위치 = 해시
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    post = relationship("Post", backref=backref("attachments", order_by="Attachment.id", passive_deletes=True))
+
+class Dataset(Base):
+    __tablename__ = "datasets"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String(200), nullable=False)
+    title = Column(String(200), nullable=False)
+    description = Column(Text)
+    path = Column(String(500), unique=True, nullable=False)
+    size_bytes = Column(Integer, default=0)
+    row_count = Column(Integer)  # 인덱스 생성 전에는 NULL
+    columns = Column(Text)  # 헤더 컬럼명 JSON 배열
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+
+class TableGeneration(Base):
+    """테이블별 쓰기 세대 번호 - 캐시 무효화 키로 사용"""
+    __tablename__ = "table_generations"
+
+    name = Column(String(50), primary_key=True)
+    generation = Column(Integer, nullable=False, default=0)
+
+class FeedCache(Base):
+    """미리 만들어 둔 RSS/Atom 피드 본문"""
+    __tablename__ = "feed_cache"
+
+    key = Column(String(100), primary_key=True)  # 예: rss:posts, atom:category-3, rss:news
+    generation = Column(Integer, nullable=False, default=0)  # 생성 당시 원본 테이블 세대
+    content_type = Column(String(100), nullable=False)
+    body = Column(LargeBinary, nullable=False)
+    etag = Column(String(80), nullable=False)
+    last_modified = Column(DateTime, nullable=False)  # 본문이 마지막으로 바뀐 시각 (UTC)
+
+class PostScore(Base):
+    """조회 이벤트로 쌓은 시간 감쇠 점수 (로그 영역, app/ranking.py 참고)"""
+    __tablename__ = "post_scores"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    category_id = Column(Integer)
+    trending = Column(Float, nullable=False)
+    popular = Column(Float, nullable=False)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        Index("ix_post_scores_trending", "trending"),
+        Index("ix_post_scores_popular", "popular"),
+        Index("ix_post_scores_category_trending", "category_id", "trending"),
+        Index("ix_post_scores_category_popular", "category_id", "popular"),
+    )
+
+class PostTerms(Base):
+    """관련 게시물 계산용 토큰 빈도 (JSON {토큰: 횟수})"""
+    __tablename__ = "post_terms"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    terms = Column(Text, nullable=False)
+
+class PostTermsChange(Base):
+    """post_terms 세대마다 바뀐 게시물 id (JSON 목록, NULL이면 전체 다시 계산) - 워커별 색인 따라잡기용"""
+    __tablename__ = "post_terms_changes"
+
+    generation = Column(Integer, primary_key=True)
+    post_ids = Column(Text)
+
+class RelatedPost(Base):
+    """게시물별 TF-IDF 코사인 유사도 상위 이웃"""
+    __tablename__ = "related_posts"
+
+    post_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True)
+    rank = Column(Integer, primary_key=True)
+    related_id = Column(Integer, ForeignKey("posts.id", ondelete="CASCADE"), nullable=False, index=True)
+    score = Column(Float, nullable=False)
+
+    related = relationship("Post", foreign_keys=[related_id])
+
+class PostRevision(Base):
+    """게시물 수정 이력 - 주기적인 전체 사본과 그 사이 직전 판 대비 차분 (app/revisions.py 참고)"""
+    __tablename__ = "post_revisions"
+
+    # 보관된 게시물도 같은 id를 쓰므로 외래 키 없이 둠
+    post_id = Column(Integer, primary_key=True)
+    number = Column(Integer, primary_key=True)  # 1부터 (1 = 첫 수정 전 원본)
+    title = Column(String(200), nullable=False)
+    is_snapshot = Column(Boolean, nullable=False, default=False)
+    data = Column(CompressedText, nullable=False)  # 전체 본문 또는 JSON 차분
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class KeywordCount(Base):
+    """월별 키워드 빈도 (게시물 + 뉴스)"""
+    __tablename__ = "keyword_counts"
+
+    month = Column(String(7), primary_key=True)  # YYYY-MM
+    term = Column(String(100), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        Index("ix_keyword_counts_term_month", "term", "month"),
+    )
+
+class KeywordDoc(Base):
+    """문서별 키워드 기여분 - 수정·삭제 시 월별 빈도에서 정확히 빼기 위해 보관"""
+    __tablename__ = "keyword_docs"
+
+    source = Column(String(10), primary_key=True)  # post | news
+    doc_id = Column(Integer, primary_key=True)
+    month = Column(String(7), nullable=False)
+    stamp = Column(String(40), nullable=False)  # 마지막 반영 시점의 수정 시각/공개 여부
+    terms = Column(Text, nullable=False)  # JSON {키워드: 횟수}
+
+class TaskOutbox(Base):
+    """트랜잭션 안에서 기록되고 커밋 후 실행되는 후처리 작업"""
+    __tablename__ = "task_outbox"
+
+    id = Column(Integer, primary_key=True, index=True)
+    task = Column(String(200), nullable=False)
+    payload = Column(Text, nullable=False, default="{}")
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, failed
+    attempts = Column(Integer, nullable=False, default=0)
+    available_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    locked_at = Column(DateTime)
+    last_error = Column(Text)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_task_outbox_status_available", "status", "available_at"),
+    )
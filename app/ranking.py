@@ -0,0 +1,259 @@
+"""인기/급상승 게시물 순위 (시간 감쇠 조회 점수)
+
+조회 한 번은 시각 t에 `exp(-λ(now - t))`만큼의 점수를 남기고, 점수는 반감기마다
+절반으로 줄어듭니다. 모든 게시물에 같은 감쇠가 곱해지므로 고정 기준 시각으로부터
+`λ(t - EPOCH)`를 로그 영역에서 더해(logaddexp) 저장하면 순위를 다시 계산할 필요가
+없고 값이 넘치지도 않습니다.
+
+워커는 조회를 메모리에 모아 두고 주기적으로 `post_scores`에 합친 뒤, 카테고리별
+상위 K개를 다시 읽어 메모리의 TopK를 갱신합니다. 순위 조회는 DB를 거치지 않고
+TopK에서 바로 상위 N개를 꺼냅니다.
+"""
+import asyncio
+import heapq
+import math
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import event, func, select, update, delete
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import engine, SessionLocal
+from app.models import Category, Post, PostScore
+from app.tasks import subscribe
+
+EPOCH = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp()
+TRENDING = "trending"
+POPULAR = "popular"
+
+
+def _rate(half_life_hours: float) -> float:
+    return math.log(2) / (half_life_hours * 3600)
+
+
+RATES = {
+    TRENDING: _rate(settings.ranking_trending_half_life_hours),
+    POPULAR: _rate(settings.ranking_popular_half_life_hours),
+}
+
+
+def logaddexp(a: Optional[float], b: Optional[float]) -> Optional[float]:
+    if a is None:
+        return b
+    if b is None:
+        return a
+    high, low = (a, b) if a >= b else (b, a)
+    return high + math.log1p(math.exp(low - high))
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _register_functions(dbapi_connection, connection_record):
+    # 여러 워커가 같은 행에 동시에 더해도 한 문장 안에서 합쳐지도록 SQL 함수로 등록
+    dbapi_connection.create_function("logaddexp", 2, logaddexp, deterministic=True)
+
+
+class TopK:
+    """로그 점수 상위 K개 게시물"""
+
+    def __init__(self, k: int):
+        self.k = k
+        self.items: Dict[int, float] = {}
+
+    def offer(self, post_id: int, score: float):
+        if post_id in self.items or len(self.items) < self.k:
+            self.items[post_id] = score
+            return
+        lowest = min(self.items, key=self.items.get)
+        if score > self.items[lowest]:
+            del self.items[lowest]
+            self.items[post_id] = score
+
+    def add(self, post_id: int, delta: float):
+        self.offer(post_id, logaddexp(self.items.get(post_id), delta))
+
+    def discard(self, post_id: int):
+        self.items.pop(post_id, None)
+
+    def top(self, n: int) -> List[Tuple[int, float]]:
+        return heapq.nlargest(n, self.items.items(), key=lambda item: item[1])
+
+
+class RankingService:
+    def __init__(self, k: int = settings.ranking_top_k, flush_interval: float = settings.ranking_flush_seconds):
+        self.k = k
+        self.flush_interval = flush_interval
+        # post_id -> (category_id, {kind: 로그 점수 증분})
+        self._pending: Dict[int, Tuple[Optional[int], Dict[str, float]]] = {}
+        # (kind, category_id 또는 None=전체) -> TopK
+        self._boards: Dict[Tuple[str, Optional[int]], TopK] = {}
+        self._runner: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def _board(self, kind: str, category_id: Optional[int]) -> TopK:
+        key = (kind, category_id)
+        if key not in self._boards:
+            self._boards[key] = TopK(self.k)
+        return self._boards[key]
+
+    def record_view(self, post_id: int, category_id: Optional[int], at: Optional[float] = None):
+        at = time.time() if at is None else at
+        _, deltas = self._pending.setdefault(post_id, (category_id, {}))
+        for kind, rate in RATES.items():
+            delta = rate * (at - EPOCH)
+            deltas[kind] = logaddexp(deltas.get(kind), delta)
+            # 다음 반영 전까지도 이 워커의 조회가 순위에 바로 보이도록
+            self._board(kind, None).add(post_id, delta)
+            if category_id is not None:
+                self._board(kind, category_id).add(post_id, delta)
+
+    def top(self, kind: str, category_id: Optional[int] = None, n: int = 5, now: Optional[float] = None) -> List[Tuple[int, float]]:
+        """상위 n개 (post_id, 현재 시각 기준 감쇠된 점수)"""
+        now = time.time() if now is None else now
+        offset = RATES[kind] * (now - EPOCH)
+        board = self._boards.get((kind, category_id))
+        if board is None:
+            return []
+        return [(post_id, math.exp(score - offset)) for post_id, score in board.top(n)]
+
+    def forget(self, post_id: int):
+        self._pending.pop(post_id, None)
+        for board in self._boards.values():
+            board.discard(post_id)
+
+    async def flush(self):
+        """모아 둔 조회를 DB 점수에 합치고 TopK를 DB 기준으로 다시 읽음"""
+        pending, self._pending = self._pending, {}
+        async with SessionLocal() as session:
+            if pending:
+                try:
+                    await self._merge(session, pending)
+                except Exception:
+                    # 반영하지 못한 조회는 다음 주기에 다시 시도
+                    for post_id, (category_id, deltas) in pending.items():
+                        _, current = self._pending.setdefault(post_id, (category_id, {}))
+                        for kind, delta in deltas.items():
+                            current[kind] = logaddexp(current.get(kind), delta)
+                    raise
+            await self._reload(session)
+
+    async def _merge(self, session: AsyncSession, pending):
+        table = PostScore.__table__
+        # 그사이 삭제·보관된 게시물의 조회는 버림 (점수 행이 다시 생기지 않도록)
+        existing = set((await session.scalars(select(Post.id).where(Post.id.in_(list(pending))))).all())
+        for post_id, (category_id, deltas) in pending.items():
+            if post_id not in existing:
+                continue
+            stmt = insert(table).values(
+                post_id=post_id, category_id=category_id,
+                trending=deltas[TRENDING], popular=deltas[POPULAR],
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.post_id],
+                set_={
+                    "trending": func.logaddexp(table.c.trending, stmt.excluded.trending),
+                    "popular": func.logaddexp(table.c.popular, stmt.excluded.popular),
+                },
+            )
+            await session.execute(stmt)
+        await session.commit()
+
+    async def _reload(self, session: AsyncSession):
+        category_ids = [None] + list((await session.scalars(select(Category.id))).all())
+        boards = {}
+        for kind in RATES:
+            column = getattr(PostScore, kind)
+            for category_id in category_ids:
+                query = select(PostScore.post_id, column).order_by(column.desc()).limit(self.k)
+                if category_id is not None:
+                    query = query.where(PostScore.category_id == category_id)
+                board = TopK(self.k)
+                for post_id, score in (await session.execute(query)).all():
+                    board.offer(post_id, score)
+                boards[(kind, category_id)] = board
+        # 반영 중에 새로 들어온 조회도 잃지 않도록 다시 더함
+        for post_id, (category_id, deltas) in self._pending.items():
+            for kind, delta in deltas.items():
+                boards[(kind, None)].add(post_id, delta)
+                if (kind, category_id) in boards:
+                    boards[(kind, category_id)].add(post_id, delta)
+        self._boards = boards
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        try:
+            async with SessionLocal() as session:
+                await self._reload(session)
+        except Exception as e:
+            print(f"❌ 게시물 순위 불러오기 실패: {e}")
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """주기 반영을 멈추고 남은 조회를 마지막으로 반영"""
+        if self._runner is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._runner
+        self._runner = None
+        try:
+            await self.flush()
+        except Exception as e:
+            print(f"❌ 게시물 순위 저장 실패: {e}")
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                return
+            try:
+                await self.flush()
+            except Exception as e:
+                print(f"❌ 게시물 순위 반영 실패: {e}")
+
+
+ranking = RankingService()
+
+
+async def top_posts(session: AsyncSession, kind: str, category_id: Optional[int] = None, limit: int = 5) -> List[Post]:
+    """순위대로 공개 게시물 목록 (삭제·비공개 게시물은 건너뜀)"""
+    ranked = ranking.top(kind, category_id, limit * 2)
+    if not ranked:
+        return []
+    ids = [post_id for post_id, _ in ranked]
+    posts = (await session.scalars(
+        select(Post).where(Post.id.in_(ids), Post.is_published == True)
+    )).all()
+    by_id = {post.id: post for post in posts}
+    return [by_id[post_id] for post_id in ids if post_id in by_id][:limit]
+
+
+@subscribe("post.changed")
+async def sync_post_scores(payload: dict):
+    """삭제된 게시물의 점수를 지우고, 카테고리가 바뀌면 점수 행도 옮김"""
+    post_id = payload["post_id"]
+    async with SessionLocal() as session:
+        if payload.get("action") == "deleted":
+            ranking.forget(post_id)
+            await session.execute(delete(PostScore).where(PostScore.post_id == post_id))
+        elif "old_category_id" in payload and payload["old_category_id"] != payload.get("category_id"):
+            await session.execute(
+                update(PostScore).where(PostScore.post_id == post_id).values(category_id=payload.get("category_id"))
+            )
+        await session.commit()
+
+
+@subscribe("posts.archived")
+async def forget_archived_scores(payload: dict):
+    """보관된 게시물을 이 워커의 순위에서 바로 뺌 (점수 행은 보관 트랜잭션에서 지움, 다른 워커는 다음 반영 때)"""
+    for post_id in payload["post_ids"]:
+        ranking.forget(post_id)
@@ -0,0 +1,569 @@
+"""관련 게시물 추천 (TF-IDF 코사인 유사도)
+
+제목과 본문을 한국어에 맞게 토큰화합니다. 조사가 붙은 어절도 겹치도록 한글 어절은
+음절 2-gram으로, 그 밖의 단어는 단어 그대로 씁니다. 토큰 빈도는 `post_terms`에
+저장해 두고, 계산할 때 문서-토큰 희소 행렬과 토큰별 역색인(CSC)을 NumPy 배열로
+만듭니다. 여러 게시물의 유사도는 역색인을 한 번에 모아 `np.bincount`로 배치
+행렬을 만들고 `argpartition`으로 상위 k개를 고릅니다.
+
+게시물이 작성·수정되면 그 게시물과, 이웃 목록이 바뀔 수 있는 게시물만 다시
+계산합니다. 워커가 들고 있는 색인도 다시 만들지 않고 그 문서만 바꿉니다. 토큰 문서
+빈도를 조정하고, 기존 행은 지운 것으로 표시한 뒤 새 가중치를 작은 추가 문서 목록에
+둡니다. 다른 문서의 가중치는 만들 때의 IDF 그대로이고, 바뀐 문서가 전체의
+`COMPACT_RATIO`(최소 `COMPACT_MIN_UPDATES`개)를 넘으면 색인을 새로 만듭니다.
+작업은 어느 워커에서든 실행되므로 세대마다 바뀐 게시물 id를 `post_terms_changes`에
+남기고, 각 워커는 캐시한 세대 이후 바뀐 게시물의 토큰만 읽어 따라잡습니다.
+상세 페이지는 `related_posts`에서 미리 계산된 목록만 읽습니다.
+
+사용법:
+    python -m app.related rebuild
+"""
+import asyncio
+import json
+import re
+import sys
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import anyio
+import numpy as np
+from sqlalchemy import select, delete, func, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, undefer
+
+from app import generations
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Post, PostTerms, PostTermsChange, RelatedPost
+from app.tasks import subscribe
+
+TITLE_WEIGHT = 2
+# 문서 수가 이보다 적으면 문서 빈도 상한을 적용하지 않음
+MIN_DOCS_FOR_MAX_DF = 20
+# 제자리 갱신된 문서가 이만큼 쌓이면 색인을 새로 만듦 (IDF 차이와 추가 문서 목록 정리)
+COMPACT_RATIO = 0.05
+COMPACT_MIN_UPDATES = 64
+# 변경 기록을 남겨 두는 세대 수 (이보다 뒤처진 워커는 전체를 다시 읽음)
+CHANGE_LOG_KEEP = 1000
+_WORD = re.compile(r"\w+")
+_HANGUL = re.compile(r"[가-힣]")
+
+
+def tokenize(text: str) -> Counter:
+    counts: Counter = Counter()
+    text = unicodedata.normalize("NFKC", text).lower()
+    for word in _WORD.findall(text):
+        if _HANGUL.search(word):
+            if len(word) == 1:
+                continue
+            counts.update(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) >= 2 and not word.isdigit():
+            counts[word] += 1
+    return counts
+
+
+def post_terms(title: str, content: str) -> Counter:
+    counts = tokenize(content)
+    for term, count in tokenize(title).items():
+        counts[term] += count * TITLE_WEIGHT
+    return counts
+
+
+class Corpus:
+    """게시물별 토큰 번호/빈도 배열 (워커마다 post_terms 세대 기준으로 캐시)"""
+
+    def __init__(self):
+        self.vocabulary: Dict[str, int] = {}
+        self.docs: Dict[int, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def set(self, post_id: int, terms: Dict[str, int]):
+        vocabulary = self.vocabulary
+        ids = np.fromiter((vocabulary.setdefault(t, len(vocabulary)) for t in terms), dtype=np.int64, count=len(terms))
+        counts = np.fromiter(terms.values(), dtype=np.float64, count=len(terms))
+        self.docs[post_id] = (ids, counts)
+
+    def discard(self, post_id: int):
+        self.docs.pop(post_id, None)
+
+
+# (post_terms 세대, Corpus, TfidfIndex)
+_cache: Optional[Tuple[int, "Corpus", "TfidfIndex"]] = None
+# 캐시된 Corpus를 스레드에서 읽는 동안 다른 갱신이 바꾸지 않도록
+_lock = asyncio.Lock()
+
+
+@dataclass
+class TfidfIndex:
+    """L2 정규화된 TF-IDF 문서 행렬의 CSR/CSC 표현"""
+    post_ids: np.ndarray           # (N,) 행 번호 -> 게시물 id
+    row_of: Dict[int, int]         # 게시물 id -> 행 번호
+    indptr: np.ndarray             # CSR
+    indices: np.ndarray
+    data: np.ndarray
+    colptr: np.ndarray             # CSC (토큰별 역색인)
+    col_rows: np.ndarray
+    col_data: np.ndarray
+    raw_df: np.ndarray             # 토큰별 문서 빈도 (가중치 계산 전, 제자리 갱신 때 조정)
+    n_live: int                    # 현재 문서 수
+    # 제자리 갱신: 바뀌거나 지워진 기존 행, 바뀌거나 새로 생긴 문서의 (토큰 번호 순 번호, 가중치)
+    dead: np.ndarray = None
+    extra: Dict[int, Tuple[np.ndarray, np.ndarray]] = field(default_factory=dict)
+    updates: int = 0
+    _extra_arrays: Optional[tuple] = None
+
+    @classmethod
+    def build(cls, corpus: "Corpus") -> "TfidfIndex":
+        post_ids = np.array(sorted(corpus.docs), dtype=np.int64)
+        docs = [corpus.docs[post_id] for post_id in post_ids.tolist()]
+        lengths = np.array([len(ids) for ids, _ in docs], dtype=np.int64)
+        indptr = np.concatenate(([0], np.cumsum(lengths)))
+        indices = np.concatenate([ids for ids, _ in docs]) if docs else np.zeros(0, dtype=np.int64)
+        counts = np.concatenate([c for _, c in docs]) if docs else np.zeros(0)
+        vocabulary = corpus.vocabulary
+
+        n_docs = len(post_ids)
+        indptr_arr = indptr.astype(np.int64)
+        indices_arr = indices.astype(np.int64)
+        tf = 1.0 + np.log(counts.astype(np.float64))
+        df = np.bincount(indices_arr, minlength=len(vocabulary))
+        raw_df = df
+        idf = np.log((1.0 + n_docs) / (1.0 + df)) + 1.0
+        data = tf * idf[indices_arr]
+        row_ids = np.repeat(np.arange(n_docs), np.diff(indptr_arr))
+
+        # 대부분의 문서에 나오는 토큰("니다", "에서" 등)은 구분력이 없고 역색인만 길게
+        # 만들므로 빼고, 문서마다 가중치가 큰 토큰 max_terms개만 남김
+        keep = np.ones(len(data), dtype=bool)
+        if n_docs >= MIN_DOCS_FOR_MAX_DF:
+            keep &= df[indices_arr] <= settings.related_max_df * n_docs
+        order = np.lexsort((-data, ~keep, row_ids))
+        rank = np.empty(len(data), dtype=np.int64)
+        rank[order] = np.arange(len(data)) - np.repeat(indptr_arr[:-1], np.diff(indptr_arr))
+        keep &= rank < settings.related_max_terms
+        row_ids, indices_arr, data = row_ids[keep], indices_arr[keep], data[keep]
+        indptr_arr = np.concatenate(([0], np.cumsum(np.bincount(row_ids, minlength=n_docs)))).astype(np.int64)
+        df = np.bincount(indices_arr, minlength=len(vocabulary))
+
+        # 행별 L2 정규화
+        norms = np.sqrt(np.bincount(row_ids, weights=data * data, minlength=n_docs))
+        norms[norms == 0] = 1.0
+        data = data / norms[row_ids]
+
+        order = np.argsort(indices_arr, kind="stable")
+        colptr = np.concatenate(([0], np.cumsum(df))).astype(np.int64)
+        return cls(
+            post_ids=post_ids,
+            row_of={post_id: row for row, post_id in enumerate(post_ids.tolist())},
+            indptr=indptr_arr,
+            indices=indices_arr,
+            data=data,
+            colptr=colptr,
+            col_rows=row_ids[order],
+            col_data=data[order],
+            raw_df=raw_df,
+            n_live=n_docs,
+            dead=np.zeros(n_docs, dtype=bool),
+        )
+
+    def needs_compaction(self) -> bool:
+        return self.updates >= max(COMPACT_MIN_UPDATES, COMPACT_RATIO * len(self.post_ids))
+
+    def update(self, post_id: int, old: Optional[tuple], new: Optional[tuple]):
+        """문서 하나를 제자리에서 바꿈 (old/new: Corpus의 (토큰 번호, 빈도), 없으면 None)"""
+        if old is not None:
+            self.raw_df[old[0]] -= 1
+            self.n_live -= 1
+        row = self.row_of.get(post_id)
+        if row is not None:
+            self.dead[row] = True
+        self.extra.pop(post_id, None)
+        if new is not None:
+            ids, counts = new
+            if len(ids) and ids.max() >= len(self.raw_df):
+                grown = np.zeros(max(int(ids.max()) + 1, 2 * len(self.raw_df)), dtype=self.raw_df.dtype)
+                grown[:len(self.raw_df)] = self.raw_df
+                self.raw_df = grown
+            self.raw_df[ids] += 1
+            self.n_live += 1
+            self.extra[post_id] = self._weigh(ids, counts)
+        self.updates += 1
+        self._extra_arrays = None
+
+    def _weigh(self, ids: np.ndarray, counts: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """build와 같은 규칙으로 문서 하나의 정규화된 가중치 (토큰 번호 순)"""
+        df = self.raw_df[ids]
+        data = (1.0 + np.log(counts)) * (np.log((1.0 + self.n_live) / (1.0 + df)) + 1.0)
+        if self.n_live >= MIN_DOCS_FOR_MAX_DF:
+            keep = df <= settings.related_max_df * self.n_live
+            ids, data = ids[keep], data[keep]
+        if len(data) > settings.related_max_terms:
+            top = np.argsort(-data, kind="stable")[:settings.related_max_terms]
+            ids, data = ids[top], data[top]
+        norm = np.sqrt(np.dot(data, data))
+        if norm:
+            data = data / norm
+        order = np.argsort(ids)
+        return ids[order], data[order]
+
+    def contains(self, post_id: int) -> bool:
+        return self._vector(post_id) is not None
+
+    def _vector(self, post_id: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if post_id in self.extra:
+            return self.extra[post_id]
+        row = self.row_of.get(post_id)
+        if row is None or self.dead[row]:
+            return None
+        start, end = self.indptr[row], self.indptr[row + 1]
+        order = np.argsort(self.indices[start:end])
+        return self.indices[start:end][order], self.data[start:end][order]
+
+    def _extras(self) -> tuple:
+        """추가 문서 목록을 이어 붙인 (게시물 id, 행 번호, 토큰 번호, 가중치) 배열"""
+        if self._extra_arrays is None:
+            post_ids = np.array(list(self.extra), dtype=np.int64)
+            vectors = list(self.extra.values())
+            lengths = np.array([len(ids) for ids, _ in vectors], dtype=np.int64)
+            self._extra_arrays = (
+                post_ids,
+                np.repeat(np.arange(len(vectors)), lengths),
+                np.concatenate([ids for ids, _ in vectors]) if vectors else np.zeros(0, dtype=np.int64),
+                np.concatenate([data for _, data in vectors]) if vectors else np.zeros(0),
+            )
+        return self._extra_arrays
+
+    def scores(self, post_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """post_id와 다른 모든 현재 문서의 코사인 유사도 (게시물 id 배열, 유사도 배열)
+
+        비용은 질의 토큰의 역색인 길이와 추가 문서 목록 크기에만 비례
+        """
+        vector = self._vector(post_id)
+        if vector is None:
+            return np.zeros(0, dtype=np.int64), np.zeros(0)
+        q_col, q_val = vector
+        known = q_col < len(self.colptr) - 1
+        p_start = self.colptr[q_col[known]]
+        p_len = self.colptr[q_col[known] + 1] - p_start
+        p_pos = _ranges(p_start, p_len)
+        base = np.bincount(self.col_rows[p_pos], weights=np.repeat(q_val[known], p_len) * self.col_data[p_pos],
+                           minlength=len(self.post_ids))
+        base[self.dead] = 0.0
+        post_ids, sims = [self.post_ids[~self.dead]], [base[~self.dead]]
+        if self.extra:
+            e_posts, e_rows, e_cols, e_data = self._extras()
+            extra = np.zeros(len(e_posts))
+            if len(q_col):
+                pos = np.minimum(np.searchsorted(q_col, e_cols), len(q_col) - 1)
+                hit = q_col[pos] == e_cols
+                extra = np.bincount(e_rows[hit], weights=q_val[pos[hit]] * e_data[hit], minlength=len(e_posts))
+            post_ids.append(e_posts)
+            sims.append(extra)
+        post_ids, sims = np.concatenate(post_ids), np.concatenate(sims)
+        others = post_ids != post_id
+        return post_ids[others], sims[others]
+
+    def similarities(self, rows: np.ndarray) -> np.ndarray:
+        """rows 각각과 전체 문서의 코사인 유사도 (len(rows), N) 행렬"""
+        n_docs = len(self.post_ids)
+        starts, ends = self.indptr[rows], self.indptr[rows + 1]
+        q_len = ends - starts
+        q_pos = _ranges(starts, q_len)
+        q_row = np.repeat(np.arange(len(rows)), q_len)
+        q_col, q_val = self.indices[q_pos], self.data[q_pos]
+
+        # 질의 토큰마다 역색인 목록을 모아 (질의 행, 문서 행) 칸에 가중치를 더함
+        p_start = self.colptr[q_col]
+        p_len = self.colptr[q_col + 1] - p_start
+        p_pos = _ranges(p_start, p_len)
+        cells = np.repeat(q_row, p_len) * n_docs + self.col_rows[p_pos]
+        weights = np.repeat(q_val, p_len) * self.col_data[p_pos]
+        return np.bincount(cells, weights=weights, minlength=len(rows) * n_docs).reshape(len(rows), n_docs)
+
+    def top_k(self, post_ids: Iterable[int], k: int) -> Dict[int, List[tuple]]:
+        """게시물별 (이웃 id, 유사도) 상위 k개"""
+        if self.updates:
+            return {post_id: self._top(post_id, k) for post_id in post_ids if self.contains(post_id)}
+        rows = np.array([self.row_of[p] for p in post_ids if p in self.row_of], dtype=np.int64)
+        n_docs = len(self.post_ids)
+        result: Dict[int, List[tuple]] = {}
+        if n_docs < 2 or len(rows) == 0:
+            return {int(self.post_ids[r]): [] for r in rows}
+        batch = max(1, min(settings.related_batch_size, settings.related_max_batch_cells // n_docs))
+        kk = min(k, n_docs - 1)
+        for start in range(0, len(rows), batch):
+            block = rows[start:start + batch]
+            sims = self.similarities(block)
+            sims[np.arange(len(block)), block] = -1.0  # 자기 자신 제외
+            top = np.argpartition(-sims, kk - 1, axis=1)[:, :kk]
+            top_scores = np.take_along_axis(sims, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            top = np.take_along_axis(top, order, axis=1)
+            top_scores = np.take_along_axis(top_scores, order, axis=1)
+            for i, row in enumerate(block.tolist()):
+                result[int(self.post_ids[row])] = [
+                    (int(self.post_ids[col]), float(score))
+                    for col, score in zip(top[i].tolist(), top_scores[i].tolist())
+                    if score > 0
+                ]
+        return result
+
+
+    def _top(self, post_id: int, k: int) -> List[tuple]:
+        post_ids, sims = self.scores(post_id)
+        kk = min(k, len(sims))
+        if kk == 0:
+            return []
+        top = np.argpartition(-sims, kk - 1)[:kk]
+        top = top[np.argsort(-sims[top], kind="stable")]
+        return [(int(post_ids[i]), float(sims[i])) for i in top.tolist() if sims[i] > 0]
+
+
+def _ranges(starts: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """[starts[i], starts[i] + lengths[i]) 구간들을 이어 붙인 인덱스 배열"""
+    total = int(lengths.sum())
+    if total == 0:
+        return np.zeros(0, dtype=np.int64)
+    offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths)
+    return offsets + np.arange(total)
+
+
+async def _load_corpus(session: AsyncSession) -> Corpus:
+    corpus = Corpus()
+    result = await session.stream(
+        select(PostTerms.post_id, PostTerms.terms).execution_options(yield_per=1000)
+    )
+    async for post_id, terms in result:
+        corpus.set(post_id, json.loads(terms))
+    return corpus
+
+
+async def _record_change(session: AsyncSession, generation: int, post_ids: Optional[List[int]]):
+    """이 세대에 바뀐 게시물 기록 (None이면 전체 다시 계산) 후 오래된 기록 정리"""
+    if post_ids is None:
+        await session.execute(delete(PostTermsChange))
+    else:
+        await session.execute(delete(PostTermsChange).where(PostTermsChange.generation <= generation - CHANGE_LOG_KEEP))
+    session.add(PostTermsChange(generation=generation, post_ids=None if post_ids is None else json.dumps(post_ids)))
+
+
+async def _catch_up(session: AsyncSession, generation: int) -> "TfidfIndex":
+    """워커에 캐시된 색인을 generation까지 따라잡아 반환
+
+    캐시한 세대 이후 바뀐 게시물의 토큰만 읽어 제자리에서 바꾸고, 기록이 모자라거나
+    전체 재계산이 끼어 있으면 전체를 다시 읽습니다.
+    """
+    global _cache
+    corpus = index = None
+    if _cache is not None and _cache[0] <= generation:
+        cached, corpus, index = _cache
+        if cached == generation:
+            return index
+        changes = (await session.scalars(
+            select(PostTermsChange.post_ids)
+            .where(PostTermsChange.generation > cached, PostTermsChange.generation <= generation)
+        )).all()
+        if len(changes) == generation - cached and None not in changes:
+            changed = sorted({post_id for post_ids in changes for post_id in json.loads(post_ids)})
+            stored = {}
+            for start in range(0, len(changed), 500):
+                stored.update((await session.execute(
+                    select(PostTerms.post_id, PostTerms.terms)
+                    .where(PostTerms.post_id.in_(changed[start:start + 500]))
+                )).all())
+            for post_id in changed:
+                old = corpus.docs.get(post_id)
+                if post_id in stored:
+                    corpus.set(post_id, json.loads(stored[post_id]))
+                elif old is None:
+                    continue
+                else:
+                    corpus.discard(post_id)
+                index.update(post_id, old, corpus.docs.get(post_id))
+            if index.needs_compaction():
+                index = None
+        else:
+            corpus = index = None
+    if corpus is None:
+        corpus = await _load_corpus(session)
+    if index is None:
+        # 행렬 계산은 이벤트 루프를 막지 않도록 스레드에서 (NumPy 연산은 GIL을 놓음)
+        index = await anyio.to_thread.run_sync(TfidfIndex.build, corpus)
+    _cache = (generation, corpus, index)
+    return index
+
+
+async def _save_neighbours(session: AsyncSession, neighbours: Dict[int, List[tuple]]):
+    if not neighbours:
+        return
+    await session.execute(delete(RelatedPost).where(RelatedPost.post_id.in_(list(neighbours))))
+    values = [
+        {"post_id": post_id, "rank": rank, "related_id": related_id, "score": score}
+        for post_id, items in neighbours.items()
+        for rank, (related_id, score) in enumerate(items)
+    ]
+    if values:
+        await session.execute(insert(RelatedPost), values)
+
+
+async def _store_terms(session: AsyncSession, post: Optional[Post], post_id: int) -> Optional[Dict[str, int]]:
+    """공개 게시물이면 토큰 빈도를 저장해 반환하고, 아니면 지우고 None"""
+    await session.execute(delete(PostTerms).where(PostTerms.post_id == post_id))
+    if post is None or not post.is_published:
+        return None
+    terms = dict(post_terms(post.title, post.content))
+    session.add(PostTerms(post_id=post_id, terms=json.dumps(terms, ensure_ascii=False)))
+    return terms
+
+
+async def rebuild(session: AsyncSession) -> int:
+    """모든 게시물의 토큰과 이웃 목록을 처음부터 다시 계산"""
+    async with _lock:
+        return await _rebuild(session)
+
+
+async def _rebuild(session: AsyncSession) -> int:
+    global _cache
+    corpus = Corpus()
+    await session.execute(delete(PostTerms))
+    result = await session.stream_scalars(
+        select(Post).options(undefer(Post.content)).where(Post.is_published == True)
+        .execution_options(yield_per=500)
+    )
+    async for post in result:
+        terms = dict(post_terms(post.title, post.content))
+        corpus.set(post.id, terms)
+        session.add(PostTerms(post_id=post.id, terms=json.dumps(terms, ensure_ascii=False)))
+    await session.flush()
+    generation = await generations.bump(session, "post_terms")
+    await _record_change(session, generation, None)
+
+    index = await anyio.to_thread.run_sync(TfidfIndex.build, corpus)
+    neighbours = await anyio.to_thread.run_sync(index.top_k, index.post_ids.tolist(), settings.related_top_k)
+    await session.execute(delete(RelatedPost))
+    await _save_neighbours(session, neighbours)
+    await session.commit()
+    _cache = (generation, corpus, index)
+    return len(index.post_ids)
+
+
+async def update_post(session: AsyncSession, post_id: int):
+    """한 게시물이 바뀌었을 때 영향받는 이웃 목록만 다시 계산"""
+    async with _lock:
+        await _update_post(session, post_id)
+
+
+async def _update_post(session: AsyncSession, post_id: int):
+    if await session.scalar(select(func.count()).select_from(PostTerms)) == 0:
+        await _rebuild(session)
+        return
+
+    post = await session.get(Post, post_id, options=[undefer(Post.content)])
+    await _store_terms(session, post, post_id)
+    await session.flush()
+    generation = await generations.bump(session, "post_terms")
+    await _record_change(session, generation, [post_id])
+    await session.commit()
+
+    index = await _catch_up(session, generation)
+    k = settings.related_top_k
+
+    # 이 게시물을 이웃으로 가진 목록은 유사도가 달라졌으므로 다시 계산
+    affected = set((await session.scalars(
+        select(RelatedPost.post_id).where(RelatedPost.related_id == post_id)
+    )).all())
+    if index.contains(post_id):
+        affected.add(post_id)
+        # 새 유사도가 기존 목록의 k번째보다 크거나 목록이 덜 찬 게시물도 다시 계산
+        post_ids, sims = await anyio.to_thread.run_sync(index.scores, post_id)
+        positive = sims > 0
+        candidates = dict(zip(post_ids[positive].tolist(), sims[positive].tolist()))
+        ids = list(candidates)
+        floors = {}
+        for start in range(0, len(ids), 500):
+            floors.update((await session.execute(
+                select(RelatedPost.post_id, func.min(RelatedPost.score))
+                .where(RelatedPost.post_id.in_(ids[start:start + 500]))
+                .group_by(RelatedPost.post_id)
+                .having(func.count() >= k)
+            )).all())
+        affected.update(p for p, score in candidates.items() if score > floors.get(p, 0.0))
+    else:
+        await session.execute(delete(RelatedPost).where(RelatedPost.post_id == post_id))
+        affected.discard(post_id)
+
+    neighbours = await anyio.to_thread.run_sync(index.top_k, sorted(affected), k)
+    await _save_neighbours(session, neighbours)
+    await session.commit()
+
+
+async def forget_posts(session: AsyncSession, post_ids: List[int]) -> List[int]:
+    """보관으로 posts에서 빠지는 게시물의 토큰과 이웃 목록을 지우고 (호출한 트랜잭션 안에서)
+    그 게시물을 이웃으로 가졌던 남은 게시물 id를 반환 - 이 목록은 `posts.archived` 작업이 다시 계산
+    """
+    affected = (await session.scalars(
+        select(RelatedPost.post_id).distinct()
+        .where(RelatedPost.related_id.in_(post_ids), RelatedPost.post_id.not_in(post_ids))
+    )).all()
+    await session.execute(delete(RelatedPost).where(
+        RelatedPost.post_id.in_(post_ids) | RelatedPost.related_id.in_(post_ids)
+    ))
+    await session.execute(delete(PostTerms).where(PostTerms.post_id.in_(post_ids)))
+    generation = await generations.bump(session, "post_terms")
+    await _record_change(session, generation, list(post_ids))
+    return list(affected)
+
+
+async def refresh_neighbours(session: AsyncSession, post_ids: List[int]):
+    """post_ids의 이웃 목록을 현재 색인으로 다시 계산"""
+    async with _lock:
+        generation = (await generations.current(session, "post_terms"))["post_terms"]
+        index = await _catch_up(session, generation)
+        neighbours = await anyio.to_thread.run_sync(index.top_k, sorted(post_ids), settings.related_top_k)
+        await _save_neighbours(session, neighbours)
+        await session.commit()
+
+
+async def related_posts(session: AsyncSession, post_id: int) -> List[Post]:
+    result = await session.execute(
+        select(RelatedPost).options(joinedload(RelatedPost.related))
+        .where(RelatedPost.post_id == post_id)
+        .order_by(RelatedPost.rank)
+    )
+    return [row.related for row in result.scalars().all() if row.related is not None and row.related.is_published]
+
+
+@subscribe("post.changed")
+async def refresh_related_posts(payload: dict):
+    async with SessionLocal() as session:
+        await update_post(session, payload["post_id"])
+
+
+@subscribe("posts.archived")
+async def refill_related_posts(payload: dict):
+    """보관된 게시물이 빠진 이웃 목록을 다시 채움"""
+    if payload.get("affected"):
+        async with SessionLocal() as session:
+            await refresh_neighbours(session, payload["affected"])
+
+
+async def _main(argv: List[str]):
+    import argparse
+    import time
+    from app.database import create_tables
+
+    parser = argparse.ArgumentParser(prog="python -m app.related")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("rebuild", help="모든 게시물의 관련 게시물 목록을 다시 계산")
+    parser.parse_args(argv)
+
+    await create_tables()
+    started = time.perf_counter()
+    async with SessionLocal() as session:
+        count = await rebuild(session)
+    print(f"✅ 관련 게시물 계산 완료: {count:,}개 게시물 ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1:]))
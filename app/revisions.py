@@ -0,0 +1,155 @@
+"""게시물 수정 이력 (차분 저장)
+
+게시물을 수정할 때마다 판 번호를 하나씩 늘려 `post_revisions`에 기록합니다. 1판은
+첫 수정 직전의 원본이라, 한 번도 수정되지 않은 게시물은 이력 행이 없습니다.
+
+모든 판을 통째로 두는 대신 대부분의 판은 직전 판 대비 줄 단위 차분(JSON)만
+저장합니다. 차분은 `[시작, 끝]`(직전 판의 줄 범위를 그대로 복사)과 문자열(새로 쓴
+줄들)의 목록입니다. 복원하려면 가장 가까운 전체 사본부터 차분을 차례로 적용해야
+하므로, `REVISION_SNAPSHOT_INTERVAL`판마다 또는 차분이 본문 절반보다 크면 전체
+사본을 둡니다. 그래서 어떤 판이든 질의 한 번과 최대 (주기 - 1)개의 차분 적용으로
+복원됩니다. 데이터 컬럼은 `CompressedText`라 큰 사본은 압축되어 저장됩니다.
+"""
+import difflib
+import json
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy import and_, delete, func, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import Post, PostRevision
+
+# 차분이 본문의 이 비율보다 크면 전체 사본으로 저장
+SNAPSHOT_RATIO = 0.5
+
+
+@dataclass
+class Revision:
+    number: int
+    title: str
+    content: str
+    is_snapshot: bool
+    created_at: Optional[datetime]
+
+
+def make_delta(old: str, new: str) -> list:
+    """old를 new로 바꾸는 줄 단위 차분"""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+    delta = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif j2 > j1:
+            delta.append("".join(new_lines[j1:j2]))
+    return delta
+
+
+def apply_delta(lines: List[str], delta: list) -> List[str]:
+    """직전 판의 줄 목록에 차분을 적용한 줄 목록"""
+    result = []
+    for op in delta:
+        if isinstance(op, list):
+            result.extend(lines[op[0]:op[1]])
+        else:
+            result.extend(op.splitlines(keepends=True))
+    return result
+
+
+async def record_edit(session: AsyncSession, post: Post, title: str, content: str,
+                      interval: int = settings.revision_snapshot_interval) -> Optional[int]:
+    """post(본문을 읽어 둔 수정 전 상태)를 title/content로 바꾸는 새 판을 기록하고 판 번호를 반환
+
+    바뀐 것이 없으면 아무것도 기록하지 않고 None.
+    """
+    if title == post.title and content == post.content:
+        return None
+    latest, snapshot = (await session.execute(
+        select(func.max(PostRevision.number),
+               func.max(PostRevision.number).filter(PostRevision.is_snapshot == True))
+        .where(PostRevision.post_id == post.id)
+    )).one()
+    if latest is None:
+        # 첫 수정: 수정 전 원본을 1판으로
+        latest = snapshot = 1
+        session.add(PostRevision(post_id=post.id, number=1, title=post.title, is_snapshot=True,
+                                 data=post.content, created_at=post.updated_at or post.created_at))
+
+    number = latest + 1
+    delta = json.dumps(make_delta(post.content, content), ensure_ascii=False, separators=(",", ":"))
+    full = number - snapshot >= interval or len(delta) > len(content) * SNAPSHOT_RATIO
+    session.add(PostRevision(post_id=post.id, number=number, title=title, is_snapshot=full,
+                             data=content if full else delta))
+    return number
+
+
+async def reconstruct(session: AsyncSession, post_id: int, numbers: Iterable[int]) -> Dict[int, Revision]:
+    """여러 판을 질의 한 번으로 복원 (없는 판은 결과에서 빠짐)"""
+    numbers = sorted(set(numbers))
+    if not numbers:
+        return {}
+    # 판마다 그 판 이하의 가장 최근 전체 사본부터 그 판까지의 행
+    ranges = []
+    for number in numbers:
+        base = (
+            select(func.max(PostRevision.number))
+            .where(PostRevision.post_id == post_id, PostRevision.is_snapshot == True,
+                   PostRevision.number <= number)
+            .scalar_subquery()
+        )
+        ranges.append(and_(PostRevision.number >= base, PostRevision.number <= number))
+    rows = (await session.scalars(
+        select(PostRevision).where(PostRevision.post_id == post_id, or_(*ranges))
+        .order_by(PostRevision.number)
+    )).all()
+
+    wanted = set(numbers)
+    revisions = {}
+    lines: List[str] = []
+    for row in rows:
+        if row.is_snapshot:
+            lines = row.data.splitlines(keepends=True)
+        else:
+            lines = apply_delta(lines, json.loads(row.data))
+        if row.number in wanted:
+            revisions[row.number] = Revision(row.number, row.title, "".join(lines), row.is_snapshot, row.created_at)
+    return revisions
+
+
+async def get_revision(session: AsyncSession, post_id: int, number: int) -> Optional[Revision]:
+    return (await reconstruct(session, post_id, [number])).get(number)
+
+
+async def diff(session: AsyncSession, post_id: int, old: int, new: int) -> Optional[dict]:
+    """두 판의 제목과 본문 unified diff (둘 중 하나라도 없으면 None)"""
+    revisions = await reconstruct(session, post_id, [old, new])
+    if old not in revisions or new not in revisions:
+        return None
+    a, b = revisions[old], revisions[new]
+    lines = difflib.unified_diff(
+        a.content.splitlines(keepends=True), b.content.splitlines(keepends=True),
+        fromfile=f"{post_id}@{old}", tofile=f"{post_id}@{new}",
+    )
+    return {"from": old, "to": new, "title": [a.title, b.title], "diff": "".join(lines)}
+
+
+async def history(session: AsyncSession, post_id: int) -> List[dict]:
+    """판 목록 (본문 없이)"""
+    rows = (await session.execute(
+        select(PostRevision.number, PostRevision.title, PostRevision.is_snapshot, PostRevision.created_at)
+        .where(PostRevision.post_id == post_id).order_by(PostRevision.number)
+    )).all()
+    return [
+        {"number": number, "title": title, "is_snapshot": is_snapshot,
+         "created_at": created_at.isoformat() if created_at else None}
+        for number, title, is_snapshot, created_at in rows
+    ]
+
+
+async def delete_revisions(session: AsyncSession, post_id: int):
+    """게시물 삭제 시 이력도 지움"""
+    await session.execute(delete(PostRevision).where(PostRevision.post_id == post_id))
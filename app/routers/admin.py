@@ -1,21 +1,55 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Form, Request
 from fastapi.security import OAuth2PasswordRequestForm
 from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, desc, func, case, update, delete
+from sqlalchemy.orm import joinedload
 from datetime import timedelta
 from typing import Optional
 
+from app import generations
 from app.database import get_session
 from app.auth import authenticate_user, create_access_token, get_current_admin_user
 from app.schemas import Token, User
 from app.models import Post, Category, User as UserModel
 from app.config import settings
+from app.tasks import enqueue
+from app.storage import release_post_attachments
+from app.revisions import delete_revisions
+from app.templating import templates, page_or_fragment, wants_fragment
+from app.admin_tables import Table, TableState, fetch_page, ASC
+from app.cache import cache
+from app.writer import writer
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+# 관리자 표 - 정렬은 인덱스가 있는 컬럼만 허용
+POSTS_TABLE = Table(
+    Post,
+    sorts={"created_at": Post.created_at, "id": Post.id},
+    default_sort="created_at",
+    filters=("search", "category_id", "status"),
+)
+CATEGORIES_TABLE = Table(
+    Category,
+    sorts={"name": Category.name, "id": Category.id},
+    default_sort="name",
+    default_direction=ASC,
+    filters=("q",),
+)
+USERS_TABLE = Table(
+    UserModel,
+    sorts={"created_at": UserModel.created_at, "username": UserModel.username,
+           "email": UserModel.email, "id": UserModel.id},
+    default_sort="created_at",
+    filters=("q", "role", "status"),
+)
+USER_SUMMARY_TTL_SECONDS = 60
+
+
+def _prefix(column, text: str):
+    # LIKE 대신 범위 비교로 써야 인덱스 범위 검색이 됨
+    return (column >= text) & (column < text + "\U0010ffff")
 
 @router.post("/login", response_model=Token)
 async def login_for_access_token(
@@ -73,8 +107,8 @@ async def admin_dashboard(
     # 최근 게시물
     recent_posts_result = await session.execute(
         select(Post).options(
-            selectinload(Post.author),
-            selectinload(Post.category)
+            joinedload(Post.author),
+            joinedload(Post.category)
         ).order_by(desc(Post.created_at)).limit(5)
     )
     recent_posts = recent_posts_result.scalars().all()
@@ -91,54 +125,61 @@ async def admin_dashboard(
 @router.get("/posts", response_class=HTMLResponse)
 async def admin_posts(
     request: Request,
-    page: int = 1,
-    search: Optional[str] = None,
     session: AsyncSession = Depends(get_session)
 ):
     # 인증 체크
     if not request.session.get("admin_logged_in"):
         return RedirectResponse(url="/admin/login", status_code=303)
-    per_page = 20
-    offset = (page - 1) * per_page
+    state = TableState.parse(POSTS_TABLE, request.query_params)
+    filters = state.filters
 
     query = select(Post).options(
-        selectinload(Post.author),
-        selectinload(Post.category)
+        joinedload(Post.author),
+        joinedload(Post.category)
     )
+    if filters.get("search"):
+        query = query.where(Post.title.contains(filters["search"]) | Post.content.contains(filters["search"]))
+    if filters.get("category_id", "").isdigit():
+        query = query.where(Post.category_id == int(filters["category_id"]))
+    if filters.get("status") in ("published", "draft"):
+        query = query.where(Post.is_published == (filters["status"] == "published"))
 
-    if search:
-        query = query.where(Post.title.contains(search) | Post.content.contains(search))
-
-    query = query.order_by(desc(Post.created_at)).offset(offset).limit(per_page)
-
-    result = await session.execute(query)
-    posts = result.scalars().all()
+    page = await fetch_page(session, POSTS_TABLE, query, state)
 
-    return templates.TemplateResponse("admin/posts.html", {
+    context = {
         "request": request,
-        "posts": posts,
-        "current_page": page,
-        "search_query": search
-    })
+        "posts": page.rows,
+        "page": page,
+        "filters": filters,
+    }
+    if not wants_fragment(request, "post-table"):
+        # 필터 선택 목록은 전체 페이지에만 필요
+        context["categories"] = (await session.execute(
+            select(Category.id, Category.name).order_by(Category.name)
+        )).all()
+    return page_or_fragment(request, "admin/posts.html", "admin/_post_table.html", "post-table", context)
 
 # 게시물 삭제
 @router.post("/posts/{post_id}/delete")
 async def admin_delete_post(
     request: Request,
     post_id: int,
-    session: AsyncSession = Depends(get_session)
 ):
     # 인증 체크
     if not request.session.get("admin_logged_in"):
         return RedirectResponse(url="/admin/login", status_code=303)
-    post_result = await session.execute(select(Post).where(Post.id == post_id))
-    post = post_result.scalar_one_or_none()
 
-    if not post:
-        raise HTTPException(status_code=404, detail="게시물을 찾을 수 없습니다.")
+    async def remove(session: AsyncSession):
+        post = await session.get(Post, post_id)
+        if not post:
+            raise HTTPException(status_code=404, detail="게시물을 찾을 수 없습니다.")
 
-    await session.delete(post)
-    await session.commit()
+        await release_post_attachments(session, post_id)
+        await delete_revisions(session, post_id)
+        enqueue(session, "post.changed", post_id=post_id, category_id=post.category_id, action="deleted")
+        await session.delete(post)
+
+    await writer.submit(remove)
 
     return RedirectResponse(url="/admin/posts", status_code=303)
 
@@ -151,12 +192,26 @@ async def admin_categories(
     # 인증 체크
     if not request.session.get("admin_logged_in"):
         return RedirectResponse(url="/admin/login", status_code=303)
-    categories_result = await session.execute(select(Category).order_by(Category.name))
-    categories = categories_result.scalars().all()
+    state = TableState.parse(CATEGORIES_TABLE, request.query_params)
+    query = select(Category)
+    if state.filters.get("q"):
+        query = query.where(_prefix(Category.name, state.filters["q"]))
+    page = await fetch_page(session, CATEGORIES_TABLE, query, state)
+
+    # 현재 페이지 카테고리의 게시물 수를 한 번의 GROUP BY로
+    post_counts = {}
+    if page.rows:
+        post_counts = dict((await session.execute(
+            select(Post.category_id, func.count())
+            .where(Post.category_id.in_([category.id for category in page.rows]))
+            .group_by(Post.category_id)
+        )).all())
 
-    return templates.TemplateResponse("admin/categories.html", {
+    return page_or_fragment(request, "admin/categories.html", "admin/_category_table.html", "category-table", {
         "request": request,
-        "categories": categories
+        "categories": page.rows,
+        "page": page,
+        "post_counts": post_counts
     })
 
 # 카테고리 추가
@@ -165,14 +220,18 @@ async def admin_add_category(
     request: Request,
     name: str = Form(...),
     description: Optional[str] = Form(None),
-    session: AsyncSession = Depends(get_session)
 ):
     # 인증 체크
     if not request.session.get("admin_logged_in"):
         return RedirectResponse(url="/admin/login", status_code=303)
-    new_category = Category(name=name, description=description)
-    session.add(new_category)
-    await session.commit()
+
+    async def add(session: AsyncSession):
+        new_category = Category(name=name, description=description)
+        session.add(new_category)
+        await session.flush()
+        enqueue(session, "category.changed", category_id=new_category.id, action="created")
+
+    await writer.submit(add)
 
     return RedirectResponse(url="/admin/categories", status_code=303)
 
@@ -181,23 +240,38 @@ async def admin_add_category(
 async def admin_delete_category(
     request: Request,
     category_id: int,
-    session: AsyncSession = Depends(get_session)
 ):
     # 인증 체크
     if not request.session.get("admin_logged_in"):
         return RedirectResponse(url="/admin/login", status_code=303)
-    category_result = await session.execute(select(Category).where(Category.id == category_id))
-    category = category_result.scalar_one_or_none()
 
-    if not category:
-        raise HTTPException(status_code=404, detail="카테고리를 찾을 수 없습니다.")
+    async def remove(session: AsyncSession):
+        category = await session.get(Category, category_id)
+        if not category:
+            raise HTTPException(status_code=404, detail="카테고리를 찾을 수 없습니다.")
+
+        enqueue(session, "category.changed", category_id=category_id, action="deleted")
+        # 게시물을 하나씩 불러와 카테고리를 비우지 않고 한 번의 UPDATE로 처리
+        await session.execute(update(Post).where(Post.category_id == category_id).values(category_id=None))
+        await session.execute(delete(Category).where(Category.id == category_id))
+        # 일괄 UPDATE/DELETE는 매퍼 이벤트를 거치지 않으므로 직접 세대를 올림
+        await generations.bump(session, "posts")
+        await generations.bump(session, "categories")
 
-    await session.delete(category)
-    await session.commit()
+    await writer.submit(remove)
 
     return RedirectResponse(url="/admin/categories", status_code=303)
 
 # 사용자 관리
+async def _user_summary(session: AsyncSession) -> dict:
+    row = (await session.execute(select(
+        func.count(),
+        func.sum(case((UserModel.is_admin == True, 1), else_=0)),
+        func.sum(case((UserModel.is_active == True, 1), else_=0)),
+    ))).one()
+    return {"total": row[0], "admins": row[1] or 0, "active": row[2] or 0}
+
+
 @router.get("/users", response_class=HTMLResponse)
 async def admin_users(
     request: Request,
@@ -206,10 +280,26 @@ async def admin_users(
     # 인증 체크
     if not request.session.get("admin_logged_in"):
         return RedirectResponse(url="/admin/login", status_code=303)
-    users_result = await session.execute(select(UserModel).order_by(UserModel.created_at))
-    users = users_result.scalars().all()
+    state = TableState.parse(USERS_TABLE, request.query_params)
+    filters = state.filters
 
-    return templates.TemplateResponse("admin/users.html", {
+    query = select(UserModel)
+    if filters.get("q"):
+        query = query.where(_prefix(UserModel.username, filters["q"]))
+    if filters.get("role") in ("admin", "user"):
+        query = query.where(UserModel.is_admin == (filters["role"] == "admin"))
+    if filters.get("status") in ("active", "inactive"):
+        query = query.where(UserModel.is_active == (filters["status"] == "active"))
+    page = await fetch_page(session, USERS_TABLE, query, state)
+
+    context = {
         "request": request,
-        "users": users
-    })
\ No newline at end of file
+        "users": page.rows,
+        "page": page,
+    }
+    if not wants_fragment(request, "user-table"):
+        # 전체 집계는 표 이동마다 다시 하지 않도록 잠시 캐시
+        context["summary"] = await cache.get_or_set(
+            "admin_user_summary", lambda: _user_summary(session), ttl=USER_SUMMARY_TTL_SECONDS
+        )
+    return page_or_fragment(request, "admin/users.html", "admin/_user_table.html", "user-table", context)
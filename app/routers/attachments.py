@@ -0,0 +1,73 @@
+from fastapi import APIRouter, Request, Depends, HTTPException, UploadFile, File
+from fastapi.responses import RedirectResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select
+from typing import List
+
+from app.database import get_session
+from app.models import Post, Attachment
+from app.storage import store_uploads, add_attachments, attachment_response, release_uploads, RELEASE_DELAY_SECONDS
+from app.tasks import enqueue
+from app.writer import writer
+
+router = APIRouter()
+
+# 첨부파일 업로드
+@router.post("/{post_id}/attachments")
+async def attachment_upload(
+    post_id: int,
+    files: List[UploadFile] = File(...),
+    session: AsyncSession = Depends(get_session)
+):
+    post = await session.get(Post, post_id)
+    if not post:
+        raise HTTPException(status_code=404, detail="게시물을 찾을 수 없습니다.")
+
+    stored = await store_uploads(files)
+
+    async def attach(write_session: AsyncSession):
+        add_attachments(write_session, post_id, stored)
+
+    try:
+        await writer.submit(attach)
+    except BaseException:
+        await release_uploads(stored)
+        raise
+
+    return RedirectResponse(url=f"/board/{post_id}", status_code=303)
+
+# 첨부파일 다운로드 (Range / ETag 지원)
+@router.api_route("/{post_id}/attachments/{attachment_id}", methods=["GET", "HEAD"])
+async def attachment_download(
+    request: Request,
+    post_id: int,
+    attachment_id: int,
+    session: AsyncSession = Depends(get_session)
+):
+    attachment = await session.scalar(
+        select(Attachment).where(Attachment.id == attachment_id, Attachment.post_id == post_id)
+    )
+    if not attachment:
+        raise HTTPException(status_code=404, detail="첨부파일을 찾을 수 없습니다.")
+
+    return attachment_response(request, attachment)
+
+# 첨부파일 삭제
+@router.post("/{post_id}/attachments/{attachment_id}/delete")
+async def attachment_delete(
+    post_id: int,
+    attachment_id: int,
+):
+    async def remove(session: AsyncSession):
+        attachment = await session.scalar(
+            select(Attachment).where(Attachment.id == attachment_id, Attachment.post_id == post_id)
+        )
+        if not attachment:
+            raise HTTPException(status_code=404, detail="첨부파일을 찾을 수 없습니다.")
+
+        enqueue(session, "attachments.released", delay_seconds=RELEASE_DELAY_SECONDS, sha256=[attachment.sha256])
+        await session.delete(attachment)
+
+    await writer.submit(remove)
+
+    return RedirectResponse(url=f"/board/{post_id}", status_code=303)
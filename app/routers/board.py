@@ -1,18 +1,37 @@
-from fastapi import APIRouter, Request, Depends, HTTPException, Form
-from fastapi.responses import HTMLResponse, RedirectResponse
-from fastapi.templating import Jinja2Templates
+from fastapi import APIRouter, Request, Depends, HTTPException, Form, Query, UploadFile, File
+from fastapi.responses import HTMLResponse, RedirectResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
-from sqlalchemy.orm import selectinload
-from typing import Optional
+from sqlalchemy import select, desc, update
+from sqlalchemy.orm import joinedload, selectinload, undefer
+from sqlalchemy.orm.attributes import set_committed_value
+from typing import Optional, List
 
+from app import generations, revisions
 from app.database import get_session
-from app.models import Post, Category, User
+from app.models import Post, ArchivedPost, Category, User
 from app.schemas import PostCreate, PostUpdate
 from app.auth import get_current_user
+from app.tasks import enqueue
+from app.storage import store_uploads, add_attachments, release_post_attachments, release_uploads
+from app.ranking import ranking, top_posts, TRENDING, POPULAR
+from app.related import related_posts
+from app.suggest import suggestions
+from app.templating import templates, page_or_fragment, wants_fragment
+from app.writer import writer
+from app.cache import cache
+from app.archive import search_posts
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+async def _categories(session: AsyncSession, generation: int) -> List[dict]:
+    """카테고리 id·이름·설명 (세대 번호가 키에 들어가 카테고리가 바뀌면 새로 읽음, 워커 간 공유)"""
+    async def load():
+        result = await session.execute(
+            select(Category.id, Category.name, Category.description).order_by(Category.id)
+        )
+        return [row._asdict() for row in result.all()]
+
+    return await cache.get_or_set(f"board_categories:{generation}", load)
 
 @router.get("/", response_class=HTMLResponse)
 async def board_list(
@@ -25,38 +44,57 @@ async def board_list(
     per_page = 10
     offset = (page - 1) * per_page
 
-    # 기본 쿼리 - eager loading으로 author와 category 미리 로드
-    query = select(Post).options(
-        selectinload(Post.author),
-        selectinload(Post.category)
-    ).where(Post.is_published == True)
-
-    # 카테고리 필터
-    if category_id:
-        query = query.where(Post.category_id == category_id)
-
-    # 검색 필터
     if search:
-        query = query.where(Post.title.contains(search) | Post.content.contains(search))
-
-    # 정렬 및 페이징
-    query = query.order_by(desc(Post.created_at)).offset(offset).limit(per_page)
-
-    result = await session.execute(query)
-    posts = result.scalars().all()
-
-    # 카테고리 목록
-    categories_result = await session.execute(select(Category))
-    categories = categories_result.scalars().all()
-
-    return templates.TemplateResponse("board/list.html", {
+        # 검색은 보관된 게시물까지 포함
+        posts = await search_posts(session, search, category_id, offset, per_page)
+    else:
+        # 기본 쿼리 - eager loading으로 author와 category 미리 로드
+        query = select(Post).options(
+            joinedload(Post.author),
+            joinedload(Post.category)
+        ).where(Post.is_published == True)
+
+        # 카테고리 필터
+        if category_id:
+            query = query.where(Post.category_id == category_id)
+
+        # 정렬 및 페이징
+        query = query.order_by(desc(Post.created_at)).offset(offset).limit(per_page)
+
+        result = await session.execute(query)
+        posts = result.scalars().all()
+
+    context = {
         "request": request,
         "posts": posts,
-        "categories": categories,
         "current_page": page,
         "current_category": category_id,
         "search_query": search
+    }
+    # 페이지 이동 조각 요청이면 표와 페이지 이동만 렌더링 (카테고리·순위 조회 생략)
+    if wants_fragment(request, "post-table"):
+        return page_or_fragment(request, "board/list.html", "board/_post_table.html", "post-table", context)
+
+    # 카테고리 목록 (필터·안내 조각과 목록 모두 categories 세대 번호로 캐시)
+    categories_generation = (await generations.current(session, "categories"))["categories"]
+    categories = await _categories(session, categories_generation)
+
+    # 인기/급상승 게시물 (메모리 순위에서 id만 꺼내 한 번에 조회)
+    trending_posts = await top_posts(session, TRENDING, category_id)
+    popular_posts = await top_posts(session, POPULAR, category_id)
+
+    context.update({
+        "categories": categories,
+        "categories_generation": categories_generation,
+        "trending_posts": trending_posts,
+        "popular_posts": popular_posts
     })
+    return page_or_fragment(request, "board/list.html", "board/_post_table.html", "post-table", context)
+
+@router.get("/suggest")
+async def board_suggest(q: str = ""):
+    # 메모리 접두어 색인만 사용 (DB 조회 없음)
+    return JSONResponse({"query": q, "items": suggestions.search(q[:100])})
 
 @router.get("/create", response_class=HTMLResponse)
 async def board_create_form(
@@ -76,20 +114,33 @@ async def board_create(
     title: str = Form(...),
     content: str = Form(...),
     category_id: Optional[int] = Form(None),
-    session: AsyncSession = Depends(get_session)
+    files: List[UploadFile] = File([]),
 ):
-    # 기본 관리자 사용자 (ID: 1)를 작성자로 설정
-    new_post = Post(
-        title=title,
-        content=content,
-        category_id=category_id,
-        author_id=1  # 기본 관리자 ID
-    )
-    session.add(new_post)
-    await session.commit()
-    await session.refresh(new_post)
+    # 파일 저장은 쓰기 트랜잭션 밖에서
+    stored = await store_uploads(files)
+
+    async def create(session: AsyncSession) -> int:
+        # 기본 관리자 사용자 (ID: 1)를 작성자로 설정
+        new_post = Post(
+            title=title,
+            content=content,
+            category_id=category_id,
+            author_id=1  # 기본 관리자 ID
+        )
+        session.add(new_post)
+        await session.flush()
+        add_attachments(session, new_post.id, stored)
+        enqueue(session, "post.changed", post_id=new_post.id, category_id=category_id, action="created")
+        return new_post.id
+
+    try:
+        post_id = await writer.submit(create)
+    except BaseException:
+        # 게시물이 저장되지 않았으면 방금 쓴 파일은 참조가 없음
+        await release_uploads(stored)
+        raise
 
-    return RedirectResponse(url=f"/board/{new_post.id}", status_code=303)
+    return RedirectResponse(url=f"/board/{post_id}", status_code=303)
 
 @router.get("/{post_id}", response_class=HTMLResponse)
 async def board_detail(
@@ -100,31 +151,54 @@ async def board_detail(
     # 조회수 증가 - eager loading으로 author와 category 미리 로드
     post_result = await session.execute(
         select(Post).options(
-            selectinload(Post.author),
-            selectinload(Post.category)
+            joinedload(Post.author),
+            joinedload(Post.category),
+            selectinload(Post.attachments),
+            undefer(Post.content)
         ).where(Post.id == post_id)
     )
     post = post_result.scalar_one_or_none()
 
+    if not post:
+        # 보관된 게시물은 같은 주소에서 읽기 전용으로 보여줌
+        post = await session.scalar(
+            select(ArchivedPost).options(
+                joinedload(ArchivedPost.author),
+                joinedload(ArchivedPost.category),
+                selectinload(ArchivedPost.attachments),
+                undefer(ArchivedPost.content)
+            ).where(ArchivedPost.id == post_id)
+        )
+
     if not post:
         raise HTTPException(status_code=404, detail="게시물을 찾을 수 없습니다.")
 
     # 조회수 증가
-    post.views += 1
-    await session.commit()
+    model = type(post)
+
+    async def count_view(write_session: AsyncSession):
+        await write_session.execute(update(model).where(model.id == post_id).values(views=model.views + 1))
 
-    # 세션을 닫기 전에 모든 필요한 속성을 미리 로드
-    await session.refresh(post)
+    await writer.submit(count_view)
+    if not post.is_archived:
+        ranking.record_view(post.id, post.category_id)
+
+    # 다시 읽지 않고 커밋된 조회수만 반영 (관계는 위에서 이미 로드됨)
+    set_committed_value(post, "views", post.views + 1)
 
     # 모든 관계 속성을 명시적으로 로드
     author_name = post.author.username if post.author else "Unknown"
     category_name = post.category.name if post.category else "No Category"
 
+    # 관련 게시물 (작성/수정 시 미리 계산된 목록 조회)
+    related = await related_posts(session, post.id)
+
     return templates.TemplateResponse("board/detail.html", {
         "request": request,
         "post": post,
         "author_name": author_name,
-        "category_name": category_name
+        "category_name": category_name,
+        "related_posts": related
     })
 
 @router.get("/{post_id}/edit", response_class=HTMLResponse)
@@ -135,8 +209,9 @@ async def board_edit_form(
 ):
     post_result = await session.execute(
         select(Post).options(
-            selectinload(Post.author),
-            selectinload(Post.category)
+            joinedload(Post.author),
+            joinedload(Post.category),
+            undefer(Post.content)
         ).where(Post.id == post_id)
     )
     post = post_result.scalar_one_or_none()
@@ -159,34 +234,70 @@ async def board_edit(
     title: str = Form(...),
     content: str = Form(...),
     category_id: Optional[int] = Form(None),
-    session: AsyncSession = Depends(get_session)
 ):
-    post_result = await session.execute(select(Post).where(Post.id == post_id))
-    post = post_result.scalar_one_or_none()
+    async def edit(session: AsyncSession):
+        post = await session.get(Post, post_id, options=[undefer(Post.content)])
+        if not post:
+            raise HTTPException(status_code=404, detail="게시물을 찾을 수 없습니다.")
 
-    if not post:
-        raise HTTPException(status_code=404, detail="게시물을 찾을 수 없습니다.")
+        # 덮어쓰기 전에 수정 이력 기록
+        await revisions.record_edit(session, post, title, content)
+        old_category_id = post.category_id
+        post.title = title
+        post.content = content
+        post.category_id = category_id
 
-    post.title = title
-    post.content = content
-    post.category_id = category_id
+        enqueue(session, "post.changed", post_id=post_id, category_id=category_id,
+                old_category_id=old_category_id, action="updated")
 
-    await session.commit()
+    await writer.submit(edit)
 
     return RedirectResponse(url=f"/board/{post_id}", status_code=303)
 
+@router.get("/{post_id}/revisions")
+async def board_revisions(post_id: int, session: AsyncSession = Depends(get_session)):
+    # 수정된 적 없는 게시물은 빈 목록
+    return JSONResponse({"post_id": post_id, "revisions": await revisions.history(session, post_id)})
+
+@router.get("/{post_id}/revisions/diff")
+async def board_revision_diff(
+    post_id: int,
+    old: int = Query(..., alias="from"),
+    new: int = Query(..., alias="to"),
+    session: AsyncSession = Depends(get_session)
+):
+    result = await revisions.diff(session, post_id, old, new)
+    if result is None:
+        raise HTTPException(status_code=404, detail="수정 이력을 찾을 수 없습니다.")
+    return JSONResponse(result)
+
+@router.get("/{post_id}/revisions/{number}")
+async def board_revision(post_id: int, number: int, session: AsyncSession = Depends(get_session)):
+    revision = await revisions.get_revision(session, post_id, number)
+    if revision is None:
+        raise HTTPException(status_code=404, detail="수정 이력을 찾을 수 없습니다.")
+    return JSONResponse({
+        "post_id": post_id,
+        "number": revision.number,
+        "title": revision.title,
+        "content": revision.content,
+        "created_at": revision.created_at.isoformat() if revision.created_at else None,
+    })
+
 @router.post("/{post_id}/delete")
 async def board_delete(
     post_id: int,
-    session: AsyncSession = Depends(get_session)
 ):
-    post_result = await session.execute(select(Post).where(Post.id == post_id))
-    post = post_result.scalar_one_or_none()
+    async def remove(session: AsyncSession):
+        post = await session.get(Post, post_id)
+        if not post:
+            raise HTTPException(status_code=404, detail="게시물을 찾을 수 없습니다.")
 
-    if not post:
-        raise HTTPException(status_code=404, detail="게시물을 찾을 수 없습니다.")
+        await release_post_attachments(session, post_id)
+        await revisions.delete_revisions(session, post_id)
+        enqueue(session, "post.changed", post_id=post_id, category_id=post.category_id, action="deleted")
+        await session.delete(post)
 
-    await session.delete(post)
-    await session.commit()
+    await writer.submit(remove)
 
     return RedirectResponse(url="/board", status_code=303)
\ No newline at end of file
@@ -1,15 +1,37 @@
 from fastapi import APIRouter, Request, Depends
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
+from fastapi.responses import HTMLResponse, JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, literal_column
+from sqlalchemy.orm import joinedload, undefer
 
+from app.cache import cache
 from app.database import get_session
 from app.models import Post, Research, News, User, Category
+from app.facets import research_facets
+from app.ranking import top_posts, TRENDING, POPULAR
+from app.trends import keyword_trends
+from app.tasks import subscribe
+from app.templating import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="templates")
+
+# 통계 카드 - 워커 간 공유 캐시, 게시물 변경 시 즉시 무효화되고 그 밖의 수치는 TTL로 갱신
+STATS_TTL_SECONDS = 60
+
+
+async def _stats(session: AsyncSession) -> dict:
+    return {
+        "posts": await session.scalar(select(func.count(Post.id))) or 0,
+        "research": await session.scalar(select(func.count(Research.id))) or 0,
+        "news": await session.scalar(select(func.count(News.id))) or 0,
+        "users": await session.scalar(select(func.count(User.id))) or 0,
+    }
+
+
+@subscribe("post.changed")
+async def invalidate_dashboard_stats(payload: dict):
+    await cache.invalidate("posts")
+
 
 @router.get("/", response_class=HTMLResponse)
 async def dashboard_home(
@@ -17,16 +39,13 @@ async def dashboard_home(
     session: AsyncSession = Depends(get_session)
 ):
     # 통계 데이터 수집
-    post_count = await session.scalar(select(func.count(Post.id)))
-    research_count = await session.scalar(select(func.count(Research.id)))
-    news_count = await session.scalar(select(func.count(News.id)))
-    user_count = await session.scalar(select(func.count(User.id)))
+    stats = await cache.get_or_set("dashboard_stats", lambda: _stats(session), ttl=STATS_TTL_SECONDS, tags=("posts",))
 
     # 최근 게시물 - eager loading으로 author와 category 미리 로드
     recent_posts = await session.execute(
         select(Post).options(
-            selectinload(Post.author),
-            selectinload(Post.category)
+            joinedload(Post.author),
+            joinedload(Post.category)
         ).order_by(Post.created_at.desc()).limit(5)
     )
     recent_posts = recent_posts.scalars().all()
@@ -40,24 +59,23 @@ async def dashboard_home(
     # 최신 뉴스 - eager loading으로 author 미리 로드
     latest_news = await session.execute(
         select(News).options(
-            selectinload(News.author)
+            joinedload(News.author),
+            undefer(News.content)
         ).where(News.is_featured == True).order_by(News.published_at.desc()).limit(3)
     )
     latest_news = latest_news.scalars().all()
 
-    stats = {
-        "posts": post_count or 0,
-        "research": research_count or 0,
-        "news": news_count or 0,
-        "users": user_count or 0
-    }
+    trending_posts = await top_posts(session, TRENDING)
+    popular_posts = await top_posts(session, POPULAR)
 
     return templates.TemplateResponse("dashboard/index.html", {
         "request": request,
         "stats": stats,
         "recent_posts": recent_posts,
         "recent_research": recent_research,
-        "latest_news": latest_news
+        "latest_news": latest_news,
+        "trending_posts": trending_posts,
+        "popular_posts": popular_posts
     })
 
 @router.get("/analytics", response_class=HTMLResponse)
@@ -65,19 +83,24 @@ async def dashboard_analytics(
     request: Request,
     session: AsyncSession = Depends(get_session)
 ):
-    # 월별 게시물 통계
+    # 월별 게시물 통계 - ix_posts_created_month 인덱스와 같은 식을 사용
+    month = func.strftime(literal_column("'%Y-%m'"), Post.created_at)
     monthly_posts = await session.execute(
         select(
-            func.strftime('%Y-%m', Post.created_at).label('month'),
+            month.label('month'),
             func.count(Post.id).label('count')
-        ).group_by(func.strftime('%Y-%m', Post.created_at))
-        .order_by(func.strftime('%Y-%m', Post.created_at))
+        ).group_by(month)
+        .order_by(month)
     )
     monthly_data = monthly_posts.all()
 
+    # 월별 키워드 추이 - 미리 집계된 표만 읽음 (app/trends.py)
+    trends = await keyword_trends(session)
+
     return templates.TemplateResponse("dashboard/analytics.html", {
         "request": request,
-        "monthly_data": monthly_data
+        "monthly_data": monthly_data,
+        "trends": trends
     })
 
 @router.get("/research", response_class=HTMLResponse)
@@ -85,26 +108,14 @@ async def dashboard_research(
     request: Request,
     session: AsyncSession = Depends(get_session)
 ):
-    # 연구팀별 통계
-    research_by_type = await session.execute(
-        select(
-            Research.research_type,
-            func.count(Research.id).label('count')
-        ).group_by(Research.research_type)
-    )
-    research_stats = research_by_type.all()
-
-    # 진행 상태별 연구
-    research_by_status = await session.execute(
-        select(
-            Research.status,
-            func.count(Research.id).label('count')
-        ).group_by(Research.status)
-    )
-    status_stats = research_by_status.all()
+    # 연구팀 × 진행 상태 교차표 (research 테이블 변경 시에만 재계산)
+    facets = await research_facets(session)
 
     return templates.TemplateResponse("dashboard/research.html", {
         "request": request,
-        "research_stats": research_stats,
-        "status_stats": status_stats
-    })
\ No newline at end of file
+        "facets": facets
+    })
+
+@router.get("/research/facets")
+async def dashboard_research_facets(session: AsyncSession = Depends(get_session)):
+    return JSONResponse(await research_facets(session))
\ No newline at end of file
@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Request, Depends, HTTPException, Query
+from fastapi.responses import HTMLResponse, JSONResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Optional, List
+
+from app.database import get_session
+from app.datasets import catalog, parse_filters
+from app.models import Dataset
+from app.templating import templates
+
+router = APIRouter()
+
+async def _load_preview(session, dataset_id, start, limit, columns, filters):
+    dataset = await session.get(Dataset, dataset_id)
+    if not dataset:
+        raise HTTPException(status_code=404, detail="데이터셋을 찾을 수 없습니다.")
+    column_list = [c.strip() for c in columns.split(",") if c.strip()] if columns else None
+    try:
+        preview = await catalog.preview(
+            session, dataset,
+            start=start, limit=limit,
+            columns=column_list,
+            filters=parse_filters(filters),
+        )
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="데이터셋 파일을 찾을 수 없습니다.")
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return dataset, preview
+
+# 데이터셋 미리보기 (JSON)
+@router.get("/datasets/{dataset_id}/rows")
+async def dataset_rows(
+    dataset_id: int,
+    start: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1),
+    columns: Optional[str] = None,
+    filter: List[str] = Query([]),
+    session: AsyncSession = Depends(get_session)
+):
+    _, preview = await _load_preview(session, dataset_id, start, limit, columns, filter)
+    return JSONResponse(preview)
+
+# 데이터셋 미리보기 페이지
+@router.get("/datasets/{dataset_id}", response_class=HTMLResponse)
+async def dataset_preview(
+    request: Request,
+    dataset_id: int,
+    start: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1),
+    columns: Optional[str] = None,
+    filter: List[str] = Query([]),
+    session: AsyncSession = Depends(get_session)
+):
+    dataset, preview = await _load_preview(session, dataset_id, start, limit, columns, filter)
+
+    return templates.TemplateResponse("datasets/preview.html", {
+        "request": request,
+        "dataset": dataset,
+        "preview": preview,
+        "limit": limit,
+        "columns_query": columns or "",
+        "filters": filter
+    })
@@ -0,0 +1,58 @@
+from email.utils import format_datetime, parsedate_to_datetime
+
+from fastapi import APIRouter, Request, Depends, HTTPException
+from fastapi.responses import Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_session
+from app.feeds import FORMATS, FeedSpec, get_feed, as_utc
+from app.storage import etag_matches
+
+router = APIRouter()
+
+
+def _not_modified_since(header, last_modified) -> bool:
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    return as_utc(last_modified) <= as_utc(since)
+
+
+async def _feed_response(request: Request, session: AsyncSession, spec: FeedSpec) -> Response:
+    if spec.fmt not in FORMATS:
+        raise HTTPException(status_code=404, detail="지원하지 않는 피드 형식입니다.")
+    feed = await get_feed(session, spec)
+    if feed is None:
+        raise HTTPException(status_code=404, detail="피드를 찾을 수 없습니다.")
+
+    headers = {
+        "etag": feed.etag,
+        "last-modified": format_datetime(as_utc(feed.last_modified), usegmt=True),
+        "cache-control": f"public, max-age={settings.feed_max_age_seconds}",
+    }
+    # If-None-Match가 있으면 If-Modified-Since보다 우선 (RFC 9110)
+    if_none_match = request.headers.get("if-none-match")
+    if etag_matches(if_none_match, feed.etag) or (
+        if_none_match is None and _not_modified_since(request.headers.get("if-modified-since"), feed.last_modified)
+    ):
+        return Response(status_code=304, headers=headers)
+    return Response(content=feed.body, media_type=feed.content_type, headers=headers)
+
+
+@router.get("/posts.{fmt}")
+async def posts_feed(fmt: str, request: Request, session: AsyncSession = Depends(get_session)):
+    return await _feed_response(request, session, FeedSpec(fmt, "posts"))
+
+
+@router.get("/category/{category_id:int}.{fmt}")
+async def category_feed(category_id: int, fmt: str, request: Request, session: AsyncSession = Depends(get_session)):
+    return await _feed_response(request, session, FeedSpec(fmt, "posts", category_id))
+
+
+@router.get("/news.{fmt}")
+async def news_feed(fmt: str, request: Request, session: AsyncSession = Depends(get_session)):
+    return await _feed_response(request, session, FeedSpec(fmt, "news"))
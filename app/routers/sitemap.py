@@ -0,0 +1,38 @@
+import os
+import re
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import FileResponse, PlainTextResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import get_session
+from app.sitemap import INDEX_NAME, current_directory
+
+router = APIRouter()
+
+_PART_NAME = re.compile(r"^(pages|posts-\d+)\.xml$")
+
+
+def _xml_file(directory: str, name: str) -> FileResponse:
+    path = os.path.join(directory, name)
+    if not os.path.exists(path):
+        raise HTTPException(status_code=404, detail="사이트맵을 찾을 수 없습니다.")
+    return FileResponse(path, media_type="application/xml", headers={"cache-control": "public, max-age=3600"})
+
+
+@router.get("/sitemap.xml")
+async def sitemap_index(session: AsyncSession = Depends(get_session)):
+    return _xml_file(await current_directory(session), INDEX_NAME)
+
+
+@router.get("/sitemaps/{name}")
+async def sitemap_part(name: str, session: AsyncSession = Depends(get_session)):
+    if not _PART_NAME.match(name):
+        raise HTTPException(status_code=404, detail="사이트맵을 찾을 수 없습니다.")
+    return _xml_file(await current_directory(session), name)
+
+
+@router.get("/robots.txt", response_class=PlainTextResponse)
+async def robots():
+    return f"User-agent: *\nDisallow: /admin/\nDisallow: /crudadmin\nSitemap: {settings.site_url.rstrip('/')}/sitemap.xml\n"
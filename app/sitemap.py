@@ -0,0 +1,165 @@
+"""사이트맵 인덱스와 사이트맵 파일 생성
+
+게시물을 id 순서로 `yield_per` 스트리밍하며 파일에 바로 기록하므로 게시물 수와
+관계없이 메모리 사용량이 일정합니다. 파일 쓰기는 이벤트 루프를 막지 않도록 묶음마다
+작업 스레드에서 합니다. 파일 하나에 최대 50,000개 URL을 넣고,
+넘치면 다음 파일로 나눕니다. 생성된 파일은 posts 테이블 세대별 디렉터리에
+두고 다음 쓰기로 세대가 바뀔 때까지 그대로 제공합니다.
+"""
+import asyncio
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from typing import List, Optional
+from xml.sax.saxutils import escape
+
+import anyio
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import generations, metrics
+from app.config import settings
+from app.feeds import as_utc
+from app.models import Post, ArchivedPost
+
+INDEX_NAME = "sitemap.xml"
+PAGES = ["/", "/about", "/education", "/board/", "/dashboard/", "/data-provision"]
+
+_HEADER = '<?xml version="1.0" encoding="UTF-8"?>\n'
+_URLSET_OPEN = '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n'
+_URLSET_CLOSE = "</urlset>\n"
+
+# 같은 워커 안에서 동시에 여러 번 생성하지 않도록
+_build_lock = asyncio.Lock()
+
+
+def _lastmod(value: datetime) -> str:
+    return as_utc(value).isoformat(timespec="seconds")
+
+
+def _url(loc: str, lastmod: Optional[str] = None) -> str:
+    lastmod_tag = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+    return f"<url><loc>{escape(loc)}</loc>{lastmod_tag}</url>\n"
+
+
+class _PartWriter:
+    """URL 수가 한도에 닿으면 posts-N.xml 파일을 바꿔 가며 기록"""
+
+    def __init__(self, directory: str, limit: int):
+        self.directory = directory
+        self.limit = limit
+        self.parts: List[list] = []  # [파일 이름, 가장 최근 lastmod]
+        self._file = None
+        self._count = 0
+
+    def write(self, loc: str, lastmod: str):
+        if self._file is None or self._count >= self.limit:
+            self._close()
+            name = f"posts-{len(self.parts) + 1}.xml"
+            self._file = open(os.path.join(self.directory, name), "w", encoding="utf-8")
+            self._file.write(_HEADER + _URLSET_OPEN)
+            self.parts.append([name, None])
+            self._count = 0
+        self._file.write(_url(loc, lastmod))
+        self._count += 1
+        # ISO 형식 문자열은 사전순 비교가 시간순과 같음
+        if self.parts[-1][1] is None or lastmod > self.parts[-1][1]:
+            self.parts[-1][1] = lastmod
+
+    def _close(self):
+        if self._file is not None:
+            self._file.write(_URLSET_CLOSE)
+            self._file.close()
+            self._file = None
+
+    def write_rows(self, base: str, rows):
+        """(id, is_published, created_at, updated_at) 묶음 중 공개 게시물 기록 (작업 스레드에서 실행)"""
+        for post_id, is_published, created_at, updated_at in rows:
+            if is_published:
+                self.write(f"{base}/board/{post_id}", _lastmod(updated_at or created_at))
+
+    def close(self):
+        self._close()
+
+
+def _write_pages(directory: str, base: str):
+    with open(os.path.join(directory, "pages.xml"), "w", encoding="utf-8") as f:
+        f.write(_HEADER + _URLSET_OPEN)
+        for path in PAGES:
+            f.write(_url(base + path))
+        f.write(_URLSET_CLOSE)
+
+
+def _write_index(directory: str, base: str, parts: List[list]):
+    with open(os.path.join(directory, INDEX_NAME), "w", encoding="utf-8") as f:
+        f.write(_HEADER + '<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">\n')
+        f.write(f"<sitemap><loc>{escape(base)}/sitemaps/pages.xml</loc></sitemap>\n")
+        for name, lastmod in parts:
+            lastmod_tag = f"<lastmod>{lastmod}</lastmod>" if lastmod else ""
+            f.write(f"<sitemap><loc>{escape(base)}/sitemaps/{name}</loc>{lastmod_tag}</sitemap>\n")
+        f.write("</sitemapindex>\n")
+
+
+async def build(session: AsyncSession, directory: str):
+    """directory에 사이트맵 인덱스와 pages.xml, posts-N.xml을 생성"""
+    base = settings.site_url.rstrip("/")
+    await anyio.to_thread.run_sync(_write_pages, directory, base)
+
+    writer = _PartWriter(directory, settings.sitemap_max_urls)
+    try:
+        # is_published를 WHERE에 넣으면 SQLite가 (is_published, created_at) 인덱스를 고르고
+        # 전체를 임시 정렬하므로, rowid 순서로 훑으며 여기서 거름
+        # 보관된 게시물도 같은 주소로 열리므로 함께 포함
+        for model in (Post, ArchivedPost):
+            result = await session.stream(
+                select(model.id, model.is_published, model.created_at, model.updated_at)
+                .order_by(model.id)
+                .execution_options(yield_per=settings.sitemap_yield_per)
+            )
+            async for rows in result.partitions():
+                await anyio.to_thread.run_sync(writer.write_rows, base, rows)
+    finally:
+        await anyio.to_thread.run_sync(writer.close)
+
+    await anyio.to_thread.run_sync(_write_index, directory, base, writer.parts)
+
+
+async def current_directory(session: AsyncSession) -> str:
+    """현재 posts 세대의 사이트맵 디렉터리 (없으면 생성)"""
+    generation = (await generations.current(session, "posts"))["posts"]
+    root = settings.sitemap_dir
+    directory = os.path.join(root, f"g{generation}")
+    hit = os.path.exists(os.path.join(directory, INDEX_NAME))
+    metrics.cache_result("sitemap", hit)
+    if hit:
+        return directory
+
+    async with _build_lock:
+        if os.path.exists(os.path.join(directory, INDEX_NAME)):
+            return directory
+        os.makedirs(root, exist_ok=True)
+        tmp = tempfile.mkdtemp(prefix=".build-", dir=root)
+        try:
+            await build(session, tmp)
+            await anyio.to_thread.run_sync(_publish, tmp, directory)
+        except BaseException:
+            shutil.rmtree(tmp, ignore_errors=True)
+            raise
+        await anyio.to_thread.run_sync(_remove_old, root, generation)
+    return directory
+
+
+def _publish(tmp: str, directory: str):
+    # 다른 워커가 먼저 만들었으면 그 결과를 사용
+    try:
+        os.rename(tmp, directory)
+    except OSError:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def _remove_old(root: str, generation: int):
+    # 직전 세대는 다른 워커가 아직 응답 중일 수 있으므로 남겨 둠
+    for name in os.listdir(root):
+        if name.startswith("g") and name[1:].isdigit() and int(name[1:]) < generation - 1:
+            shutil.rmtree(os.path.join(root, name), ignore_errors=True)
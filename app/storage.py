@@ -0,0 +1,301 @@
+"""콘텐츠 주소 기반 첨부파일 저장소와 Range 지원 파일 응답
+
+파일은 SHA-256 해시를 경로로 저장되어 같은 내용은 한 번만 보관됩니다.
+업로드와 다운로드 모두 청크 단위로 처리하므로 수백 MB 파일도 워커 메모리에
+올라가지 않습니다.
+"""
+import hashlib
+import os
+import re
+import tempfile
+import time
+from email.utils import formatdate
+from typing import List, NamedTuple, Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from fastapi import Request, UploadFile, HTTPException
+from sqlalchemy import select, delete, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Attachment
+from app.tasks import enqueue, subscribe
+from app.writer import writer
+
+# 중복 업로드가 방금 참조한 파일을 GC가 지우지 않도록 두는 유예 시간
+GC_GRACE_SECONDS = 3600
+# 참조가 끊긴 파일 정리는 유예 시간이 지난 뒤 실행 (그전에는 remove_if_stale이 지우지 않음)
+RELEASE_DELAY_SECONDS = GC_GRACE_SECONDS + 60
+
+
+class BlobStore:
+    def __init__(self, root: str, chunk_size: int = settings.upload_chunk_size):
+        self.root = root
+        self.chunk_size = chunk_size
+
+    def path_for(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    async def save_upload(self, upload: UploadFile, max_bytes: int = settings.max_upload_bytes) -> Tuple[str, int]:
+        """업로드를 청크 단위로 해싱하며 임시 파일에 쓰고, 해시 경로로 옮김"""
+        tmp_dir = os.path.join(self.root, "tmp")
+        os.makedirs(tmp_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=tmp_dir)
+        hasher = hashlib.sha256()
+        size = 0
+        try:
+            with os.fdopen(fd, "wb") as out:
+                while True:
+                    chunk = await upload.read(self.chunk_size)
+                    if not chunk:
+                        break
+                    size += len(chunk)
+                    if size > max_bytes:
+                        raise HTTPException(status_code=413, detail="파일 크기 제한을 초과했습니다.")
+                    hasher.update(chunk)
+                    await anyio.to_thread.run_sync(out.write, chunk)
+            sha256 = hasher.hexdigest()
+            await anyio.to_thread.run_sync(self._commit, tmp_path, sha256)
+        finally:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+        return sha256, size
+
+    def _commit(self, tmp_path: str, sha256: str):
+        dest = self.path_for(sha256)
+        if os.path.exists(dest):
+            # 중복 제거: 기존 파일을 재사용하고 GC 유예 시간을 갱신
+            os.utime(dest)
+            return
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        os.replace(tmp_path, dest)
+
+    def remove_if_stale(self, sha256: str) -> bool:
+        path = self.path_for(sha256)
+        try:
+            if time.time() - os.stat(path).st_mtime < GC_GRACE_SECONDS:
+                return False
+            os.unlink(path)
+            return True
+        except FileNotFoundError:
+            return False
+
+
+blob_store = BlobStore(settings.upload_dir)
+
+
+class StoredUpload(NamedTuple):
+    filename: str
+    content_type: str
+    size: int
+    sha256: str
+
+
+async def store_uploads(uploads: List[UploadFile]) -> List[StoredUpload]:
+    """업로드를 저장소에 쓰고 첨부 행에 넣을 정보를 반환 (쓰기 트랜잭션 밖에서 실행)"""
+    stored = []
+    try:
+        for upload in uploads:
+            # 파일을 선택하지 않은 input은 빈 파일명으로 전송됨
+            if not upload or not upload.filename:
+                continue
+            sha256, size = await blob_store.save_upload(upload)
+            stored.append(StoredUpload(
+                filename=os.path.basename(upload.filename),
+                content_type=upload.content_type or "application/octet-stream",
+                size=size,
+                sha256=sha256,
+            ))
+    except BaseException:
+        await release_uploads(stored)
+        raise
+    return stored
+
+
+async def release_uploads(stored: List[StoredUpload]):
+    """첨부 행을 쓰지 못한 업로드 파일의 정리를 예약
+
+    유예 시간이 지난 뒤 참조가 없으면 지우도록 지연 작업으로 남깁니다.
+    """
+    hashes = sorted({upload.sha256 for upload in stored})
+    if not hashes:
+        return
+
+    async def schedule(session: AsyncSession):
+        enqueue(session, "attachments.released", delay_seconds=RELEASE_DELAY_SECONDS, sha256=hashes)
+
+    try:
+        await writer.submit(schedule)
+    except Exception as e:
+        print(f"❌ 업로드 파일 정리 예약 실패 ({len(hashes)}개): {e}")
+
+
+def add_attachments(session: AsyncSession, post_id: int, stored: List[StoredUpload]) -> List[Attachment]:
+    attachments = [Attachment(post_id=post_id, **upload._asdict()) for upload in stored]
+    session.add_all(attachments)
+    return attachments
+
+
+async def release_post_attachments(session: AsyncSession, post_id: int):
+    """게시물 삭제 시 첨부 행을 지우고, 커밋 후 참조가 끊긴 파일 정리를 예약"""
+    hashes = (await session.scalars(
+        select(Attachment.sha256).where(Attachment.post_id == post_id)
+    )).all()
+    if not hashes:
+        return
+    await session.execute(delete(Attachment).where(Attachment.post_id == post_id))
+    enqueue(session, "attachments.released", delay_seconds=RELEASE_DELAY_SECONDS, sha256=sorted(set(hashes)))
+
+
+@subscribe("attachments.released")
+async def collect_unreferenced_blobs(payload: dict):
+    async with SessionLocal() as session:
+        for sha256 in payload.get("sha256", []):
+            refs = await session.scalar(
+                select(func.count(Attachment.id)).where(Attachment.sha256 == sha256)
+            )
+            if not refs:
+                await anyio.to_thread.run_sync(blob_store.remove_if_stale, sha256)
+
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """단일 바이트 범위를 (start, end) 포함 구간으로 해석
+
+    범위가 없거나 다중 범위이면 None(전체 응답), 만족할 수 없으면 ValueError.
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        return None
+    first, last = match.groups()
+    if first == "" and last == "":
+        return None
+    if first == "":
+        # 접미 범위: 마지막 N 바이트
+        length = int(last)
+        if length == 0:
+            raise ValueError(header)
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        raise ValueError(header)
+    return start, min(end, size - 1)
+
+
+class RangeFileResponse(Response):
+    """파일의 일부(또는 전체)를 청크/zero-copy로 전송하는 응답"""
+    chunk_size = 256 * 1024
+
+    def __init__(
+        self,
+        path: str,
+        offset: int,
+        length: int,
+        status_code: int = 200,
+        headers: Optional[dict] = None,
+        media_type: Optional[str] = None,
+        send_body: bool = True,
+    ):
+        self.path = path
+        self.offset = offset
+        self.length = length
+        self.status_code = status_code
+        self.media_type = media_type
+        self.send_body = send_body
+        self.background = None
+        self.init_headers(headers)
+        self.headers["content-length"] = str(length)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if not self.send_body or self.length == 0:
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+
+        extensions = scope.get("extensions") or {}
+        if "http.response.zerocopysend" in extensions:
+            # 서버가 지원하면 sendfile()로 커널에서 바로 전송
+            fd = os.open(self.path, os.O_RDONLY)
+            try:
+                await send({
+                    "type": "http.response.zerocopysend",
+                    "file": fd,
+                    "offset": self.offset,
+                    "count": self.length,
+                    "more_body": False,
+                })
+            finally:
+                os.close(fd)
+            return
+
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            await file.seek(self.offset)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in candidates
+
+
+def attachment_response(request: Request, attachment: Attachment) -> Response:
+    path = blob_store.path_for(attachment.sha256)
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="첨부파일을 찾을 수 없습니다.")
+
+    size = stat_result.st_size
+    # 내용 해시가 곧 강한 ETag
+    etag = f'"{attachment.sha256}"'
+    filename = quote(attachment.filename)
+    headers = {
+        "etag": etag,
+        "accept-ranges": "bytes",
+        "last-modified": formatdate(stat_result.st_mtime, usegmt=True),
+        "cache-control": "private, max-age=86400",
+        "content-disposition": f"attachment; filename*=utf-8''{filename}",
+    }
+
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={k: v for k, v in headers.items() if k in ("etag", "cache-control")})
+
+    byte_range = None
+    if_range = request.headers.get("if-range")
+    if if_range is None or if_range.strip() == etag:
+        try:
+            byte_range = parse_range(request.headers.get("range"), size)
+        except ValueError:
+            return Response(status_code=416, headers={"content-range": f"bytes */{size}"})
+
+    send_body = request.method != "HEAD"
+    if byte_range is None:
+        return RangeFileResponse(path, 0, size, headers=headers, media_type=attachment.content_type, send_body=send_body)
+
+    start, end = byte_range
+    headers["content-range"] = f"bytes {start}-{end}/{size}"
+    return RangeFileResponse(
+        path, start, end - start + 1,
+        status_code=206, headers=headers, media_type=attachment.content_type, send_body=send_body,
+    )
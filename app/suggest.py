@@ -0,0 +1,296 @@
+"""검색어 자동 완성 (게시물 제목 + 카테고리 이름)
+
+제목의 각 어절부터 끝까지를 자모로 풀어 쓴 문자열을 정렬된 배열에 두고 `bisect`로
+접두어 범위를 찾습니다. 자모로 비교하므로 입력 중인 "데이ㅌ"나 "분서"도
+"데이터", "분석"에 걸리고, 자음만 입력한 "ㄷㅇㅌ"는 초성 키로 찾습니다.
+
+색인은 워커 메모리에만 있어 요청 처리 중에는 DB를 읽지 않습니다. 워커마다
+주기적으로 posts/categories 세대 번호를 확인하고, 바뀐 쪽만 반영합니다. 게시물은
+마지막으로 본 id와 updated_at 이후의 행만 읽고, 삭제는 게시된 게시물 수가 색인과
+다를 때만 id 목록(커버링 인덱스)으로 찾아 지웁니다. 카테고리는 소수라 다시 읽습니다.
+"""
+import asyncio
+import unicodedata
+from datetime import datetime, timedelta
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+
+from app import generations
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Post, Category
+from app.tasks import subscribe
+
+POST = "post"
+CATEGORY = "category"
+
+_CHO = "ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ"
+_JUNG = "ㅏㅐㅑㅒㅓㅔㅕㅖㅗㅘㅙㅚㅛㅜㅝㅞㅟㅠㅡㅢㅣ"
+_JONG = " ㄱㄲㄳㄴㄵㄶㄷㄹㄺㄻㄼㄽㄾㄿㅀㅁㅂㅄㅅㅆㅇㅈㅊㅋㅌㅍㅎ"
+# 겹모음·겹받침은 입력 순서대로 나눔 (예: "과"를 치는 중에는 "고"가 먼저 보임)
+_SPLIT = {
+    "ㅘ": "ㅗㅏ", "ㅙ": "ㅗㅐ", "ㅚ": "ㅗㅣ", "ㅝ": "ㅜㅓ", "ㅞ": "ㅜㅔ", "ㅟ": "ㅜㅣ", "ㅢ": "ㅡㅣ",
+    "ㄳ": "ㄱㅅ", "ㄵ": "ㄴㅈ", "ㄶ": "ㄴㅎ", "ㄺ": "ㄹㄱ", "ㄻ": "ㄹㅁ", "ㄼ": "ㄹㅂ", "ㄽ": "ㄹㅅ",
+    "ㄾ": "ㄹㅌ", "ㄿ": "ㄹㅍ", "ㅀ": "ㄹㅎ", "ㅄ": "ㅂㅅ",
+}
+# 초성 키 앞에 붙여 일반 키와 구분
+_CHOSEONG_MARK = "\x01"
+# 짧은 접두어가 너무 많은 키에 걸려도 이만큼만 살펴봄
+MAX_CANDIDATES = 200
+# 바뀐 항목이 이보다 많으면 하나씩 끼워 넣지 않고 한 번에 정렬해 다시 만듦
+MAX_INCREMENTAL_CHANGES = 1000
+
+
+# NFKC는 입력 중인 호환 자모(ㄱ, ㅏ)를 첫가끝 자모로 바꾸므로 다시 호환 자모로 되돌림
+_COMPAT_JAMO = {
+    ord(unicodedata.normalize("NFKC", chr(code))): chr(code)
+    for code in range(0x3131, 0x3164)
+    if len(unicodedata.normalize("NFKC", chr(code))) == 1
+}
+
+
+def _normalize(text: str) -> str:
+    return " ".join(unicodedata.normalize("NFKC", text).translate(_COMPAT_JAMO).lower().split())
+
+
+def jamo(text: str) -> str:
+    """한글 음절을 자모로 풀어 씀 (그 밖의 문자는 그대로)"""
+    out = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            cho, rest = divmod(code, 588)
+            jung, jong = divmod(rest, 28)
+            out.append(_CHO[cho])
+            out.append(_SPLIT.get(_JUNG[jung], _JUNG[jung]))
+            if jong:
+                out.append(_SPLIT.get(_JONG[jong], _JONG[jong]))
+        else:
+            out.append(_SPLIT.get(char, char))
+    return "".join(out)
+
+
+def choseong(text: str) -> str:
+    out = []
+    for char in text:
+        code = ord(char) - 0xAC00
+        if 0 <= code < 11172:
+            out.append(_CHO[code // 588])
+        elif char != " ":
+            out.append(char)
+    return "".join(out)
+
+
+def _is_choseong_query(text: str) -> bool:
+    return all(char in _CHO for char in text.replace(" ", ""))
+
+
+def _keys(label: str) -> List[Tuple[str, int]]:
+    """(키, 어절 위치) - 어절마다 그 어절부터 끝까지의 자모 키와 초성 키"""
+    words = _normalize(label).split(" ")
+    keys = []
+    for position in range(len(words)):
+        tail = " ".join(words[position:])
+        keys.append((jamo(tail), position))
+        initials = choseong(tail)
+        if initials:
+            keys.append((_CHOSEONG_MARK + initials, position))
+    return keys
+
+
+class PrefixIndex:
+    """정렬된 (키, 종류, id, 어절 위치) 배열과 항목별 키 목록"""
+
+    def __init__(self):
+        self._keys: List[Tuple[str, str, int, int]] = []
+        self._labels: Dict[Tuple[str, int], str] = {}
+
+    @classmethod
+    def build(cls, items: Dict[Tuple[str, int], str]) -> "PrefixIndex":
+        index = cls()
+        index._labels = dict(items)
+        index._keys = sorted(
+            (key, kind, item_id, position)
+            for (kind, item_id), label in items.items()
+            for key, position in _keys(label)
+        )
+        return index
+
+    def __len__(self):
+        return len(self._labels)
+
+    def label(self, kind: str, item_id: int) -> Optional[str]:
+        return self._labels.get((kind, item_id))
+
+    def ids(self, kind: str) -> List[int]:
+        return [item_id for k, item_id in self._labels if k == kind]
+
+    def items(self) -> Dict[Tuple[str, int], str]:
+        return dict(self._labels)
+
+    def add(self, kind: str, item_id: int, label: str):
+        if self._labels.get((kind, item_id)) == label:
+            return
+        self.remove(kind, item_id)
+        self._labels[(kind, item_id)] = label
+        for key, position in _keys(label):
+            insort(self._keys, (key, kind, item_id, position))
+
+    def remove(self, kind: str, item_id: int):
+        label = self._labels.pop((kind, item_id), None)
+        if label is None:
+            return
+        for key, position in _keys(label):
+            entry = (key, kind, item_id, position)
+            i = bisect_left(self._keys, entry)
+            if i < len(self._keys) and self._keys[i] == entry:
+                del self._keys[i]
+
+    def search(self, query: str, limit: int) -> List[Tuple[str, int, str]]:
+        """(종류, id, 표시 이름) - 카테고리, 제목 첫 어절 일치, 짧은 이름 순"""
+        query = _normalize(query)
+        if not query:
+            return []
+        prefix = _CHOSEONG_MARK + query.replace(" ", "") if _is_choseong_query(query) else jamo(query)
+        start = bisect_left(self._keys, (prefix,))
+        best: Dict[Tuple[str, int], int] = {}
+        for key, kind, item_id, position in self._keys[start:start + MAX_CANDIDATES]:
+            if not key.startswith(prefix):
+                break
+            ref = (kind, item_id)
+            best[ref] = min(position, best.get(ref, position))
+        ranked = sorted(
+            best.items(),
+            key=lambda item: (item[0][0] != CATEGORY, item[1] > 0, len(self._labels[item[0]]), item[0][1]),
+        )
+        return [(kind, item_id, self._labels[(kind, item_id)]) for (kind, item_id), _ in ranked[:limit]]
+
+
+class SuggestionService:
+    def __init__(self, refresh_interval: float = settings.suggest_refresh_seconds):
+        self.refresh_interval = refresh_interval
+        self.index = PrefixIndex()
+        self._generations: Optional[Dict[str, int]] = None
+        # 마지막으로 반영한 게시물 (최대 id, 최대 updated_at)
+        self._watermark: Optional[Tuple[int, Optional[datetime]]] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._wakeup: Optional[asyncio.Event] = None
+
+    def search(self, query: str, limit: int = settings.suggest_limit) -> List[dict]:
+        items = []
+        for kind, item_id, label in self.index.search(query, limit):
+            url = f"/board/{item_id}" if kind == POST else f"/board/?category_id={item_id}"
+            items.append({"type": kind, "id": item_id, "label": label, "url": url})
+        return items
+
+    async def refresh(self) -> bool:
+        """세대 번호가 바뀌었으면 달라진 항목만 색인에 반영 (반영했으면 True)"""
+        async with SessionLocal() as session:
+            current = await generations.current(session, "posts", "categories")
+            if current == self._generations:
+                return False
+            previous = self._generations or {}
+            if current["categories"] != previous.get("categories"):
+                labels = dict((await session.execute(select(Category.id, Category.name))).all())
+                removed = [item_id for item_id in self.index.ids(CATEGORY) if item_id not in labels]
+                self._apply(CATEGORY, removed, labels)
+            if current["posts"] != previous.get("posts"):
+                await self._refresh_posts(session)
+        self._generations = current
+        return True
+
+    async def _refresh_posts(self, session):
+        query = select(Post.id, Post.title, Post.is_published, Post.updated_at)
+        if self._watermark is not None:
+            last_id, since = self._watermark
+            # updated_at은 초 단위 DB 시각이라 같은 초에 늦게 커밋된 수정도 잡도록 1초 겹쳐 읽음
+            edited = Post.updated_at.isnot(None) if since is None else Post.updated_at >= since - timedelta(seconds=1)
+            query = query.where(or_(Post.id > last_id, edited))
+        rows = (await session.execute(query)).all()
+
+        labels = {row.id: row.title for row in rows if row.is_published}
+        if self._watermark is None:
+            removed = [item_id for item_id in self.index.ids(POST) if item_id not in labels]
+        else:
+            removed = [row.id for row in rows if not row.is_published]
+        self._apply(POST, removed, labels)
+
+        last_id, since = self._watermark or (0, None)
+        for row in rows:
+            last_id = max(last_id, row.id)
+            if row.updated_at is not None and (since is None or row.updated_at > since):
+                since = row.updated_at
+        self._watermark = (last_id, since)
+
+        # 삭제된 행은 위에서 보이지 않으므로 게시된 수가 다를 때만 id 목록으로 찾음
+        published = await session.scalar(select(func.count()).where(Post.is_published == True))
+        if published != len(self.index.ids(POST)):
+            existing = set((await session.execute(select(Post.id).where(Post.is_published == True))).scalars())
+            self._apply(POST, [item_id for item_id in self.index.ids(POST) if item_id not in existing], {})
+
+    def _apply(self, kind: str, removed: List[int], labels: Dict[int, str]):
+        changed = [(item_id, label) for item_id, label in labels.items() if self.index.label(kind, item_id) != label]
+        if len(removed) + len(changed) > MAX_INCREMENTAL_CHANGES:
+            items = self.index.items()
+            for item_id in removed:
+                items.pop((kind, item_id), None)
+            items.update(((kind, item_id), label) for item_id, label in changed)
+            self.index = PrefixIndex.build(items)
+        else:
+            for item_id in removed:
+                self.index.remove(kind, item_id)
+            for item_id, label in changed:
+                self.index.add(kind, item_id, label)
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        self._stopping = False
+        self._wakeup = asyncio.Event()
+        try:
+            await self.refresh()
+        except Exception as e:
+            print(f"❌ 자동 완성 색인 불러오기 실패: {e}")
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._runner is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._runner
+        self._runner = None
+
+    async def _run(self):
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.refresh_interval)
+            except asyncio.TimeoutError:
+                pass
+            if self._stopping:
+                return
+            try:
+                await self.refresh()
+            except Exception as e:
+                print(f"❌ 자동 완성 색인 갱신 실패: {e}")
+
+
+suggestions = SuggestionService()
+
+
+@subscribe("post.changed")
+async def refresh_suggestions(payload: dict):
+    # 작업을 처리한 워커는 삭제를 이벤트에서 바로 지우고 나머지를 반영, 다른 워커는 다음 주기에 반영
+    if payload.get("action") == "deleted":
+        suggestions.index.remove(POST, payload["post_id"])
+    await suggestions.refresh()
+
+
+@subscribe("posts.archived")
+async def forget_archived_suggestions(payload: dict):
+    for post_id in payload["post_ids"]:
+        suggestions.index.remove(POST, post_id)
+    await suggestions.refresh()
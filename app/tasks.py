@@ -0,0 +1,262 @@
+"""커밋 이후 실행되는 후처리 작업 큐
+
+쓰기 핸들러는 `enqueue()`로 작업을 같은 트랜잭션 안의 `task_outbox` 테이블에
+기록합니다. 커밋되면 프로세스 내 asyncio 큐가 깨어나 작업을 실행하고,
+롤백되면 작업도 함께 사라집니다. 실패한 작업은 지수 백오프로 재시도합니다.
+"""
+import asyncio
+import json
+import traceback
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional
+
+from sqlalchemy import event, select, update, delete, and_, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models import TaskOutbox
+
+Handler = Callable[[dict], Awaitable[None]]
+
+# 작업 이름 -> 핸들러, 토픽 -> 구독 작업 이름 목록
+_handlers: Dict[str, Handler] = {}
+_subscribers: Dict[str, List[str]] = defaultdict(list)
+
+_PENDING_KEY = "task_outbox_pending"
+
+
+def subscribe(topic: str):
+    """토픽에 후처리 핸들러를 등록하는 데코레이터
+
+    핸들러는 재시도될 수 있으므로 멱등적으로 작성해야 합니다.
+    """
+    def decorator(func: Handler) -> Handler:
+        name = f"{func.__module__}.{func.__qualname__}"
+        _handlers[name] = func
+        if name not in _subscribers[topic]:
+            _subscribers[topic].append(name)
+        return func
+    return decorator
+
+
+def enqueue(session: AsyncSession, topic: str, *, delay_seconds: float = 0, **payload) -> int:
+    """토픽의 구독자마다 outbox 행을 현재 트랜잭션에 추가 (delay_seconds 뒤부터 실행)"""
+    names = _subscribers.get(topic, [])
+    data = json.dumps(payload, ensure_ascii=False, default=str)
+    available_at = datetime.utcnow() + timedelta(seconds=delay_seconds)
+    for name in names:
+        session.add(TaskOutbox(task=name, payload=data, available_at=available_at))
+    if names:
+        session.info[_PENDING_KEY] = True
+    return len(names)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_after_commit(session):
+    if session.info.pop(_PENDING_KEY, False):
+        queue.notify()
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_after_rollback(session):
+    session.info.pop(_PENDING_KEY, None)
+
+
+class TaskQueue:
+    def __init__(
+        self,
+        concurrency: int = settings.task_concurrency,
+        max_attempts: int = settings.task_max_attempts,
+        retry_base: float = settings.task_retry_base_seconds,
+        poll_interval: float = settings.task_poll_interval_seconds,
+        lease_seconds: int = settings.task_lease_seconds,
+    ):
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_base = retry_base
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._runner: Optional[asyncio.Task] = None
+        self._inflight: set = set()
+        self._stopping = False
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._runner = asyncio.create_task(self._run())
+
+    def notify(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def drain(self, timeout: float = settings.task_drain_timeout_seconds):
+        """새 작업 수집을 멈추고 남은 작업을 제한 시간 안에 처리"""
+        if self._runner is None:
+            return
+        # 취소 대신 플래그로 종료: wait_for가 취소를 삼키는 경우를 피함
+        self._stopping = True
+        self.notify()
+        await self._runner
+        self._runner = None
+
+        async def _finish():
+            while True:
+                claimed = await self._claim_and_spawn()
+                if self._inflight:
+                    await asyncio.gather(*self._inflight, return_exceptions=True)
+                elif not claimed:
+                    return
+
+        try:
+            await asyncio.wait_for(_finish(), timeout)
+        except asyncio.TimeoutError:
+            # 끝나지 않은 작업은 running 상태로 남고, 임대가 만료되면 어느 워커든 다시 선점함
+            for task in list(self._inflight):
+                task.cancel()
+            print(f"⚠️ 작업 큐 종료 시간 초과: {len(self._inflight)}개 작업 중단")
+
+    async def _run(self):
+        while not self._stopping:
+            self._wakeup.clear()
+            try:
+                await self._claim_and_spawn()
+            except Exception as e:
+                print(f"❌ 작업 큐 조회 실패: {e}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _claim_and_spawn(self) -> int:
+        free = self.concurrency - len(self._inflight)
+        if free <= 0:
+            return 0
+        now = datetime.utcnow()
+        claimable = self._claimable(now)
+        async with SessionLocal() as session:
+            ids = (await session.scalars(
+                select(TaskOutbox.id)
+                .where(claimable)
+                .order_by(TaskOutbox.id)
+                .limit(free)
+            )).all()
+            claimed = []
+            for task_id in ids:
+                # 다른 워커와 경쟁하므로 그사이 상태가 바뀌지 않았을 때만 선점
+                result = await session.execute(
+                    update(TaskOutbox)
+                    .where(TaskOutbox.id == task_id, claimable)
+                    .values(status="running", locked_at=now, attempts=TaskOutbox.attempts + 1)
+                )
+                if result.rowcount == 1:
+                    claimed.append(task_id)
+            await session.commit()
+            if not claimed:
+                return 0
+            rows = (await session.scalars(
+                select(TaskOutbox).where(TaskOutbox.id.in_(claimed))
+            )).all()
+
+        for row in rows:
+            task = asyncio.create_task(self._execute(row.id, row.task, row.payload, row.attempts, row.locked_at))
+            self._inflight.add(task)
+            task.add_done_callback(self._inflight.discard)
+        return len(rows)
+
+    async def _execute(self, task_id: int, name: str, payload: str, attempts: int, locked_at: datetime):
+        async with self._semaphore:
+            handler = _handlers.get(name)
+            # 선점한 임대 시각 (연장할 때마다 바뀜) - 마무리 쓰기는 이 값이 그대로일 때만 적용
+            lease = [locked_at]
+            done = asyncio.Event()
+            renewer = asyncio.create_task(self._renew(task_id, lease, done))
+            error = None
+            try:
+                if handler is None:
+                    raise LookupError(f"등록되지 않은 작업: {name}")
+                await handler(json.loads(payload))
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                error = e
+            finally:
+                done.set()
+            # 진행 중인 연장이 끝나야 lease가 DB 값과 같음
+            await renewer
+            if error is not None:
+                await self._record_failure(task_id, attempts, error, lease[0])
+                return
+            async with SessionLocal() as session:
+                result = await session.execute(
+                    delete(TaskOutbox).where(TaskOutbox.id == task_id, TaskOutbox.locked_at == lease[0])
+                )
+                await session.commit()
+            if result.rowcount != 1:
+                print(f"⚠️ 작업 {task_id}: 임대가 만료되어 다른 워커가 다시 선점함")
+
+    async def _renew(self, task_id: int, lease: list, done: asyncio.Event):
+        """작업이 끝날 때까지 임대를 연장 (오래 걸리는 작업을 다른 워커가 만료로 보고 다시 실행하지 않도록)"""
+        while not done.is_set():
+            try:
+                await asyncio.wait_for(done.wait(), self.lease_seconds / 3)
+                return
+            except asyncio.TimeoutError:
+                pass
+            now = datetime.utcnow()
+            try:
+                async with SessionLocal() as session:
+                    result = await session.execute(
+                        update(TaskOutbox).where(TaskOutbox.id == task_id, TaskOutbox.locked_at == lease[0])
+                        .values(locked_at=now)
+                    )
+                    await session.commit()
+            except Exception as e:
+                print(f"❌ 작업 {task_id} 임대 연장 실패: {e}")
+                continue
+            if result.rowcount != 1:
+                print(f"⚠️ 작업 {task_id}: 임대를 잃어 연장을 멈춤")
+                return
+            lease[0] = now
+
+    async def _record_failure(self, task_id: int, attempts: int, error: Exception, locked_at: datetime):
+        error_text = "".join(traceback.format_exception_only(type(error), error)).strip()
+        if attempts >= self.max_attempts:
+            values = {"status": "failed", "locked_at": None, "last_error": error_text}
+            print(f"❌ 작업 {task_id} 최종 실패: {error_text}")
+        else:
+            delay = self.retry_base * (2 ** (attempts - 1))
+            values = {
+                "status": "pending",
+                "locked_at": None,
+                "last_error": error_text,
+                "available_at": datetime.utcnow() + timedelta(seconds=delay),
+            }
+        async with SessionLocal() as session:
+            await session.execute(
+                update(TaskOutbox).where(TaskOutbox.id == task_id, TaskOutbox.locked_at == locked_at).values(**values)
+            )
+            await session.commit()
+
+    def _claimable(self, now: datetime):
+        """실행할 수 있는 행: 때가 된 대기 작업, 또는 임대가 만료된 실행 중 작업
+
+        비정상 종료되거나 종료 시간 초과로 중단된 워커의 작업은 running으로 남으므로
+        시작할 때만이 아니라 조회할 때마다 만료된 임대를 다시 선점함
+        """
+        expired = now - timedelta(seconds=self.lease_seconds)
+        return or_(
+            and_(TaskOutbox.status == "pending", TaskOutbox.available_at <= now),
+            and_(TaskOutbox.status == "running",
+                 or_(TaskOutbox.locked_at.is_(None), TaskOutbox.locked_at < expired)),
+        )
+
+
+queue = TaskQueue()
@@ -0,0 +1,50 @@
+"""공용 Jinja2 템플릿 인스턴스
+
+모든 라우터가 같은 Environment를 쓰도록 여기서 한 번만 만듭니다.
+렌더링 시간은 템플릿 이름별로 metrics에 기록됩니다. 공용 조각은
+`{% cache %}` 블록으로 캐시합니다 (app/fragments.py).
+
+목록 페이지는 `X-Fragment` 요청 헤더가 있으면 전체 레이아웃 대신 표와 페이지
+이동 부분만 응답합니다 (static/js/main.js가 제자리에서 교체).
+"""
+import time
+
+from fastapi.templating import Jinja2Templates
+
+from app import fonts, metrics
+from app.config import settings
+from app.fragments import FragmentCacheExtension, LocalFragmentStore
+
+
+class Templates(Jinja2Templates):
+    def TemplateResponse(self, name, context, *args, **kwargs):
+        start = time.perf_counter()
+        try:
+            return super().TemplateResponse(name, context, *args, **kwargs)
+        finally:
+            metrics.TEMPLATE_RENDER.labels(name).observe(time.perf_counter() - start)
+
+
+FRAGMENT_HEADER = "X-Fragment"
+
+
+def wants_fragment(request, name: str) -> bool:
+    return request.headers.get(FRAGMENT_HEADER) == name
+
+
+def page_or_fragment(request, page: str, fragment: str, name: str, context: dict):
+    """X-Fragment 헤더가 name이면 조각 템플릿, 아니면 전체 페이지를 렌더링"""
+    response = templates.TemplateResponse(fragment if wants_fragment(request, name) else page, context)
+    # 같은 URL의 두 가지 응답이 브라우저/프록시 캐시에서 섞이지 않도록
+    response.headers["Vary"] = FRAGMENT_HEADER
+    return response
+
+
+templates = Templates(directory="templates")
+templates.env.add_extension(FragmentCacheExtension)
+# 본문 글꼴 서브셋 (@font-face와 preload 링크, 없으면 None)
+templates.env.globals["web_fonts"] = fonts.web_fonts
+if settings.fragment_cache_enabled:
+    templates.env.fragment_cache = LocalFragmentStore(
+        settings.fragment_cache_max_entries, settings.fragment_cache_default_ttl_seconds
+    )
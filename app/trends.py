@@ -0,0 +1,287 @@
+"""월별 키워드 추이 (게시물 + 주요 뉴스)
+
+게시물과 뉴스를 id 순서로 일정 크기씩 읽어 프로세스 풀에서 토큰화·집계하고,
+결과를 `keyword_counts`(월, 키워드, 횟수)에 더합니다. 문서별 기여분은
+`keyword_docs`에 남겨 두어, 문서가 수정·삭제되면 이전 기여분을 빼고 새 기여분만
+더합니다. 이미 반영된 문서는 수정 시각이 같으면 다시 읽지 않으므로 `sync`는
+바뀐 문서만 처리합니다.
+
+게시물이 작성·수정·삭제되면 후처리 작업이 그 게시물 하나만 반영합니다. 뉴스는
+작성 화면이 없으므로 `sync`로 반영합니다. 분석 페이지는 집계된 표만 읽습니다.
+
+사용법:
+    python -m app.trends sync [--workers N]
+"""
+import asyncio
+import json
+import os
+import re
+import sys
+import unicodedata
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import select, delete, func
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import undefer
+
+from app import generations
+from app.cache import cache
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Post, News, KeywordCount, KeywordDoc, ArchivedPost
+from app.tasks import subscribe
+
+POST = "post"
+NEWS = "news"
+
+_WORD = re.compile(r"[가-힣]+|[a-z][a-z0-9+#]*")
+# 긴 조사·어미부터 떼어냄
+_SUFFIXES = sorted([
+    "에서는", "으로는", "에게서", "이라는", "입니다", "합니다", "했습니다", "됩니다",
+    "에서", "으로", "까지", "부터", "에게", "처럼", "보다", "이나", "라는", "하는", "하고",
+    "했다", "한다", "된다", "되는", "이다", "적인", "적으로",
+    "을", "를", "이", "가", "은", "는", "의", "에", "와", "과", "도", "로", "만", "한",
+], key=len, reverse=True)
+_STOPWORDS = {
+    "그리고", "그러나", "하지만", "또한", "이번", "통해", "대한", "위한", "관련", "있는", "있습니다",
+    "없는", "같은", "이후", "현재", "우리", "the", "and", "for", "with", "this", "that", "are",
+}
+MIN_LENGTH = 2
+
+# 문서 (source, id, month, stamp, 제목, 본문) -> (source, id, month, stamp, {키워드: 횟수})
+Doc = Tuple[str, int, str, str, str, str]
+Counted = Tuple[str, int, str, str, Dict[str, int]]
+
+
+def _stem(word: str) -> str:
+    if "가" <= word[0] <= "힣":
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_LENGTH:
+                return word[:-len(suffix)]
+    return word
+
+
+def keywords(text: str) -> Counter:
+    """어절에서 조사를 떼고 불용어·한 글자 단어를 뺀 키워드 빈도"""
+    text = unicodedata.normalize("NFKC", text).lower()
+    counts = Counter()
+    for word in _WORD.findall(text):
+        word = _stem(word)
+        if len(word) >= MIN_LENGTH and word not in _STOPWORDS:
+            counts[word] += 1
+    return counts
+
+
+def count_batch(docs: List[Doc]) -> List[Counted]:
+    """프로세스 풀에서 실행 - 문서 묶음을 토큰화해 문서별 키워드 빈도 반환"""
+    return [
+        (source, doc_id, month, stamp, dict(keywords(f"{title}\n{content}")) if content is not None else {})
+        for source, doc_id, month, stamp, title, content in docs
+    ]
+
+
+def _stamp(changed_at, published: bool) -> str:
+    return f"{changed_at.isoformat() if changed_at else ''}|{int(published)}"
+
+
+async def _batches(session: AsyncSession, known: Dict[Tuple[str, int], str], seen: set):
+    """바뀐 문서만 settings.trends_batch_size개씩 묶어 반환 (id 기준 키셋 페이지)"""
+    size = settings.trends_batch_size
+    sources = [
+        (POST, Post, lambda row: row.created_at, lambda row: row.is_published),
+        (NEWS, News, lambda row: row.published_at or row.created_at, lambda row: True),
+    ]
+    for source, model, month_of, published_of in sources:
+        last_id = 0
+        while True:
+            columns = [model.id, model.created_at, model.updated_at]
+            columns += [Post.is_published] if model is Post else [News.published_at]
+            rows = (await session.execute(
+                select(*columns).where(model.id > last_id).order_by(model.id).limit(size)
+            )).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            changed = []
+            for row in rows:
+                seen.add((source, row.id))
+                stamp = _stamp(row.updated_at or row.created_at, published_of(row))
+                if known.get((source, row.id)) != stamp:
+                    changed.append((row.id, month_of(row).strftime("%Y-%m"), stamp, published_of(row)))
+            if not changed:
+                continue
+            # 본문은 바뀐 문서만 읽음
+            result = await session.execute(
+                select(model.id, model.title, model.content).where(model.id.in_([c[0] for c in changed]))
+            )
+            texts = {doc_id: (title, content) for doc_id, title, content in result.all()}
+            yield [
+                (source, doc_id, month, stamp, *(texts[doc_id] if published else ("", None)))
+                for doc_id, month, stamp, published in changed
+            ]
+
+
+async def _apply(session: AsyncSession, counted: List[Counted], removed: List[Tuple[str, int]] = ()):
+    """문서별 새 기여분을 반영하고 이전 기여분을 뺀 뒤 커밋"""
+    deltas = Counter()
+    keys = [(source, doc_id) for source, doc_id, *_ in counted] + list(removed)
+    for source in {source for source, _ in keys}:
+        ids = [doc_id for s, doc_id in keys if s == source]
+        old = (await session.scalars(
+            select(KeywordDoc).where(KeywordDoc.source == source, KeywordDoc.doc_id.in_(ids))
+        )).all()
+        for doc in old:
+            for term, count in json.loads(doc.terms).items():
+                deltas[(doc.month, term)] -= count
+
+    table = KeywordDoc.__table__
+    for source, doc_id, month, stamp, terms in counted:
+        for term, count in terms.items():
+            deltas[(month, term)] += count
+        stmt = insert(table).values(source=source, doc_id=doc_id, month=month, stamp=stamp,
+                                    terms=json.dumps(terms, ensure_ascii=False))
+        await session.execute(stmt.on_conflict_do_update(
+            index_elements=[table.c.source, table.c.doc_id],
+            set_={"month": stmt.excluded.month, "stamp": stmt.excluded.stamp, "terms": stmt.excluded.terms},
+        ))
+    for source, doc_id in removed:
+        await session.execute(delete(KeywordDoc).where(KeywordDoc.source == source, KeywordDoc.doc_id == doc_id))
+
+    rows = [{"month": month, "term": term, "count": count} for (month, term), count in deltas.items() if count]
+    counts = KeywordCount.__table__
+    # SQLite 바인드 변수 한도를 넘지 않도록 나눠서 upsert
+    for start in range(0, len(rows), 1000):
+        stmt = insert(counts).values(rows[start:start + 1000])
+        await session.execute(stmt.on_conflict_do_update(
+            index_elements=[counts.c.month, counts.c.term],
+            set_={"count": counts.c.count + stmt.excluded.count},
+        ))
+    months = {month for month, _ in deltas}
+    if months:
+        await session.execute(delete(KeywordCount).where(KeywordCount.month.in_(months), KeywordCount.count <= 0))
+    await generations.bump(session, "keywords")
+    await session.commit()
+
+
+async def sync(session: AsyncSession, workers: Optional[int] = None) -> Tuple[int, int]:
+    """바뀐 문서를 프로세스 풀에서 다시 집계해 반영 (반영한 문서 수, 지운 문서 수)"""
+    known = {
+        (source, doc_id): stamp
+        for source, doc_id, stamp in (await session.execute(
+            select(KeywordDoc.source, KeywordDoc.doc_id, KeywordDoc.stamp)
+        )).all()
+    }
+    seen = set()
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    in_flight = deque()
+    updated = 0
+    # 부모의 이벤트 루프·DB 연결을 물려받지 않도록 spawn으로 시작
+    with ProcessPoolExecutor(max_workers=workers, mp_context=get_context("spawn")) as pool:
+        async for batch in _batches(session, known, seen):
+            in_flight.append(loop.run_in_executor(pool, count_batch, batch))
+            # 풀이 바쁜 동안 다음 묶음을 읽되, 결과가 쌓이지 않도록 대기 묶음 수를 제한
+            if len(in_flight) >= workers * 2:
+                counted = await in_flight.popleft()
+                await _apply(session, counted)
+                updated += len(counted)
+        while in_flight:
+            counted = await in_flight.popleft()
+            await _apply(session, counted)
+            updated += len(counted)
+
+    # 보관된 게시물은 수정되지 않으므로 기존 기여분을 그대로 둠
+    seen.update((POST, doc_id) for doc_id in (await session.scalars(select(ArchivedPost.id))).all())
+    removed = [key for key in known if key not in seen]
+    if removed:
+        await _apply(session, [], removed)
+    return updated, len(removed)
+
+
+async def update_doc(session: AsyncSession, source: str, doc_id: int):
+    """문서 하나만 반영 (후처리 작업용이라 프로세스 풀을 쓰지 않음)"""
+    model = Post if source == POST else News
+    row = await session.get(model, doc_id, populate_existing=True, options=[undefer(model.content)])
+    if row is None:
+        await _apply(session, [], [(source, doc_id)])
+        return
+    if source == POST:
+        changed_at, published, month_at = row.updated_at or row.created_at, row.is_published, row.created_at
+    else:
+        changed_at, published, month_at = row.updated_at or row.created_at, True, row.published_at or row.created_at
+    doc = (source, doc_id, month_at.strftime("%Y-%m"), _stamp(changed_at, published),
+           row.title, row.content if published else None)
+    await _apply(session, count_batch([doc]))
+
+
+async def compute(session: AsyncSession, months: int, top: int) -> dict:
+    recent = list(reversed((await session.scalars(
+        select(KeywordCount.month).distinct().order_by(KeywordCount.month.desc()).limit(months)
+    )).all()))
+    if not recent:
+        return {"months": [], "terms": []}
+    total = func.sum(KeywordCount.count).label("total")
+    leaders = (await session.execute(
+        select(KeywordCount.term, total)
+        .where(KeywordCount.month >= recent[0])
+        .group_by(KeywordCount.term)
+        .order_by(total.desc(), KeywordCount.term)
+        .limit(top)
+    )).all()
+    series = {term: dict.fromkeys(recent, 0) for term, _ in leaders}
+    result = await session.execute(
+        select(KeywordCount.term, KeywordCount.month, KeywordCount.count)
+        .where(KeywordCount.term.in_(list(series)), KeywordCount.month >= recent[0])
+    )
+    for term, month, count in result.all():
+        series[term][month] = count
+    peak = max((count for counts in series.values() for count in counts.values()), default=0)
+    return {
+        "months": recent,
+        "peak": peak,
+        "terms": [
+            {"term": term, "total": total, "counts": list(series[term].values())}
+            for term, total in leaders
+        ],
+    }
+
+
+async def keyword_trends(session: AsyncSession) -> dict:
+    """최근 몇 달의 상위 키워드와 월별 빈도 (keywords 세대가 바뀔 때까지 재사용)"""
+    generation = (await generations.current(session, "keywords"))["keywords"]
+    return await cache.get_or_set(
+        f"keyword_trends:{generation}",
+        lambda: compute(session, settings.trends_months, settings.trends_top_terms),
+    )
+
+
+@subscribe("post.changed")
+async def refresh_post_keywords(payload: dict):
+    async with SessionLocal() as session:
+        await update_doc(session, POST, payload["post_id"])
+
+
+async def _main(argv: List[str]):
+    import argparse
+    import time
+    from app.database import create_tables
+
+    parser = argparse.ArgumentParser(prog="python -m app.trends")
+    sub = parser.add_subparsers(dest="command", required=True)
+    sync_parser = sub.add_parser("sync", help="바뀐 게시물·뉴스의 키워드 빈도를 월별 표에 반영")
+    sync_parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    args = parser.parse_args(argv)
+
+    await create_tables()
+    started = time.perf_counter()
+    async with SessionLocal() as session:
+        updated, removed = await sync(session, args.workers)
+    print(f"✅ 키워드 추이 반영 완료: {updated:,}개 문서 갱신, {removed:,}개 삭제 ({time.perf_counter() - started:.1f}초)")
+
+
+if __name__ == "__main__":
+    asyncio.run(_main(sys.argv[1:]))
@@ -0,0 +1,129 @@
+"""워커 시작 시 워밍업
+
+배포나 워커 재시작 직후의 첫 요청은 템플릿 컴파일, SQLAlchemy 문 컴파일, 디스크에서
+SQLite 페이지 읽기 비용을 모두 치릅니다. 여기서는 `lifespan` 시작 단계에서 그 비용을
+미리 치릅니다.
+
+1. templates - 모든 템플릿을 컴파일해 Jinja 환경 캐시에 넣음
+2. data - 카테고리 등 참조 데이터와 최근 게시물 작업 집합을 읽어 DB 페이지를 캐시에 올림
+3. routes - 자주 쓰는 읽기 전용 페이지를 앱 안에서(ASGI로) 직접 요청해 각 라우터의
+   질의 컴파일 캐시, 공유 캐시, 조각 캐시를 채움 (요청 지표에는 함께 기록됨)
+
+`WARMUP_WAIT_SECONDS` 안에 끝나지 않으면 나머지는 배경에서 계속하고, 끝날 때까지
+헬스 체크 주소 `/healthz`만 503을 응답합니다 (일반 페이지는 그대로 처리).
+"""
+import asyncio
+import time
+from typing import Dict, Optional
+
+import httpx
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+
+from app import metrics
+from app.config import settings
+from app.database import SessionLocal
+from app.models import Category, Post
+from app.templating import templates
+
+# 미리 요청하는 읽기 전용 페이지 (조회수를 올리는 상세 보기와 로그인이 필요한 관리자 페이지 제외)
+PATHS = (
+    "/board/",
+    "/board/?page=2",
+    "/dashboard/",
+    "/dashboard/analytics",
+    "/dashboard/research",
+    "/data-provision",
+    "/feeds/posts.rss",
+    "/feeds/news.rss",
+    "/sitemap.xml",
+    "/about",
+    "/education",
+)
+
+
+class Warmup:
+    def __init__(self, wait: float = settings.warmup_wait_seconds,
+                 recent_posts: int = settings.warmup_recent_posts):
+        self.wait = wait
+        self.recent_posts = recent_posts
+        self.ready = False
+        self.timings: Dict[str, float] = {}
+        self._runner: Optional[asyncio.Task] = None
+
+    async def start(self, app):
+        """워밍업을 시작하고 최대 wait초 동안 기다림 (넘으면 배경에서 계속)"""
+        if not settings.warmup_enabled:
+            self.ready = True
+            return
+        self.ready = False
+        self._runner = asyncio.create_task(self.run(app))
+        done, _ = await asyncio.wait({self._runner}, timeout=self.wait)
+        if not done:
+            print(f"⏳ 워밍업이 {self.wait:g}초를 넘어 배경에서 계속합니다")
+
+    async def stop(self):
+        if self._runner is None:
+            return
+        self._runner.cancel()
+        try:
+            await self._runner
+        except asyncio.CancelledError:
+            pass
+        self._runner = None
+
+    async def run(self, app) -> Dict[str, float]:
+        started = time.perf_counter()
+        try:
+            await self._stage("templates", self.compile_templates)
+            await self._stage("data", self.load_working_set)
+            await self._stage("routes", lambda: self.request_pages(app))
+        finally:
+            # 실패해도 헬스 체크를 계속 막지는 않음
+            self.ready = True
+        total = time.perf_counter() - started
+        stages = ", ".join(f"{name} {seconds:.2f}초" for name, seconds in self.timings.items())
+        print(f"✅ 워밍업 완료: {total:.2f}초 ({stages})")
+        return self.timings
+
+    async def _stage(self, name: str, func):
+        started = time.perf_counter()
+        try:
+            await func()
+        except Exception as e:
+            print(f"❌ 워밍업 {name} 단계 실패: {e}")
+        finally:
+            seconds = time.perf_counter() - started
+            self.timings[name] = seconds
+            metrics.WARMUP_DURATION.labels(name).observe(seconds)
+
+    async def compile_templates(self):
+        for name in templates.env.list_templates(extensions=["html"]):
+            templates.env.get_template(name)
+            # 컴파일은 CPU 작업이므로 템플릿마다 이벤트 루프에 양보
+            await asyncio.sleep(0)
+
+    async def load_working_set(self):
+        async with SessionLocal() as session:
+            await session.execute(select(Category).order_by(Category.name))
+            # 최근 게시물과 작성자·카테고리 (목록·대시보드·피드가 읽는 행)
+            await session.execute(
+                select(Post).options(joinedload(Post.author), joinedload(Post.category))
+                .order_by(Post.created_at.desc()).limit(self.recent_posts)
+            )
+            # 건수 질의가 훑는 인덱스 페이지
+            await session.scalar(select(func.count(Post.id)))
+
+    async def request_pages(self, app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://warmup") as client:
+            for path in PATHS:
+                try:
+                    response = await client.get(path)
+                    if response.status_code != 200:
+                        print(f"❌ 워밍업 요청 {path}: {response.status_code}")
+                except Exception as e:
+                    print(f"❌ 워밍업 요청 {path} 실패: {e!r}")
+
+
+warmup = Warmup()
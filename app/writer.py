@@ -0,0 +1,158 @@
+"""SQLite 쓰기 전담 작업과 그룹 커밋
+
+쓰기 라우트는 자기 트랜잭션을 여는 대신 `writer.submit(op)`으로 쓰기 함수를
+넘깁니다. 워커마다 하나인 쓰기 작업이 대기 중인 함수를 모아 한 트랜잭션에서
+차례로 실행하고 한 번만 커밋합니다. 함수마다 SAVEPOINT를 두므로 한 함수의
+예외는 그 함수의 변경만 되돌리고 호출한 쪽에 그대로 전달되며, 나머지는 함께
+커밋됩니다.
+
+    async def create(session):
+        post = Post(title=title, content=content, author_id=1)
+        session.add(post)
+        await session.flush()
+        return post.id
+
+    post_id = await writer.submit(create)
+
+쓰기 연결은 `BEGIN IMMEDIATE`로 트랜잭션을 시작해 쓰기 잠금을 처음부터 잡습니다.
+읽던 트랜잭션이 쓰기로 올라가다 잠금 경합으로 곧바로 실패하는 대신, 다른
+워커의 커밋이 끝날 때까지 busy timeout 동안 기다립니다. 쓰기 작업이 시작되지
+않은 환경(스크립트 등)에서는 함수를 각자의 트랜잭션에서 바로 실행합니다.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app import compression, metrics
+from app.config import settings
+from app.database import use_wal
+
+WriteOp = Callable[[AsyncSession], Awaitable[Any]]
+
+write_engine = create_async_engine(
+    settings.database_url,
+    connect_args={"timeout": settings.write_busy_timeout_seconds},
+)
+compression.install(write_engine)
+use_wal(write_engine)
+
+
+# pysqlite/aiosqlite의 암묵적 BEGIN을 끄고 직접 BEGIN IMMEDIATE를 보냄 (SAVEPOINT도 정상 동작)
+@event.listens_for(write_engine.sync_engine, "connect")
+def _disable_implicit_begin(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+
+@event.listens_for(write_engine.sync_engine, "begin")
+def _begin_immediate(conn):
+    conn.exec_driver_sql("BEGIN IMMEDIATE")
+
+
+WriteSession = async_sessionmaker(write_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+class WriteQueue:
+    def __init__(
+        self,
+        max_batch: int = settings.write_max_batch,
+        batch_window: float = settings.write_batch_window_seconds,
+    ):
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._queue: Optional[asyncio.Queue] = None
+        self._runner: Optional[asyncio.Task] = None
+
+    async def submit(self, op: WriteOp) -> Any:
+        """op(session)을 쓰기 트랜잭션에서 실행하고 커밋된 뒤 결과를 반환"""
+        if self._runner is None:
+            async with WriteSession() as session:
+                result = await op(session)
+                await session.commit()
+                return result
+        future = asyncio.get_running_loop().create_future()
+        self._queue.put_nowait((op, future, time.perf_counter()))
+        return await future
+
+    async def start(self):
+        if self._runner is not None:
+            return
+        self._queue = asyncio.Queue()
+        self._runner = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """이미 받은 쓰기를 모두 처리한 뒤 종료"""
+        if self._runner is None:
+            return
+        self._queue.put_nowait(None)
+        await self._runner
+        self._runner = None
+        await write_engine.dispose()
+
+    async def _run(self):
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                return
+            batch, stopping = await self._collect(item)
+            try:
+                await self._execute(batch)
+            except Exception as e:
+                print(f"❌ 쓰기 묶음 처리 실패: {e}")
+            if stopping:
+                return
+
+    async def _collect(self, first) -> Tuple[List[tuple], bool]:
+        """첫 쓰기 이후 이미 쌓였거나 batch_window 안에 들어온 쓰기를 max_batch까지 모음"""
+        batch = [first]
+        deadline = time.perf_counter() + self.batch_window
+        while len(batch) < self.max_batch:
+            try:
+                item = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - time.perf_counter()
+                if remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    async def _execute(self, batch: List[tuple]):
+        # 기다리다 취소된 요청의 쓰기는 실행하지 않음
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+        metrics.WRITE_BATCH_SIZE.observe(len(batch))
+        results = []
+        try:
+            async with WriteSession() as session:
+                for op, future, _ in batch:
+                    try:
+                        async with session.begin_nested():
+                            results.append((future, True, await op(session)))
+                    except Exception as e:
+                        results.append((future, False, e))
+                await session.commit()
+        except Exception as e:
+            # 커밋 실패는 묶음 전체의 실패
+            results = [(future, False, e) for _, future, _ in batch]
+
+        now = time.perf_counter()
+        for (future, ok, value), (_, _, submitted) in zip(results, batch):
+            metrics.WRITE_LATENCY.observe(now - submitted)
+            if future.done():
+                continue
+            if ok:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+writer = WriteQueue()
@@ -0,0 +1,167 @@
+"""게시물 수정 이력 저장 공간과 복원 시간
+
+본문 하나를 여러 번 조금씩 고치면서(줄 바꾸기·끼워 넣기·지우기) `app.revisions`로
+기록하고, 전체 사본 주기마다 다음을 비교합니다.
+
+- 이력 테이블에 실제로 저장된 바이트 vs 모든 판을 통째로 둘 때(압축 없음/본문 압축)
+- 임의의 판 하나를 복원하는 시간, 두 판을 비교(diff)하는 시간
+
+    python benchmarks/revision_storage.py [--lines 200] [--edits 200] [--intervals 1,5,10,20,50]
+
+복원한 모든 판이 기록할 때의 본문과 같은지도 확인합니다. 주기 1은 모든 판을 전체
+사본으로 두는 경우라 기준선입니다.
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORDS = ("데이터 분석 연구 인문 사회 과학 방법론 통계 모델 텍스트 마이닝 네트워크 설문 조사 "
+         "결과 해석 표본 변수 회귀 검증 자료 수집 코딩 시각화 보고서").split()
+
+
+def _setup_env(db_path: str):
+    # 설정은 import 시점에 읽히므로 앱 모듈보다 먼저 지정
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ.setdefault("CACHE_PATH", db_path + ".cache")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import logging
+    logging.disable(logging.WARNING)
+
+
+def _line(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(4, 20))) + ".\n"
+
+
+def _edit(rng: random.Random, lines: list) -> list:
+    """한두 곳을 바꾸는 작은 수정"""
+    lines = list(lines)
+    for _ in range(rng.randint(1, 2)):
+        kind = rng.random()
+        at = rng.randrange(len(lines))
+        if kind < 0.5:
+            lines[at] = _line(rng)
+        elif kind < 0.8 or len(lines) < 10:
+            lines.insert(at, _line(rng))
+        else:
+            del lines[at]
+    return lines
+
+
+def _percentile(values, q):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+async def _measure(interval: int, lines_count: int, edits: int, seed: int) -> dict:
+    from sqlalchemy import LargeBinary, cast, func, select
+    from sqlalchemy.orm import undefer
+    from app import revisions
+    from app.compression import compress
+    from app.database import SessionLocal
+    from app.models import Post, PostRevision
+
+    rng = random.Random(seed)
+    lines = [_line(rng) for _ in range(lines_count)]
+    versions = ["".join(lines)]
+    async with SessionLocal() as session:
+        post = Post(title="수정 이력 벤치마크", content=versions[0], author_id=1)
+        session.add(post)
+        await session.commit()
+        post_id = post.id
+
+    record_seconds = 0.0
+    for _ in range(edits):
+        lines = _edit(rng, lines)
+        content = "".join(lines)
+        async with SessionLocal() as session:
+            post = await session.get(Post, post_id, options=[undefer(Post.content)])
+            started = time.perf_counter()
+            await revisions.record_edit(session, post, post.title, content, interval=interval)
+            record_seconds += time.perf_counter() - started
+            post.content = content
+            await session.commit()
+        versions.append(content)
+
+    async with SessionLocal() as session:
+        stored, snapshots = (await session.execute(
+            select(func.sum(func.length(cast(PostRevision.data, LargeBinary))),
+                   func.count().filter(PostRevision.is_snapshot == True))
+            .where(PostRevision.post_id == post_id)
+        )).one()
+
+    get_times, diff_times = [], []
+    for number, expected in enumerate(versions, start=1):
+        async with SessionLocal() as session:
+            started = time.perf_counter()
+            revision = await revisions.get_revision(session, post_id, number)
+            get_times.append(time.perf_counter() - started)
+        assert revision is not None and revision.content == expected, f"{number}판 복원 결과가 다름"
+    for _ in range(50):
+        old, new = sorted(rng.sample(range(1, len(versions) + 1), 2))
+        async with SessionLocal() as session:
+            started = time.perf_counter()
+            await revisions.diff(session, post_id, old, new)
+            diff_times.append(time.perf_counter() - started)
+
+    full = sum(len(version.encode("utf-8")) for version in versions)
+    packed = sum(len(value if isinstance(value, bytes) else value.encode("utf-8"))
+                 for value in map(compress, versions))
+    return {
+        "interval": interval,
+        "revisions": len(versions),
+        "snapshots": snapshots,
+        "stored": stored,
+        "full": full,
+        "packed": packed,
+        "record_ms": record_seconds / edits * 1000,
+        "get_ms": sum(get_times) / len(get_times) * 1000,
+        "get_p99_ms": _percentile(get_times, 0.99) * 1000,
+        "diff_ms": sum(diff_times) / len(diff_times) * 1000,
+    }
+
+
+async def _run(args) -> list:
+    from app.database import create_tables, engine
+
+    engine.echo = False
+    await create_tables()
+    results = []
+    for interval in args.intervals:
+        results.append(await _measure(interval, args.lines, args.edits, args.seed))
+    await engine.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="게시물 수정 이력 저장 공간과 복원 시간")
+    parser.add_argument("--lines", type=int, default=200, help="본문 줄 수")
+    parser.add_argument("--edits", type=int, default=200, help="수정 횟수")
+    parser.add_argument("--intervals", default="1,5,10,20,50", help="비교할 전체 사본 주기 (쉼표로 구분)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+    args.intervals = [int(value) for value in args.intervals.split(",")]
+
+    with tempfile.TemporaryDirectory(prefix="hssdi-bench-") as tmp:
+        _setup_env(os.path.join(tmp, "bench.db"))
+        results = asyncio.run(_run(args))
+
+    first = results[0]
+    print(f"본문 {args.lines}줄, 수정 {args.edits}회 ({first['revisions']}판), "
+          f"전체 사본 {first['full']:,}바이트 / 본문 압축 사본 {first['packed']:,}바이트")
+    print(f"{'주기':>4} {'사본':>5} {'저장(바이트)':>13} {'전체 대비':>9} {'압축 대비':>9} "
+          f"{'기록(ms)':>9} {'복원(ms)':>9} {'p99(ms)':>8} {'diff(ms)':>9}")
+    for result in results:
+        print(f"{result['interval']:>4} {result['snapshots']:>5} {result['stored']:>13,} "
+              f"{result['stored'] / result['full']:>9.1%} {result['stored'] / result['packed']:>9.1%} "
+              f"{result['record_ms']:>9.2f} {result['get_ms']:>9.2f} {result['get_p99_ms']:>8.2f} "
+              f"{result['diff_ms']:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""SQLite 쓰기 처리량 비교: 요청마다 트랜잭션 vs 쓰기 전담 작업(그룹 커밋)
+
+gunicorn 워커처럼 프로세스 여러 개가 같은 DB 파일에 동시에 쓰기를 보냅니다.
+쓰기 하나는 게시물 작성(INSERT + outbox)과 조회수 증가(읽은 뒤 UPDATE)를 번갈아
+실행하며, 두 방식에 같은 쓰기 함수를 씁니다.
+
+    python benchmarks/write_throughput.py [--workers 4] [--concurrency 16] [--seconds 5]
+
+direct는 예전 라우트처럼 요청마다 세션을 열어 커밋하고, grouped는 `writer.submit()`으로
+넘깁니다. 결과는 초당 커밋된 쓰기 수, 실패(database is locked 등) 수, 지연 시간입니다.
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from multiprocessing import get_context
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODES = ("direct", "grouped")
+
+
+def _setup_env(db_path: str):
+    # 설정은 import 시점에 읽히므로 앱 모듈보다 먼저 지정
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{db_path}"
+    os.environ.setdefault("CACHE_PATH", db_path + ".cache")
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    import logging
+    logging.disable(logging.WARNING)
+
+
+def _quiet(engine):
+    engine.echo = False
+
+
+async def _prepare(db_path: str):
+    _setup_env(db_path)
+    from app.database import engine, init_db
+
+    _quiet(engine)
+    await init_db()
+    await engine.dispose()
+
+
+def _operations():
+    from sqlalchemy import select
+    from app.models import Post
+    from app.tasks import enqueue
+
+    async def create(session):
+        post = Post(title="벤치마크", content="쓰기 처리량 측정", author_id=1)
+        session.add(post)
+        await session.flush()
+        enqueue(session, "post.changed", post_id=post.id, category_id=None, action="created")
+        return post.id
+
+    async def view(session):
+        post = await session.scalar(select(Post).order_by(Post.id.desc()).limit(1))
+        if post is not None:
+            post.views += 1
+
+    return create, view
+
+
+async def _worker(mode: str, db_path: str, concurrency: int, seconds: float):
+    _setup_env(db_path)
+    from app.database import SessionLocal, engine
+    from app.writer import writer, write_engine
+
+    _quiet(engine)
+    _quiet(write_engine)
+    create, view = _operations()
+
+    async def direct(op):
+        async with SessionLocal() as session:
+            await op(session)
+            await session.commit()
+
+    submit = writer.submit if mode == "grouped" else direct
+    if mode == "grouped":
+        await writer.start()
+
+    done, errors, latencies = 0, 0, []
+    deadline = time.perf_counter() + seconds
+
+    async def client(index: int):
+        nonlocal done, errors
+        turn = index
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                await submit(create if turn % 2 == 0 else view)
+                done += 1
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                errors += 1
+            turn += 1
+
+    await asyncio.gather(*(client(i) for i in range(concurrency)))
+    if mode == "grouped":
+        await writer.stop()
+    await engine.dispose()
+    return done, errors, latencies
+
+
+def _run_prepare(db_path: str):
+    asyncio.run(_prepare(db_path))
+
+
+def _run_worker(args):
+    return asyncio.run(_worker(*args))
+
+
+def _percentile(values, q):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))]
+
+
+def run(mode: str, workers: int, concurrency: int, seconds: float) -> dict:
+    with tempfile.TemporaryDirectory(prefix="hssdi-bench-") as tmp:
+        db_path = os.path.join(tmp, "bench.db")
+        with get_context("spawn").Pool(workers) as pool:
+            # 앱 설정은 프로세스마다 한 번 읽히므로 DB 준비도 자식 프로세스에서
+            pool.apply(_run_prepare, (db_path,))
+            started = time.perf_counter()
+            results = pool.map(_run_worker, [(mode, db_path, concurrency, seconds)] * workers)
+        elapsed = time.perf_counter() - started
+    latencies = [value for _, _, values in results for value in values]
+    done = sum(result[0] for result in results)
+    return {
+        "mode": mode,
+        "writes": done,
+        "errors": sum(result[1] for result in results),
+        "per_second": done / seconds,
+        "p50_ms": _percentile(latencies, 0.5) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "elapsed": elapsed,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="SQLite 쓰기 처리량 비교")
+    parser.add_argument("--workers", type=int, default=4, help="프로세스 수 (gunicorn 워커)")
+    parser.add_argument("--concurrency", type=int, default=16, help="워커당 동시 쓰기 수")
+    parser.add_argument("--seconds", type=float, default=5.0, help="방식별 측정 시간")
+    parser.add_argument("--mode", choices=MODES + ("both",), default="both")
+    args = parser.parse_args()
+
+    modes = MODES if args.mode == "both" else (args.mode,)
+    print(f"워커 {args.workers}개 x 동시 쓰기 {args.concurrency}개, {args.seconds:g}초")
+    print(f"{'방식':<8} {'쓰기/초':>10} {'성공':>8} {'실패':>6} {'p50(ms)':>9} {'p99(ms)':>9}")
+    for mode in modes:
+        result = run(mode, args.workers, args.concurrency, args.seconds)
+        print(f"{result['mode']:<8} {result['per_second']:>10.1f} {result['writes']:>8} "
+              f"{result['errors']:>6} {result['p50_ms']:>9.1f} {result['p99_ms']:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,4 +13,12 @@ pip install -r requirements.txt
 # The script is idempotent and safe to run on every build.
 # It will create tables if they don't exist and won't duplicate data.
 echo "Initializing database..."
-python init_db.py
\ No newline at end of file
+python init_db.py
+
+# 본문 글꼴 서브셋의 원본 (가변 글꼴). 서브셋은 워커가 시작할 때 FONT_DIR에 만듦
+if [ ! -f "fonts/NotoSansKR[wght].ttf" ]; then
+  echo "Downloading Noto Sans KR..."
+  mkdir -p fonts
+  curl -fsSL -o "fonts/NotoSansKR[wght].ttf" "https://github.com/google/fonts/raw/main/ofl/notosanskr/NotoSansKR%5Bwght%5D.ttf" \
+    || { rm -f "fonts/NotoSansKR[wght].ttf"; echo "글꼴을 받지 못했습니다 (Google Fonts로 대체)"; }
+fi
@@ -0,0 +1,25 @@
+"""gunicorn 설정 (render.yaml의 startCommand에서 사용)
+
+워커들이 Prometheus 지표를 파일로 공유하도록 PROMETHEUS_MULTIPROC_DIR를
+워커가 앱을 import하기 전에 설정합니다.
+"""
+import os
+import shutil
+
+os.environ.setdefault("PROMETHEUS_MULTIPROC_DIR", "/tmp/hssdi-metrics")
+
+workers = int(os.environ.get("WEB_CONCURRENCY", 4))
+worker_class = "uvicorn.workers.UvicornWorker"
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+
+def on_starting(server):
+    # 이전 실행의 지표 파일이 섞이지 않도록 시작할 때 비움
+    path = os.environ["PROMETHEUS_MULTIPROC_DIR"]
+    shutil.rmtree(path, ignore_errors=True)
+    os.makedirs(path, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
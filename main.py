@@ -1,14 +1,25 @@
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, Depends, Form, HTTPException
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse, RedirectResponse
+from fastapi.responses import HTMLResponse, RedirectResponse, Response
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.middleware.sessions import SessionMiddleware
 import os
 
 from app.database import get_session, init_db
-from app.routers import admin, dashboard, board
+from app.templating import templates
+from app.routers import admin, dashboard, board, attachments, datasets, feeds, sitemap
+from app.tasks import queue as task_queue
+from app.ranking import ranking
+from app.cache import cache
+from app.suggest import suggestions
+from app.writer import writer
+from app.backup import scheduler as backup_scheduler
+from app.warmup import warmup
+from app.config import settings
+from app import fonts, metrics
+from app.admission import AdmissionMiddleware
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -20,8 +31,30 @@ async def lifespan(app: FastAPI):
         print(f"❌ 데이터베이스 초기화 실패: {e}")
         # 개발 환경에서는 에러를 발생시키지 않고 계속 진행
 
+    await task_queue.start()
+    await writer.start()
+    await ranking.start()
+    await suggestions.start()
+    await backup_scheduler.start()
+    loop_monitor = metrics.start_loop_monitor(settings.metrics_loop_lag_interval_seconds)
+    # 첫 요청이 템플릿·질의 컴파일과 차가운 DB 페이지 비용을 치르지 않도록
+    await warmup.start(app)
+    # 글꼴 서브셋이 없거나 오래됐으면 배경에서 다시 만듦
+    font_refresh = await fonts.start_refresh()
+
     yield
-    # 종료 시 (정리 작업이 있다면 여기에)
+    # 종료 시 - 남은 후처리 작업 실행
+    await warmup.stop()
+    if font_refresh is not None:
+        font_refresh.cancel()
+    loop_monitor.cancel()
+    await backup_scheduler.stop()
+    await suggestions.stop()
+    await ranking.stop()
+    # 받은 쓰기를 모두 커밋한 뒤 후처리 작업 정리
+    await writer.stop()
+    await task_queue.drain()
+    await cache.close()
 
 app = FastAPI(
     title="인문·사회과학 데이터 연구소 (HSSDI)",
@@ -35,11 +68,18 @@ app = FastAPI(
 # 세션 미들웨어 추가
 app.add_middleware(SessionMiddleware, secret_key="hssdi-admin-secret-key-2025")
 
+# 요청 수용 제어 (포화 시 대기열 기한 후 503)
+app.add_middleware(AdmissionMiddleware)
+
+# 요청 지표 미들웨어 (가장 바깥에서 전체 처리 시간 측정)
+app.add_middleware(metrics.MetricsMiddleware)
+
 # Static files
+# 글꼴 서브셋은 별도 디렉터리에서 immutable 캐시로 제공 (/static보다 먼저 등록)
+os.makedirs(settings.font_dir, exist_ok=True)
+app.mount("/static/fonts", fonts.FontFiles(directory=settings.font_dir), name="fonts")
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
-# Templates
-templates = Jinja2Templates(directory="templates")
 
 # 관리자 인증 함수
 def check_admin_session(request: Request):
@@ -84,10 +124,29 @@ async def admin_logout(request: Request):
     request.session.clear()
     return RedirectResponse(url="/admin/login", status_code=303)
 
+# Prometheus 지표 (같은 호스트의 수집기만 접근)
+@app.get("/metrics", include_in_schema=False)
+async def metrics_endpoint(request: Request):
+    if not metrics.is_local(request.client.host if request.client else None):
+        raise HTTPException(status_code=404)
+    body, content_type = await run_in_threadpool(metrics.render)
+    return Response(content=body, media_type=content_type)
+
+# 헬스 체크 (워밍업이 끝나기 전에는 503이라 배포 중 새 워커로 트래픽이 넘어가지 않음)
+@app.get("/healthz", include_in_schema=False)
+async def healthz():
+    if not warmup.ready:
+        return Response(status_code=503, headers={"Retry-After": "1"})
+    return Response("ok", media_type="text/plain")
+
 # Include routers
 app.include_router(admin.router, prefix="/admin", tags=["admin"])
 app.include_router(dashboard.router, prefix="/dashboard", tags=["dashboard"])
+app.include_router(attachments.router, prefix="/board", tags=["board"])
 app.include_router(board.router, prefix="/board", tags=["board"])
+app.include_router(datasets.router, prefix="/data-provision", tags=["datasets"])
+app.include_router(feeds.router, prefix="/feeds", tags=["feeds"])
+app.include_router(sitemap.router, tags=["sitemap"])
 
 # Simple admin interface instead of complex CRUDAdmin
 @app.get("/crudadmin", response_class=HTMLResponse)
@@ -100,7 +159,7 @@ async def admin_interface(
         return RedirectResponse(url="/admin/login", status_code=303)
     from sqlalchemy import select, func
     from app.models import Post, Category, User
-    from sqlalchemy.orm import selectinload
+    from sqlalchemy.orm import joinedload
 
     # 통계 데이터 조회
     posts_count = await session.scalar(select(func.count(Post.id)))
@@ -110,8 +169,8 @@ async def admin_interface(
     # 최근 게시물
     recent_posts_result = await session.execute(
         select(Post).options(
-            selectinload(Post.author),
-            selectinload(Post.category)
+            joinedload(Post.author),
+            joinedload(Post.category)
         ).order_by(Post.created_at.desc()).limit(5)
     )
     recent_posts = recent_posts_result.scalars().all()
@@ -137,8 +196,20 @@ async def education(request: Request):
     return templates.TemplateResponse("education.html", {"request": request})
 
 @app.get("/data-provision", response_class=HTMLResponse)
-async def data_provision(request: Request):
-    return templates.TemplateResponse("data_provision.html", {"request": request})
+async def data_provision(
+    request: Request,
+    session: AsyncSession = Depends(get_session)
+):
+    from sqlalchemy import select
+    from app.models import Dataset
+
+    datasets_result = await session.execute(select(Dataset).order_by(Dataset.title))
+    datasets = datasets_result.scalars().all()
+
+    return templates.TemplateResponse("data_provision.html", {
+        "request": request,
+        "datasets": datasets
+    })
 
 if __name__ == "__main__":
     import uvicorn
@@ -63,6 +63,10 @@ function enhanceSearch() {
     const searchForm = document.querySelector('form[method="GET"]');
     const searchInput = document.querySelector('input[name="search"]');
 
+    if (searchInput && searchInput.dataset.suggest !== undefined) {
+        enableSuggestions(searchInput);
+    }
+
     if (searchInput) {
         // 검색어 하이라이트
         searchInput.addEventListener('input', function() {
@@ -74,6 +78,88 @@ function enhanceSearch() {
     }
 }
 
+// 검색어 자동 완성 - 입력이 멈추면 /board/suggest에서 제목·카테고리 제안을 받아 표시
+function enableSuggestions(input) {
+    const list = document.createElement('ul');
+    list.className = 'suggestions';
+    list.setAttribute('role', 'listbox');
+    list.hidden = true;
+    input.setAttribute('autocomplete', 'off');
+    input.parentNode.style.position = 'relative';
+    input.parentNode.appendChild(list);
+
+    let items = [];
+    let active = -1;
+    let controller = null;
+
+    function hide() {
+        list.hidden = true;
+        active = -1;
+    }
+
+    function render() {
+        list.innerHTML = '';
+        items.forEach((item, index) => {
+            const li = document.createElement('li');
+            li.setAttribute('role', 'option');
+            li.className = index === active ? 'active' : '';
+            const label = document.createElement('span');
+            label.textContent = item.label;
+            const type = document.createElement('span');
+            type.className = 'suggestion-type';
+            type.textContent = item.type === 'category' ? '카테고리' : '게시물';
+            li.append(label, type);
+            // blur보다 먼저 처리되도록 mousedown 사용
+            li.addEventListener('mousedown', e => {
+                e.preventDefault();
+                window.location.href = item.url;
+            });
+            list.appendChild(li);
+        });
+        list.hidden = items.length === 0;
+    }
+
+    const request = Utils.debounce(function(query) {
+        if (controller) controller.abort();
+        if (!query.trim()) {
+            items = [];
+            hide();
+            return;
+        }
+        controller = new AbortController();
+        fetch('/board/suggest?q=' + encodeURIComponent(query), { signal: controller.signal })
+            .then(response => response.ok ? response.json() : { items: [] })
+            .then(data => {
+                // 응답이 오는 사이 입력이 바뀌었으면 버림
+                if (data.query !== input.value) return;
+                items = data.items || [];
+                active = -1;
+                render();
+            })
+            .catch(() => {});
+    }, 120);
+
+    input.addEventListener('input', () => request(input.value));
+    input.addEventListener('keydown', e => {
+        if (list.hidden) return;
+        if (e.key === 'ArrowDown' || e.key === 'ArrowUp') {
+            e.preventDefault();
+            // 마지막 다음은 '선택 없음'(입력창)으로 돌아감
+            const count = items.length + 1;
+            const current = active < 0 ? items.length : active;
+            const next = (current + (e.key === 'ArrowDown' ? 1 : -1) + count) % count;
+            active = next === items.length ? -1 : next;
+            render();
+        } else if (e.key === 'Enter' && active >= 0) {
+            e.preventDefault();
+            window.location.href = items[active].url;
+        } else if (e.key === 'Escape') {
+            hide();
+        }
+    });
+    input.addEventListener('blur', hide);
+}
+
 // 검색어 하이라이트 함수
 function highlightSearchTerms(query) {
     const textElements = document.querySelectorAll('td, p, h1, h2, h3, h4');
@@ -139,9 +225,9 @@ function clearFieldError(field) {
     }
 }
 
-// 테이블 정렬 기능
-function makeTablesSortable() {
-    const tables = document.querySelectorAll('.table');
+// 테이블 정렬 기능 (서버에서 정렬·페이지를 나누는 data-server-sort 표는 제외)
+function makeTablesSortable(root = document) {
+    const tables = root.querySelectorAll('.table:not([data-server-sort])');
 
     tables.forEach(table => {
         const headers = table.querySelectorAll('th');
@@ -191,8 +277,8 @@ function sortTable(table, columnIndex) {
 }
 
 // 반응형 테이블
-function makeTablesResponsive() {
-    const tables = document.querySelectorAll('.table');
+function makeTablesResponsive(root = document) {
+    const tables = root.querySelectorAll('.table');
 
     tables.forEach(table => {
         const wrapper = document.createElement('div');
@@ -296,12 +382,115 @@ document.addEventListener('DOMContentLoaded', function() {
     document.head.appendChild(style);
 });
 
+// 페이지 조각 교체
+// data-fragment 영역 안의 data-fragment-link 링크는 X-Fragment 헤더로 표와 페이지 이동
+// 부분만 받아 제자리에서 바꿉니다. 링크에 마우스를 올리거나 포커스하면, 그리고
+// 브라우저가 한가할 때 다음 페이지를 미리 받아 둡니다.
+const FragmentNav = {
+    cache: new Map(), // '조각 이름 URL' -> { time, promise }
+    maxEntries: 20,
+    maxAge: 30000,
+
+    fetch(url, name) {
+        const key = name + ' ' + url;
+        const hit = this.cache.get(key);
+        if (hit && Date.now() - hit.time < this.maxAge) {
+            return hit.promise;
+        }
+        const promise = fetch(url, {
+            headers: { 'X-Fragment': name },
+            credentials: 'same-origin'
+        }).then(response => {
+            // 로그인 페이지로 넘어가는 등 조각이 아닌 응답은 일반 이동으로 처리
+            if (!response.ok || response.redirected) {
+                throw new Error('fragment unavailable');
+            }
+            return response.text();
+        });
+        promise.catch(() => this.cache.delete(key));
+        this.cache.set(key, { time: Date.now(), promise });
+        if (this.cache.size > this.maxEntries) {
+            this.cache.delete(this.cache.keys().next().value);
+        }
+        return promise;
+    },
+
+    swap(container, url, push) {
+        container.setAttribute('aria-busy', 'true');
+        return this.fetch(url, container.dataset.fragment)
+            .then(html => {
+                container.innerHTML = html;
+                container.removeAttribute('aria-busy');
+                makeTablesSortable(container);
+                makeTablesResponsive(container);
+                if (push) {
+                    history.pushState({ fragment: container.id }, '', url);
+                }
+                this.prefetchNext(container);
+                return true;
+            })
+            .catch(() => {
+                window.location.href = url;
+                return false;
+            });
+    },
+
+    prefetch(link) {
+        const container = link.closest('[data-fragment]');
+        if (container) {
+            this.fetch(link.href, container.dataset.fragment).catch(() => {});
+        }
+    },
+
+    prefetchNext(container) {
+        const next = container.querySelector('a[rel="next"][data-fragment-link]');
+        if (!next) return;
+        const idle = window.requestIdleCallback || (callback => setTimeout(callback, 200));
+        idle(() => this.prefetch(next));
+    },
+
+    init() {
+        const containers = document.querySelectorAll('[data-fragment]');
+        if (!containers.length || !window.fetch || !window.history.pushState) return;
+
+        document.addEventListener('click', e => {
+            const link = e.target.closest('a[data-fragment-link]');
+            if (!link || e.button !== 0 || e.metaKey || e.ctrlKey || e.shiftKey || e.altKey) return;
+            const container = link.closest('[data-fragment]');
+            if (!container || !container.id) return;
+            e.preventDefault();
+            this.swap(container, link.href, true).then(swapped => {
+                if (swapped) container.scrollIntoView({ block: 'start', behavior: 'smooth' });
+            });
+        });
+
+        const prefetchTarget = e => {
+            const link = e.target.closest && e.target.closest('a[data-fragment-link]');
+            if (link) this.prefetch(link);
+        };
+        document.addEventListener('mouseover', prefetchTarget);
+        document.addEventListener('focusin', prefetchTarget);
+        document.addEventListener('touchstart', prefetchTarget, { passive: true });
+
+        // 뒤로/앞으로 이동 시 해당 주소의 조각으로 다시 교체
+        window.addEventListener('popstate', e => {
+            const id = e.state && e.state.fragment;
+            const container = id && document.getElementById(id);
+            if (container) this.swap(container, window.location.href, false);
+        });
+        history.replaceState({ fragment: containers[0].id }, '', window.location.href);
+
+        containers.forEach(container => this.prefetchNext(container));
+    }
+};
+
 // 초기화
 document.addEventListener('DOMContentLoaded', function() {
     enhanceSearch();
     enhanceFormValidation();
     makeTablesSortable();
     makeTablesResponsive();
+    FragmentNav.init();
 });
 
 // 유틸리티 함수들
@@ -336,6 +525,7 @@ const Utils = {
 // 전역으로 노출
 window.HSSDI = {
     Utils,
+    FragmentNav,
     showAlert,
     makeRequest,
     showLoading,
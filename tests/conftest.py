@@ -0,0 +1,143 @@
+import contextvars
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+# 설정은 import 시점에 읽히므로 앱을 불러오기 전에 임시 경로를 지정
+_TMP = tempfile.mkdtemp(prefix="hssdi-test-")
+DB_PATH = os.path.join(_TMP, "test.db")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{DB_PATH}"
+os.environ["UPLOAD_DIR"] = os.path.join(_TMP, "uploads")
+os.environ["DATASET_DIR"] = os.path.join(_TMP, "datasets")
+os.environ["SITEMAP_DIR"] = os.path.join(_TMP, "sitemaps")
+os.environ["CACHE_PATH"] = os.path.join(_TMP, "cache.db")
+os.environ["BACKUP_DIR"] = os.path.join(_TMP, "backups")
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+os.chdir(ROOT)
+
+from fastapi.testclient import TestClient  # noqa: E402
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from app.database import engine  # noqa: E402
+from app.writer import writer, write_engine  # noqa: E402
+from main import app  # noqa: E402
+
+# 요청 처리 중에 실행된 SQL만 모으기 위한 컨텍스트 (작업 큐 등 배경 작업 제외)
+_current_request = contextvars.ContextVar("current_request", default=None)
+
+
+class RequestLog:
+    """요청 하나가 실행한 SQL과 지연 로딩 기록"""
+
+    def __init__(self):
+        # (SQL, 파라미터)
+        self.statements = []
+        # 지연 로딩된 관계 이름 (예: Post.author)
+        self.lazy_loads = []
+
+
+def _capture(conn, cursor, statement, parameters, context, executemany):
+    log = _current_request.get()
+    if log is not None:
+        log.statements.append((statement, tuple(parameters or ())))
+
+
+event.listen(engine.sync_engine, "before_cursor_execute", _capture)
+event.listen(write_engine.sync_engine, "before_cursor_execute", _capture)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _capture_lazy_load(orm_execute_state):
+    log = _current_request.get()
+    if log is not None and orm_execute_state.is_select and orm_execute_state.lazy_loaded_from is not None:
+        path = orm_execute_state.loader_strategy_path
+        log.lazy_loads.append(f"{orm_execute_state.lazy_loaded_from.class_.__name__}.{path[-1].key}")
+
+
+def _traced_submit(submit):
+    """쓰기 전담 작업에서 실행되는 쓰기도 넘긴 요청의 기록에 포함"""
+    async def traced(op):
+        log = _current_request.get()
+        if log is None:
+            return await submit(op)
+
+        async def run(session):
+            token = _current_request.set(log)
+            try:
+                result = await op(session)
+                # SAVEPOINT를 닫을 때 실행될 flush도 요청의 기록에 포함
+                await session.flush()
+                return result
+            finally:
+                _current_request.reset(token)
+        return await submit(run)
+    return traced
+
+
+class _CaptureMiddleware:
+    def __init__(self, app):
+        self.app = app
+        self.log = None
+
+    async def __call__(self, scope, receive, send):
+        token = _current_request.set(self.log) if scope["type"] == "http" else None
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            if token is not None:
+                _current_request.reset(token)
+
+
+@pytest.fixture(scope="session")
+def client():
+    wrapper = _CaptureMiddleware(app)
+    writer.submit = _traced_submit(writer.submit)
+    try:
+        with TestClient(wrapper) as test_client:
+            test_client.capture = wrapper
+            # 관리자 페이지용 세션 로그인
+            test_client.post("/admin/login", data={"username": "admin", "password": "admin123"}, follow_redirects=False)
+            yield test_client
+    finally:
+        del writer.submit
+
+
+@pytest.fixture
+def request_log(client):
+    """요청 하나를 보내고 (응답, RequestLog)를 반환"""
+    def run(method, path, **kwargs):
+        client.capture.log = RequestLog()
+        try:
+            response = client.request(method, path, follow_redirects=False, **kwargs)
+            return response, client.capture.log
+        finally:
+            client.capture.log = None
+    return run
+
+
+@pytest.fixture
+def request_sql(request_log):
+    """요청 하나를 보내고 그 요청이 실행한 (SQL, 파라미터) 목록을 반환"""
+    def run(method, path, **kwargs):
+        response, log = request_log(method, path, **kwargs)
+        return response, log.statements
+    return run
+
+
+@pytest.fixture(scope="session")
+def explain():
+    from app.compression import register
+
+    conn = sqlite3.connect(DB_PATH)
+    register(conn)
+
+    def run(statement, parameters):
+        rows = conn.execute("EXPLAIN QUERY PLAN " + statement, parameters).fetchall()
+        return [row[-1] for row in rows]
+
+    yield run
+    conn.close()
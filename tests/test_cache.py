@@ -0,0 +1,206 @@
+"""공유 캐시 테스트
+
+워커 두 개를 같은 공유 계층을 쓰는 Cache 인스턴스 두 개로 흉내 냅니다. Redis
+백엔드는 이 파일의 작은 RESP 서버(GET/MGET/SET PX/DEL/INCR)를 상대로 검사합니다.
+"""
+import asyncio
+import time
+
+import pytest
+
+from app.cache import Cache, RedisBackend, SQLiteBackend
+
+
+@pytest.fixture
+def anyio_backend():
+    return "asyncio"
+
+
+class RespStandIn:
+    """테스트용 Redis 프로토콜 서버 (메모리 저장, PX 만료만 지원)"""
+
+    def __init__(self):
+        self.data = {}
+        self.server = None
+
+    async def start(self) -> int:
+        self.server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self.server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self.server.close()
+        await self.server.wait_closed()
+
+    def _get(self, key):
+        value, expires_at = self.data.get(key, (None, None))
+        if expires_at is not None and expires_at <= time.time():
+            del self.data[key]
+            return None
+        return value
+
+    def _execute(self, command, args) -> bytes:
+        if command == b"GET":
+            return self._bulk(self._get(args[0]))
+        if command == b"MGET":
+            return b"*%d\r\n" % len(args) + b"".join(self._bulk(self._get(key)) for key in args)
+        if command == b"SET":
+            expires_at = time.time() + int(args[3]) / 1000 if len(args) > 3 and args[2].upper() == b"PX" else None
+            self.data[args[0]] = (args[1], expires_at)
+            return b"+OK\r\n"
+        if command == b"DEL":
+            removed = sum(self.data.pop(key, None) is not None for key in args)
+            return b":%d\r\n" % removed
+        if command == b"INCR":
+            value = int(self._get(args[0]) or 0) + 1
+            self.data[args[0]] = (str(value).encode(), None)
+            return b":%d\r\n" % value
+        if command == b"SELECT":
+            return b"+OK\r\n"
+        return b"-ERR unknown command\r\n"
+
+    @staticmethod
+    def _bulk(value) -> bytes:
+        return b"$-1\r\n" if value is None else b"$%d\r\n%s\r\n" % (len(value), value)
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                header = await reader.readline()
+                if not header:
+                    break
+                parts = []
+                for _ in range(int(header[1:-2])):
+                    length = int((await reader.readline())[1:-2])
+                    parts.append((await reader.readexactly(length + 2))[:-2])
+                writer.write(self._execute(parts[0].upper(), parts[1:]))
+                await writer.drain()
+        finally:
+            writer.close()
+
+
+@pytest.fixture(params=["sqlite", "redis"])
+async def workers(request, tmp_path):
+    """같은 공유 계층을 쓰는 캐시 두 개 (워커 두 개에 해당)"""
+    stand_in = None
+    if request.param == "sqlite":
+        path = str(tmp_path / "cache.db")
+        backends = [SQLiteBackend(path), SQLiteBackend(path)]
+    else:
+        stand_in = RespStandIn()
+        port = await stand_in.start()
+        backends = [RedisBackend("127.0.0.1", port), RedisBackend("127.0.0.1", port)]
+    caches = [Cache(backend, max_entries=8) for backend in backends]
+    yield caches
+    for cache in caches:
+        await cache.close()
+    if stand_in is not None:
+        await stand_in.stop()
+
+
+@pytest.mark.anyio
+async def test_shared_tier_and_tag_invalidation(workers):
+    first, second = workers
+    await first.set("stats:home", {"posts": 3}, tags=["posts"])
+
+    assert await second.get("stats:home", tags=["posts"]) == {"posts": 3}
+    assert await second.get("stats:home", tags=["posts"]) == {"posts": 3}
+    assert second.stats()["shared_hits"] == 1
+    assert second.stats()["local_hits"] == 1
+
+    # 다른 워커의 무효화가 워커 LRU에 남은 값까지 무효로 만듦
+    await first.invalidate("posts")
+    assert await second.get("stats:home") is None
+    assert await first.get("stats:home") is None
+    assert second.stats()["misses"] == 1
+
+
+@pytest.mark.anyio
+async def test_ttl_expires_in_both_tiers(workers):
+    first, second = workers
+    await first.set("short", "value", ttl=0.05)
+    assert await second.get("short") == "value"
+    await asyncio.sleep(0.1)
+    assert await first.get("short") is None
+    assert await second.get("short") is None
+
+
+@pytest.mark.anyio
+async def test_get_or_set_computes_once(workers):
+    first, second = workers
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return [1, 2, 3]
+
+    results = await asyncio.gather(*(first.get_or_set("numbers", compute, tags=["t"]) for _ in range(5)))
+    assert results == [[1, 2, 3]] * 5
+    assert await second.get_or_set("numbers", compute, tags=["t"]) == [1, 2, 3]
+    assert calls == 1
+
+
+@pytest.mark.anyio
+async def test_cancelled_compute_does_not_cancel_waiters(workers):
+    first, _ = workers
+    started = asyncio.Event()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        started.set()
+        await asyncio.sleep(0.05)
+        return "fresh"
+
+    # 처음 계산하던 요청이 끊겨도(취소) 기다리던 요청은 다시 계산한 값을 받아야 함
+    leader = asyncio.create_task(first.get_or_set("page", compute))
+    await started.wait()
+    waiters = [asyncio.create_task(first.get_or_set("page", compute)) for _ in range(3)]
+    # 기다리는 요청들이 조회를 마치고 진행 중인 계산을 기다리기 시작할 때까지
+    await asyncio.sleep(0.02)
+    leader.cancel()
+    assert await asyncio.gather(*waiters) == ["fresh"] * 3
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+    assert calls == 2
+
+
+@pytest.mark.anyio
+async def test_untagged_local_hit_skips_shared_tier(workers):
+    first, _ = workers
+    await first.set("board_categories:1", ["일반"])
+
+    async def unreachable(tags):
+        raise AssertionError("태그 없는 워커 LRU 적중은 공유 계층을 조회하지 않아야 함")
+
+    first.backend.versions = unreachable
+    assert await first.get("board_categories:1") == ["일반"]
+    assert first.stats()["local_hits"] == 1
+
+
+@pytest.mark.anyio
+async def test_invalidation_during_compute_is_not_cached(workers):
+    first, second = workers
+
+    async def compute():
+        # 계산 중에 다른 워커가 무효화하면 이 결과는 다음 조회에서 쓰이지 않아야 함
+        await second.invalidate("posts")
+        return "stale"
+
+    assert await first.get_or_set("page", compute, tags=["posts"]) == "stale"
+    assert await second.get("page", tags=["posts"]) is None
+    assert await first.get("page", tags=["posts"]) is None
+
+
+@pytest.mark.anyio
+async def test_unreachable_shared_tier_falls_back_to_compute():
+    cache = Cache(RedisBackend("127.0.0.1", 1, timeout=0.2))
+
+    async def compute():
+        return "fresh"
+
+    assert await cache.get_or_set("page", compute, tags=["posts"]) == "fresh"
+    assert cache.stats()["errors"] >= 1
+    await cache.close()
@@ -0,0 +1,253 @@
+"""라우트별 SQL 질의 수 예산과 N+1 검사
+
+요청 하나가 실행한 SQL 문(쓰기 전담 작업에서 실행된 쓰기 포함)과 지연 로딩을 세어
+라우트마다 선언한 예산을 넘으면 실패합니다. 예산은 캐시가 비어 있을 때 기준이라
+캐시가 채워진 상태에서는 더 적게 실행됩니다. 파라미터만 다른 같은 문이
+N_PLUS_ONE_THRESHOLD번 이상 반복되면 N+1로 보고 실패하며, 의도적인 반복은
+ALLOWED_REPEATS에 이유와 함께 등록합니다.
+
+새 라우트를 추가하면 BUDGETS와 CASES에도 등록해야 합니다.
+"""
+import io
+import os
+import re
+from collections import Counter
+
+import pytest
+
+from app import metrics
+from app.auth import create_access_token
+from main import app
+
+# (메서드, 라우트 템플릿) -> 요청당 최대 SQL 문 수
+BUDGETS = {
+    ("GET", "/"): 0,
+    ("GET", "/about"): 0,
+    ("GET", "/education"): 0,
+    ("GET", "/data-provision"): 1,
+    ("GET", "/crudadmin"): 4,
+    ("GET", "/robots.txt"): 0,
+    ("GET", "/metrics"): 0,
+    ("GET", "/healthz"): 0,
+    ("GET", "/admin/login"): 0,
+    ("POST", "/admin/login"): 0,
+    ("GET", "/admin/logout"): 0,
+    ("GET", "/admin/me"): 1,
+    ("GET", "/admin/dashboard"): 4,
+    ("GET", "/admin/posts"): 2,
+    ("POST", "/admin/posts/{post_id}/delete"): 13,
+    ("GET", "/admin/categories"): 2,
+    ("POST", "/admin/categories/add"): 5,
+    ("POST", "/admin/categories/{category_id}/delete"): 11,
+    ("GET", "/admin/users"): 2,
+    ("GET", "/dashboard/"): 7,
+    ("GET", "/dashboard/analytics"): 5,
+    ("GET", "/dashboard/research"): 2,
+    ("GET", "/dashboard/research/facets"): 2,
+    ("GET", "/board/"): 4,
+    ("GET", "/board/suggest"): 0,
+    ("GET", "/board/create"): 1,
+    ("POST", "/board/create"): 10,
+    ("GET", "/board/{post_id}"): 4,
+    ("GET", "/board/{post_id}/edit"): 2,
+    ("POST", "/board/{post_id}/edit"): 14,
+    ("GET", "/board/{post_id}/revisions"): 1,
+    ("GET", "/board/{post_id}/revisions/diff"): 1,
+    ("GET", "/board/{post_id}/revisions/{number}"): 1,
+    ("POST", "/board/{post_id}/delete"): 13,
+    ("POST", "/board/{post_id}/attachments"): 2,
+    ("GET", "/board/{post_id}/attachments/{attachment_id}"): 1,
+    ("POST", "/board/{post_id}/attachments/{attachment_id}/delete"): 3,
+    ("GET", "/data-provision/datasets/{dataset_id}/rows"): 2,
+    ("GET", "/data-provision/datasets/{dataset_id}"): 2,
+    ("GET", "/feeds/posts.{fmt}"): 5,
+    ("GET", "/feeds/category/{category_id:int}.{fmt}"): 6,
+    ("GET", "/feeds/news.{fmt}"): 5,
+    ("GET", "/sitemap.xml"): 3,
+    ("GET", "/sitemaps/{name}"): 3,
+}
+
+# 같은 문이 이 횟수 이상 반복되면 N+1
+N_PLUS_ONE_THRESHOLD = 3
+
+# (SQL 패턴, 허용 이유)
+ALLOWED_REPEATS = [
+    (r"^INSERT INTO task_outbox", "outbox는 토픽 구독자마다 한 행씩 기록"),
+]
+
+# 예산을 재는 요청 (메서드, 경로, 요청 인자) - 경로의 {post} 등은 fixture 값으로 채움
+CASES = [
+    ("GET", "/", {}),
+    ("GET", "/about", {}),
+    ("GET", "/education", {}),
+    ("GET", "/data-provision", {}),
+    ("GET", "/crudadmin", {}),
+    ("GET", "/robots.txt", {}),
+    ("GET", "/healthz", {}),
+    ("GET", "/metrics", {}),
+    ("GET", "/admin/login", {}),
+    ("POST", "/admin/login", {"data": {"username": "admin", "password": "admin123"}}),
+    ("GET", "/admin/me", {"headers": {"Authorization": f"Bearer {create_access_token({'sub': 'admin'})}"}}),
+    ("GET", "/admin/dashboard", {}),
+    ("GET", "/admin/posts", {}),
+    ("GET", "/admin/posts?search=데이터&status=published", {}),
+    ("GET", "/admin/categories", {}),
+    ("GET", "/admin/users", {}),
+    ("GET", "/dashboard/", {}),
+    ("GET", "/dashboard/analytics", {}),
+    ("GET", "/dashboard/research", {}),
+    ("GET", "/dashboard/research/facets", {}),
+    ("GET", "/board/", {}),
+    ("GET", "/board/?category_id=1&page=2", {}),
+    ("GET", "/board/?search=데이터", {}),
+    ("GET", "/board/suggest?q=데", {}),
+    ("GET", "/board/create", {}),
+    ("GET", "/board/{post}", {}),
+    ("GET", "/board/{post}/edit", {}),
+    ("POST", "/board/{post}/edit", {"data": {"title": "예산 수정", "content": "본문", "category_id": "2"}}),
+    ("GET", "/board/{post}/revisions", {}),
+    ("GET", "/board/{post}/revisions/1", {}),
+    ("GET", "/board/{post}/revisions/diff?from=1&to=2", {}),
+    ("GET", "/board/{post}/attachments/{attachment}", {}),
+    ("GET", "/data-provision/datasets/{dataset}", {}),
+    ("GET", "/data-provision/datasets/{dataset}/rows?limit=5", {}),
+    ("GET", "/feeds/posts.rss", {}),
+    ("GET", "/feeds/category/1.atom", {}),
+    ("GET", "/feeds/news.rss", {}),
+    ("GET", "/sitemap.xml", {}),
+    ("GET", "/sitemaps/posts-1.xml", {}),
+]
+
+# 테스트 클라이언트는 같은 호스트가 아니므로 지표는 404 (SQL 없이 거절되는지만 확인)
+EXPECTED_STATUS = {"/metrics": 404}
+
+# 트랜잭션 제어 문은 세지 않음 (쓰기 전담 작업의 BEGIN IMMEDIATE, SAVEPOINT 등)
+_CONTROL = ("BEGIN", "SAVEPOINT", "RELEASE", "ROLLBACK", "COMMIT")
+_PLACEHOLDERS = re.compile(r"\?(?:\s*,\s*\?)+")
+
+
+def _route(method, path):
+    scope = {"type": "http", "method": method, "path": path.split("?")[0], "root_path": ""}
+    return method, metrics._route_label(app, scope)
+
+
+def _normalize(statement):
+    """IN 목록 길이와 공백 차이를 없앤 SQL"""
+    return _PLACEHOLDERS.sub("?", " ".join(statement.split()))
+
+
+def _problems(route, log):
+    problems = []
+    budget = BUDGETS[route]
+    statements = [(statement, parameters) for statement, parameters in log.statements
+                  if not statement.lstrip().upper().startswith(_CONTROL)]
+    if len(statements) > budget:
+        listing = "\n".join(f"    {' '.join(statement.split())[:160]}" for statement, _ in statements)
+        problems.append(f"SQL {len(statements)}개 실행 (예산 {budget}개)\n{listing}")
+    if log.lazy_loads:
+        problems.append(f"지연 로딩: {log.lazy_loads}")
+
+    normalized = [(_normalize(statement), parameters) for statement, parameters in statements]
+    repeats = Counter(statement for statement, _ in normalized)
+    for statement, count in repeats.items():
+        if count < N_PLUS_ONE_THRESHOLD or any(re.search(pattern, statement) for pattern, _ in ALLOWED_REPEATS):
+            continue
+        distinct = {parameters for other, parameters in normalized if other == statement}
+        if len(distinct) > 1:
+            problems.append(f"N+1 의심 ({count}회): {statement[:160]}")
+    return problems
+
+
+@pytest.fixture(scope="module")
+def ids(client):
+    """예산 측정용 게시물(수정 이력 포함)·첨부파일·데이터셋"""
+    from app.database import SessionLocal
+    from app.datasets import register
+    from app.config import settings
+
+    response = client.post("/board/create", data={"title": "예산 테스트", "content": "본문", "category_id": "1"},
+                           follow_redirects=False)
+    post_id = int(response.headers["location"].rsplit("/", 1)[1])
+    # 수정 이력 1·2판
+    client.post(f"/board/{post_id}/edit", data={"title": "예산 테스트", "content": "본문\n추가", "category_id": "1"},
+                follow_redirects=False)
+    client.post(f"/board/{post_id}/attachments", files={"files": ("memo.txt", io.BytesIO(b"hello"), "text/plain")},
+                follow_redirects=False)
+
+    os.makedirs(settings.dataset_dir, exist_ok=True)
+    path = os.path.join(settings.dataset_dir, "budget.csv")
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("연도,값\n" + "".join(f"{2000 + i},{i}\n" for i in range(20)))
+
+    async def setup():
+        from sqlalchemy import select
+        from app.models import Attachment
+        async with SessionLocal() as session:
+            dataset = await register(session, path, title="예산 데이터")
+            attachment_id = await session.scalar(select(Attachment.id).where(Attachment.post_id == post_id))
+            return dataset.id, attachment_id
+
+    dataset_id, attachment_id = client.portal.call(setup)
+    return {"post": post_id, "attachment": attachment_id, "dataset": dataset_id}
+
+
+def test_every_route_has_budget():
+    skipped = {app.openapi_url, app.docs_url, app.redoc_url, app.swagger_ui_oauth2_redirect_url}
+    declared = set()
+    for route in app.routes:
+        if getattr(route, "methods", None) and route.path not in skipped:
+            declared.update((method, route.path) for method in route.methods if method != "HEAD")
+    assert declared - set(BUDGETS) == set(), "예산이 없는 라우트"
+    assert set(BUDGETS) - declared == set(), "없는 라우트의 예산"
+
+
+@pytest.mark.parametrize("method,path,kwargs", CASES, ids=[f"{m} {p}" for m, p, _ in CASES])
+def test_read_route_budget(request_log, ids, method, path, kwargs):
+    response, log = request_log(method, path.format(**ids), **kwargs)
+    expected = EXPECTED_STATUS.get(path)
+    assert response.status_code == expected if expected else response.status_code < 400, response.text
+    problems = _problems(_route(method, path.format(**ids)), log)
+    assert not problems, "\n".join(problems)
+
+
+def test_write_route_budgets(client, request_log):
+    """쓰기 라우트는 만든 것을 다시 지우는 순서로 실행"""
+    from sqlalchemy import select
+    from app.database import SessionLocal
+    from app.models import Attachment, Category
+
+    async def newest(column):
+        async with SessionLocal() as session:
+            return await session.scalar(select(column).order_by(column.desc()).limit(1))
+
+    steps = [
+        ("POST", "/board/create", {"data": {"title": "예산 쓰기", "content": "본문", "category_id": "1"}}),
+        ("POST", "/board/{post}/attachments", {"files": {"files": ("a.txt", io.BytesIO(b"a"), "text/plain")}}),
+        ("POST", "/board/{post}/attachments/{attachment}/delete", {}),
+        # 첫 수정은 원본(1판)과 2판을 함께 기록
+        ("POST", "/board/{post}/edit", {"data": {"title": "예산 쓰기", "content": "본문\n수정", "category_id": "1"}}),
+        ("POST", "/board/{post}/delete", {}),
+        ("POST", "/board/create", {"data": {"title": "관리자 삭제", "content": "본문", "category_id": "1"}}),
+        ("POST", "/admin/posts/{post}/delete", {}),
+        ("POST", "/admin/categories/add", {"data": {"name": "예산 카테고리"}}),
+        ("POST", "/admin/categories/{category}/delete", {}),
+        # 로그아웃 후 다른 테스트를 위해 다시 로그인
+        ("GET", "/admin/logout", {}),
+        ("POST", "/admin/login", {"data": {"username": "admin", "password": "admin123"}}),
+    ]
+    values = {}
+    failures = []
+    for method, template, kwargs in steps:
+        path = template.format(**values)
+        response, log = request_log(method, path, **kwargs)
+        assert response.status_code < 400, response.text
+        problems = _problems(_route(method, path), log)
+        if problems:
+            failures.append(f"{method} {template}\n" + "\n".join(problems))
+        if template == "/board/create":
+            values["post"] = int(response.headers["location"].rsplit("/", 1)[1])
+        elif template == "/board/{post}/attachments":
+            values["attachment"] = client.portal.call(newest, Attachment.id)
+        elif template == "/admin/categories/add":
+            values["category"] = client.portal.call(newest, Category.id)
+    assert not failures, "\n\n".join(failures)
@@ -0,0 +1,113 @@
+"""각 라우트가 실행하는 질의의 EXPLAIN QUERY PLAN 회귀 테스트
+
+인덱스를 타지 않는 전체 테이블 스캔이나 정렬용 임시 B-tree가 새로 생기면
+실패합니다. 의도적으로 허용하는 계획은 ALLOWED에 이유와 함께 등록합니다.
+"""
+import re
+
+import pytest
+
+ROUTES = [
+    "/board/",
+    "/board/?category_id=1",
+    "/board/?page=2",
+    "/board/?search=데이터",
+    "/board/create",
+    "/board/1",
+    "/board/1/edit",
+    "/dashboard/",
+    "/dashboard/analytics",
+    "/dashboard/research",
+    "/dashboard/research/facets",
+    "/data-provision",
+    "/crudadmin",
+    "/admin/dashboard",
+    "/admin/posts",
+    "/admin/categories",
+    "/admin/users",
+    "/admin/posts?sort=id&dir=asc&after=1",
+    "/admin/posts?category_id=1&status=published&after=1",
+    "/admin/categories?sort=id&before=3",
+    "/admin/users?sort=username&dir=asc&q=ad&after=1",
+    "/admin/users?sort=email&role=admin&status=active",
+    "/feeds/posts.rss",
+    "/feeds/category/1.atom",
+    "/feeds/news.rss",
+    "/sitemap.xml",
+    "/sitemaps/posts-1.xml",
+]
+
+# (SQL 패턴, 계획 패턴, 허용 이유)
+ALLOWED = [
+    (r"FROM categories\b(?!.*WHERE)", r"SCAN categories",
+     "카테고리는 소수의 참조 데이터로 항상 전체를 읽음"),
+    (r"FROM datasets ORDER BY datasets.title", r"SCAN datasets|TEMP B-TREE FOR ORDER BY",
+     "데이터셋 카탈로그는 소수의 행을 전체 표시"),
+    (r"strftime\('%Y-%m', posts.created_at\)", r"SCAN posts USING INDEX ix_posts_created_month",
+     "월별 통계는 전체 집계 (월 식 인덱스 순서로 읽음)"),
+    (r"FROM research GROUP BY", r"SCAN research|TEMP B-TREE FOR GROUP BY",
+     "연구 패싯은 research 세대가 바뀔 때만 실행되는 전체 집계"),
+    (r"SELECT (archived_)?posts.id, (archived_)?posts.is_published, (archived_)?posts.created_at, "
+     r"(archived_)?posts.updated_at\s+FROM (archived_)?posts ORDER BY (archived_)?posts.id",
+     r"SCAN (archived_)?posts",
+     "사이트맵은 posts 세대가 바뀔 때만 전체 게시물을 id 순서로 스트리밍"),
+    (r"FROM keyword_counts .*GROUP BY keyword_counts.term", r"TEMP B-TREE FOR ORDER BY",
+     "상위 키워드는 keywords 세대가 바뀔 때만 최근 월 범위를 합계 순으로 정렬"),
+    (r"sum\(CASE WHEN \(users.is_admin = 1\).*FROM users$", r"SCAN users",
+     "관리자 사용자 요약 수치는 전체 집계이며 공유 캐시에 60초 보관"),
+]
+
+# 인덱스 순서로 읽는 `SCAN t USING INDEX ...`는 LIMIT와 함께 일찍 끝나므로 허용
+_FULL_SCAN = re.compile(r"^SCAN \w+$")
+_TEMP_SORT = re.compile(r"USE TEMP B-TREE FOR (ORDER BY|GROUP BY|DISTINCT|RIGHT PART OF ORDER BY)")
+
+
+def _violations(statement, plan):
+    problems = []
+    for detail in plan:
+        if _FULL_SCAN.search(detail) or _TEMP_SORT.search(detail):
+            allowed = any(
+                re.search(sql_pattern, statement, re.S) and re.search(plan_pattern, detail)
+                for sql_pattern, plan_pattern, _ in ALLOWED
+            )
+            if not allowed:
+                problems.append(detail)
+    return problems
+
+
+def _check(statements, explain):
+    failures = []
+    for statement, parameters in statements:
+        if not statement.lstrip().upper().startswith(("SELECT", "UPDATE", "DELETE", "WITH")):
+            continue
+        problems = _violations(statement, explain(statement, parameters))
+        if problems:
+            failures.append(f"{' '.join(statement.split())}\n    -> {problems}")
+    return failures
+
+
+@pytest.mark.parametrize("path", ROUTES)
+def test_read_routes_use_indexes(request_sql, explain, path):
+    response, statements = request_sql("GET", path)
+    assert response.status_code == 200, response.text
+    assert statements, "요청에서 실행된 SQL이 없습니다"
+    failures = _check(statements, explain)
+    assert not failures, "\n".join(failures)
+
+
+def test_write_routes_use_indexes(request_sql, explain):
+    response, statements = request_sql("POST", "/board/create", data={"title": "계획 테스트", "content": "본문", "category_id": "1"})
+    assert response.status_code == 303
+    post_path = response.headers["location"]
+    all_statements = list(statements)
+
+    response, statements = request_sql("POST", f"{post_path}/edit", data={"title": "수정", "content": "수정 본문", "category_id": "2"})
+    assert response.status_code == 303
+    all_statements += statements
+
+    response, statements = request_sql("POST", f"{post_path}/delete")
+    assert response.status_code == 303
+    all_statements += statements
+
+    failures = _check(all_statements, explain)
+    assert not failures, "\n".join(failures)